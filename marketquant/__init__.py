@@ -1,3 +1,10 @@
-from .data_provider import schwab
+from ._lazy import lazy_module
+
+# Note: attributes are resolved on first access (PEP 562) so `import marketquant` does not pull in the Schwab stack
+_LAZY_IMPORTS = {
+    'schwab': ('.data_provider.schwab.schwab_init', 'schwab'),
+}
 
 __all__ = ['schwab']
+
+__getattr__, __dir__ = lazy_module(__name__, _LAZY_IMPORTS)
@@ -0,0 +1,27 @@
+import sys
+import importlib
+
+
+def lazy_module(module_name, lazy_imports):
+    """
+    Resolves the attributes of a package on first access (PEP 562), so importing the package does not import the
+    modules behind them. Used at the end of a package __init__:
+    `__getattr__, __dir__ = lazy_module(__name__, _LAZY_IMPORTS)`.
+    :param module_name: __name__ of the package
+    :param lazy_imports: attribute name -> (module, relative to the package, attribute name in that module)
+    :return: __getattr__ and __dir__ of the package
+    """
+    module = sys.modules[module_name]
+
+    def __getattr__(name):
+        if name in lazy_imports:
+            module_path, attribute = lazy_imports[name]
+            value = getattr(importlib.import_module(module_path, module_name), attribute)
+            setattr(module, name, value)  # Note: later accesses skip __getattr__
+            return value
+        raise AttributeError(f"module {module_name!r} has no attribute {name!r}")
+
+    def __dir__():
+        return sorted(set(vars(module)) | set(lazy_imports))
+
+    return __getattr__, __dir__
@@ -1,3 +1,41 @@
-from .schwab import Client, Stream, schwab
+import importlib
+from .._lazy import lazy_module
 
-__all__ = ['Client', 'Stream', 'schwab']
+# Note: the schwab subpackage and the schwab() initializer share a name. The subpackage is imported first (cheap, its
+# attributes are lazy too) so importing any of its modules later never binds it over the function defined below.
+importlib.import_module('.schwab', __name__)
+
+
+def schwab():
+    """
+    Client initialized with the credentials of the .env file (see schwab.schwab_init)
+    """
+    from .schwab.schwab_init import schwab as initialize
+
+    return initialize()
+
+
+_LAZY_IMPORTS = {
+    'Client': ('.schwab.schwab_api', 'Client'),
+    'AsyncClient': ('.schwab.schwab_async', 'AsyncClient'),
+    'RateLimiter': ('.schwab.rate_limiter', 'RateLimiter'),
+    'ResponseCache': ('.schwab.response_cache', 'ResponseCache'),
+    'TokenBroker': ('.schwab.token_broker', 'TokenBroker'),
+    'ClientMetrics': ('.schwab.metrics', 'ClientMetrics'),
+    'RecordingAdapter': ('.schwab.transport', 'RecordingAdapter'),
+    'ReplayAdapter': ('.schwab.transport', 'ReplayAdapter'),
+    'MockSchwabServer': ('.schwab.mock_server', 'MockSchwabServer'),
+    'OptionChain': ('.schwab.option_chain', 'OptionChain'),
+    'decode_option_chain': ('.schwab.option_chain', 'decode_option_chain'),
+    'fetch_option_chain': ('.schwab.chain_fetcher', 'fetch_option_chain'),
+    'fetch_option_chain_async': ('.schwab.chain_fetcher', 'fetch_option_chain_async'),
+    'Stream': ('.schwab.schwab_stream', 'Stream'),
+    'YahooMarketData': ('.yahoo.market_data', 'YahooMarketData'),
+    'get_market_data': ('.yahoo.market_data', 'get_market_data'),
+}
+
+__all__ = ['Client', 'AsyncClient', 'RateLimiter', 'ResponseCache', 'TokenBroker', 'OptionChain', 'decode_option_chain',
+           'ClientMetrics', 'RecordingAdapter', 'ReplayAdapter', 'MockSchwabServer', 'fetch_option_chain',
+           'fetch_option_chain_async', 'Stream', 'schwab', 'YahooMarketData', 'get_market_data']
+
+__getattr__, __dir__ = lazy_module(__name__, _LAZY_IMPORTS)
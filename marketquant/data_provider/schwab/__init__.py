@@ -1,5 +1,25 @@
-from .schwab_api import Client
-from .schwab_stream import Stream
-from .schwab_init import schwab
+from ..._lazy import lazy_module
 
-__all__ = ['Client', 'Stream', 'schwab']
+_LAZY_IMPORTS = {
+    'Client': ('.schwab_api', 'Client'),
+    'AsyncClient': ('.schwab_async', 'AsyncClient'),
+    'RateLimiter': ('.rate_limiter', 'RateLimiter'),
+    'ResponseCache': ('.response_cache', 'ResponseCache'),
+    'TokenBroker': ('.token_broker', 'TokenBroker'),
+    'ClientMetrics': ('.metrics', 'ClientMetrics'),
+    'RecordingAdapter': ('.transport', 'RecordingAdapter'),
+    'ReplayAdapter': ('.transport', 'ReplayAdapter'),
+    'MockSchwabServer': ('.mock_server', 'MockSchwabServer'),
+    'OptionChain': ('.option_chain', 'OptionChain'),
+    'decode_option_chain': ('.option_chain', 'decode_option_chain'),
+    'fetch_option_chain': ('.chain_fetcher', 'fetch_option_chain'),
+    'fetch_option_chain_async': ('.chain_fetcher', 'fetch_option_chain_async'),
+    'Stream': ('.schwab_stream', 'Stream'),
+    'schwab': ('.schwab_init', 'schwab'),
+}
+
+__all__ = ['Client', 'AsyncClient', 'RateLimiter', 'ResponseCache', 'TokenBroker', 'OptionChain', 'decode_option_chain',
+           'ClientMetrics', 'RecordingAdapter', 'ReplayAdapter', 'MockSchwabServer', 'fetch_option_chain',
+           'fetch_option_chain_async', 'Stream', 'schwab']
+
+__getattr__, __dir__ = lazy_module(__name__, _LAZY_IMPORTS)
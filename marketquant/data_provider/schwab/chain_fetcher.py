@@ -0,0 +1,105 @@
+import asyncio
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from .option_chain import OptionChain, decode_option_chain
+from .metrics import parse_timer
+
+
+def expiration_windows(expiration_chain, expirations_per_request=4, fromDate=None, toDate=None):
+    """
+    Splits the expirations of an option_expiration_chain response into (fromDate, toDate) windows
+    :param expiration_chain: parsed option_expiration_chain response
+    :type expiration_chain: dict
+    :param expirations_per_request: expirations fetched by one option_chains request
+    :type expirations_per_request: int
+    :param fromDate: first expiration to keep ("YYYY-MM-DD")
+    :type fromDate: str
+    :param toDate: last expiration to keep ("YYYY-MM-DD")
+    :type toDate: str
+    :return: list of (fromDate, toDate), both inclusive
+    :rtype: list
+    """
+    dates = sorted({expiration['expirationDate'][:10] for expiration in expiration_chain.get('expirationList', [])})
+    dates = [date for date in dates if (fromDate is None or date >= fromDate) and (toDate is None or date <= toDate)]
+    groups = [dates[i:i + expirations_per_request] for i in range(0, len(dates), expirations_per_request)]
+    return [(group[0], group[-1]) for group in groups]
+
+
+def _merge(chains):
+    # Action: calls of every window, then puts, same order as a single option_chains response
+    chain = OptionChain.concat(chains)
+    order = np.argsort(~chain['isCall'], kind='stable')
+    chain.columns = {name: values[order] for name, values in chain.columns.items()}
+    return chain
+
+
+def _windows(client, response, expirations_per_request, params):
+    # Note: no windows (a single option_chains call) when the expirations can not be listed: client without
+    # option_expiration_chain (response is None), error status or a body that is not an expiration chain
+    if response is None or response.status_code >= 400:
+        return []
+    try:
+        return expiration_windows(response.json(), expirations_per_request,
+                                  client._time_convert(params.get('fromDate'), "YYYY-MM-DD"),
+                                  client._time_convert(params.get('toDate'), "YYYY-MM-DD"))
+    except (AttributeError, KeyError, TypeError, ValueError):
+        return []
+
+
+def _check(client, response, symbol, window):
+    if response.status_code >= 400:
+        raise ValueError(f"Schwab option chain request failed for {symbol} ({window[0]} to {window[1]}): "
+                         f"{response.status_code} {response.text}")
+    with parse_timer(client, 'option_chains'):
+        return decode_option_chain(response)
+
+
+def fetch_option_chain(client, symbol, expirations_per_request=4, max_workers=4, **params):
+    """
+    Fetches an option chain split into expiration windows, fetched concurrently and each decoded as soon as it
+    arrives (the raw payload of a window is dropped once decoded), then merged into one OptionChain.
+    Falls back to a single option_chains call when the expirations can not be listed.
+    :param client: Client
+    :type client: Client
+    :param symbol: ticker symbol
+    :type symbol: str
+    :param expirations_per_request: expirations fetched by one request
+    :type expirations_per_request: int
+    :param max_workers: windows in flight at once
+    :type max_workers: int
+    :param params: other option_chains parameters (contractType, strikeCount, range, fromDate, toDate...)
+    :return: merged chain
+    :rtype: OptionChain
+    """
+    list_expirations = getattr(client, 'option_expiration_chain', None)
+    response = list_expirations(symbol) if list_expirations is not None else None
+    windows = _windows(client, response, expirations_per_request, params)
+    if not windows:
+        return _check(client, client.option_chains(symbol, **params), symbol, (params.get('fromDate'), params.get('toDate')))
+
+    def fetch(window):
+        window_params = {**params, 'fromDate': window[0], 'toDate': window[1]}
+        return _check(client, client.option_chains(symbol, **window_params), symbol, window)
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(windows)))) as executor:
+        chains = list(executor.map(fetch, windows))
+    return _merge(chains)
+
+
+async def fetch_option_chain_async(async_client, symbol, expirations_per_request=4, **params):
+    """
+    Same as fetch_option_chain on an AsyncClient, every window in flight at once (within the rate limiter)
+    :rtype: OptionChain
+    """
+    list_expirations = getattr(async_client, 'option_expiration_chain', None)
+    response = await list_expirations(symbol) if list_expirations is not None else None
+    windows = _windows(async_client, response, expirations_per_request, params)
+    if not windows:
+        response = await async_client.option_chains(symbol, **params)
+        return _check(async_client, response, symbol, (params.get('fromDate'), params.get('toDate')))
+
+    async def fetch(window):
+        window_params = {**params, 'fromDate': window[0], 'toDate': window[1]}
+        return _check(async_client, await async_client.option_chains(symbol, **window_params), symbol, window)
+
+    return _merge(await asyncio.gather(*[fetch(window) for window in windows]))
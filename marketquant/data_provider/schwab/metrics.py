@@ -0,0 +1,226 @@
+import os
+import time
+import bisect
+import threading
+from contextlib import contextmanager
+
+# Note: upper bounds of the histogram buckets (an implicit +Inf bucket follows)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = (1e3, 1e4, 1e5, 1e6, 1e7, 1e8)
+
+
+def parse_timer(client, endpoint):
+    """
+    Times response decoding into the client's metrics (does nothing for clients without metrics).
+    """
+    metrics = getattr(client, 'metrics', None)
+    return metrics.parse(endpoint) if metrics is not None else _untimed()
+
+
+@contextmanager
+def _untimed():
+    # Note: contextlib.nullcontext needs Python 3.7, setup.py still supports 3.6
+    yield
+
+
+class Histogram:
+
+    def __init__(self, buckets):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q):
+        """
+        Estimated quantile (linear interpolation inside the bucket, same as Prometheus' histogram_quantile).
+        """
+        if self.count == 0:
+            return None
+        rank = q * self.count
+        cumulative = 0
+        for i, count in enumerate(self.counts):
+            if cumulative + count >= rank and count > 0:
+                if i == len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                return lower + (self.buckets[i] - lower) * (rank - cumulative) / count
+            cumulative += count
+        return self.buckets[-1]
+
+    def snapshot(self):
+        return {'count': self.count, 'sum': self.sum, 'mean': self.sum / self.count if self.count else None,
+                'p50': self.quantile(0.5), 'p90': self.quantile(0.9), 'p99': self.quantile(0.99),
+                'buckets': dict(zip(self.buckets + (float('inf'),), self.counts))}
+
+    def prometheus(self, name, labels):
+        lines, cumulative = [], 0
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            cumulative += count
+            le = '+Inf' if bound == float('inf') else repr(bound)
+            lines.append(f'{name}_bucket{{{labels},le="{le}"}} {cumulative}')
+        lines.append(f'{name}_sum{{{labels}}} {self.sum}')
+        lines.append(f'{name}_count{{{labels}}} {self.count}')
+        return lines
+
+
+class EndpointMetrics:
+
+    def __init__(self):
+        self.requests = 0  # calls of the endpoint (retries excluded)
+        self.cache_hits = 0
+        self.retries = 0
+        self.rate_limit_wait_seconds = 0.0
+        self.status_codes = {}  # status code (or exception name) -> attempts
+        self.latency = Histogram(LATENCY_BUCKETS)  # whole attempt, request sent to body received
+        self.server = Histogram(LATENCY_BUCKETS)  # request sent to headers received (server time and round trip)
+        self.size = Histogram(SIZE_BUCKETS)  # response body bytes
+        self.parse = Histogram(LATENCY_BUCKETS)  # decoding time reported by parse()
+
+
+class ClientMetrics:
+
+    def __init__(self, prefix='schwab'):
+        """
+        Request level metrics of a Client (or AsyncClient), per endpoint: latency of every attempt (and the part
+        spent waiting for the headers, so server and network time can be told apart from the body transfer),
+        response sizes, status codes, retries, rate limiter wait time, cache hits and parsing time.
+        Exported with snapshot() or as a Prometheus textfile with write_prometheus().
+        :param prefix: prefix of the Prometheus metric names
+        :type prefix: str
+        """
+        self.prefix = prefix
+        self._endpoints = {}
+        self._lock = threading.Lock()
+
+    def _endpoint(self, endpoint):
+        metrics = self._endpoints.get(endpoint)
+        if metrics is None:
+            metrics = self._endpoints.setdefault(endpoint, EndpointMetrics())
+        return metrics
+
+    def attempt(self, endpoint, seconds, response=None, error=None):
+        """
+        Records one http attempt.
+        :param seconds: time from sending the request to receiving the whole body
+        :param response: response (requests or httpx), None when the attempt raised error
+        :param error: exception raised by the attempt
+        """
+        with self._lock:
+            metrics = self._endpoint(endpoint)
+            metrics.latency.observe(seconds)
+            if response is None:
+                key = type(error).__name__
+            else:
+                key = response.status_code
+                metrics.size.observe(len(response.content))
+                elapsed = getattr(response, 'elapsed', None)
+                if elapsed is not None:
+                    metrics.server.observe(elapsed.total_seconds())
+            metrics.status_codes[key] = metrics.status_codes.get(key, 0) + 1
+
+    def request(self, endpoint, retries, wait_seconds):
+        """
+        Records one call of an endpoint once it is answered (or failed).
+        :param retries: attempts after the first one
+        :param wait_seconds: time spent waiting for the rate limiter over all attempts
+        """
+        with self._lock:
+            metrics = self._endpoint(endpoint)
+            metrics.requests += 1
+            metrics.retries += retries
+            metrics.rate_limit_wait_seconds += wait_seconds
+
+    def cache_hit(self, endpoint):
+        with self._lock:
+            metrics = self._endpoint(endpoint)
+            metrics.requests += 1
+            metrics.cache_hits += 1
+
+    @contextmanager
+    def parse(self, endpoint):
+        """
+        Times the decoding of a response, e.g. `with client.metrics.parse('option_chains'): decode(response)`.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            with self._lock:
+                self._endpoint(endpoint).parse.observe(seconds)
+
+    def reset(self):
+        with self._lock:
+            self._endpoints = {}
+
+    def snapshot(self):
+        """
+        :return: metrics per endpoint
+        :rtype: dict
+        """
+        with self._lock:
+            return {endpoint: {
+                'requests': metrics.requests,
+                'cache_hits': metrics.cache_hits,
+                'retries': metrics.retries,
+                'rate_limit_wait_seconds': metrics.rate_limit_wait_seconds,
+                'status_codes': dict(metrics.status_codes),
+                'latency_seconds': metrics.latency.snapshot(),
+                'server_seconds': metrics.server.snapshot(),
+                'response_bytes': metrics.size.snapshot(),
+                'parse_seconds': metrics.parse.snapshot(),
+            } for endpoint, metrics in self._endpoints.items()}
+
+    def to_prometheus(self):
+        """
+        :return: metrics in the Prometheus text exposition format
+        :rtype: str
+        """
+        prefix = self.prefix
+        counters = (
+            ('requests_total', 'Endpoint calls (retries excluded)', lambda m: m.requests),
+            ('cache_hits_total', 'Calls answered from the response cache', lambda m: m.cache_hits),
+            ('retries_total', 'Retried attempts', lambda m: m.retries),
+            ('rate_limit_wait_seconds_total', 'Time spent waiting for the rate limiter',
+             lambda m: m.rate_limit_wait_seconds),
+        )
+        histograms = (
+            ('request_seconds', 'Attempt latency, request sent to body received', lambda m: m.latency),
+            ('server_seconds', 'Attempt latency, request sent to headers received', lambda m: m.server),
+            ('response_bytes', 'Response body size', lambda m: m.size),
+            ('parse_seconds', 'Response decoding time', lambda m: m.parse),
+        )
+        with self._lock:
+            endpoints = sorted(self._endpoints.items())
+            lines = []
+            for name, description, value in counters:
+                lines += [f'# HELP {prefix}_{name} {description}', f'# TYPE {prefix}_{name} counter']
+                lines += [f'{prefix}_{name}{{endpoint="{endpoint}"}} {value(metrics)}' for endpoint, metrics in endpoints]
+            lines += [f'# HELP {prefix}_responses_total Attempts by status code (or exception)',
+                      f'# TYPE {prefix}_responses_total counter']
+            for endpoint, metrics in endpoints:
+                for status, count in sorted(metrics.status_codes.items(), key=lambda item: str(item[0])):
+                    lines.append(f'{prefix}_responses_total{{endpoint="{endpoint}",status="{status}"}} {count}')
+            for name, description, histogram in histograms:
+                lines += [f'# HELP {prefix}_{name} {description}', f'# TYPE {prefix}_{name} histogram']
+                for endpoint, metrics in endpoints:
+                    lines += histogram(metrics).prometheus(f'{prefix}_{name}', f'endpoint="{endpoint}"')
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path):
+        """
+        Writes the metrics for the node exporter textfile collector (atomically, the collector never reads a
+        partial file).
+        :param path: .prom file path
+        :type path: str
+        """
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, 'w') as f:
+            f.write(self.to_prometheus())
+        os.replace(temporary, path)
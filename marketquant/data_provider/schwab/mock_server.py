@@ -0,0 +1,522 @@
+import re
+import sys
+import json
+import time
+import zlib
+import random
+import argparse
+import threading
+from collections import deque
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+from .transport import RecordingStore, request_key, token_payload
+
+ACCOUNT_NUMBER = '12345678'
+ACCOUNT_HASH = 'MOCKACCOUNTHASH0000000000000000000000000000000000000000000000000'
+MOVERS = ('AAPL', 'MSFT', 'NVDA', 'AMZN', 'GOOGL', 'META', 'TSLA', 'AMD', 'NFLX', 'INTC')
+# Note: candle aggregation of a Schwab frequencyType (weeks and months are approximated in trading days)
+FREQUENCY_AGGREGATIONS = {'minute': 'm', 'daily': 'd', 'weekly': '5d', 'monthly': '21d'}
+# Note: default lookback of a Schwab periodType when no startDate is given (in calendar days per period)
+PERIOD_DAYS = {'day': (10, 1), 'month': (1, 31), 'year': (1, 365), 'ytd': (1, None)}
+
+ROUTES = (
+    ('POST', r'/v1/oauth/token', '_token'),
+    ('GET', r'/trader/v1/accounts/accountNumbers', '_account_numbers'),
+    ('GET', r'/trader/v1/accounts/?', '_accounts'),
+    ('GET', r'/trader/v1/accounts/(?P<account>[^/]+)', '_account'),
+    ('GET', r'/trader/v1/orders', '_orders'),
+    ('GET', r'/trader/v1/accounts/(?P<account>[^/]+)/orders', '_orders'),
+    ('POST', r'/trader/v1/accounts/(?P<account>[^/]+)/orders', '_order_place'),
+    ('GET', r'/trader/v1/accounts/(?P<account>[^/]+)/orders/(?P<order>\d+)', '_order'),
+    ('DELETE', r'/trader/v1/accounts/(?P<account>[^/]+)/orders/(?P<order>\d+)', '_order_cancel'),
+    ('PUT', r'/trader/v1/accounts/(?P<account>[^/]+)/orders/(?P<order>\d+)', '_order_replace'),
+    ('GET', r'/trader/v1/accounts/(?P<account>[^/]+)/transactions', '_transactions'),
+    ('GET', r'/trader/v1/accounts/(?P<account>[^/]+)/transactions/(?P<transaction>[^/]+)', '_transaction'),
+    ('GET', r'/trader/v1/userPreference', '_preferences'),
+    ('GET', r'/marketdata/v1/quotes', '_quotes'),
+    ('GET', r'/marketdata/v1/chains', '_chains'),
+    ('GET', r'/marketdata/v1/expirationchain', '_expiration_chain'),
+    ('GET', r'/marketdata/v1/pricehistory', '_price_history'),
+    ('GET', r'/marketdata/v1/movers/(?P<index>[^/]+)', '_movers'),
+    ('GET', r'/marketdata/v1/markets', '_markets'),
+    ('GET', r'/marketdata/v1/markets/(?P<market>[^/]+)', '_market'),
+    ('GET', r'/marketdata/v1/instruments', '_instruments'),
+    ('GET', r'/marketdata/v1/instruments/(?P<cusip>[^/]+)', '_instrument'),
+    ('GET', r'/marketdata/v1/(?P<symbol>[^/]+)/quotes', '_quote'),
+)
+
+
+class MockSchwabServer:
+
+    def __init__(self, host='127.0.0.1', port=0, recordings=None, latency=0.0, latency_jitter=0.0, error_rate=0.0,
+                 requests_per_minute=None, retry_after=None, invalid_symbols=(), seed=0, as_of=None,
+                 chain_kwargs=None):
+        """
+        Local http server answering every endpoint of Client (the token endpoint included) with recorded responses
+        or deterministic synthetic ones, to load test and benchmark the client offline, e.g.
+        `with MockSchwabServer(latency=0.02, error_rate=0.01) as server: Client(..., base_url=server.url)`.
+        Any bearer token is accepted, requests without one get a 401.
+        :param host: interface to listen on
+        :type host: str
+        :param port: port to listen on (0 picks a free port, see url)
+        :type port: int
+        :param recordings: directory of RecordingAdapter recordings, answered before the synthetic responses
+        :type recordings: str
+        :param latency: seconds added to every response
+        :type latency: float
+        :param latency_jitter: random extra seconds (uniform, up to this) added to every response
+        :type latency_jitter: float
+        :param error_rate: share of requests answered with a 429 at random (the token endpoint excluded)
+        :type error_rate: float
+        :param requests_per_minute: requests accepted per rolling minute, the others get a 429 (None for no limit)
+        :type requests_per_minute: int
+        :param retry_after: Retry-After header sent with the 429 responses in seconds (None sends none)
+        :type retry_after: float
+        :param invalid_symbols: symbols the quote endpoints report as invalid
+        :type invalid_symbols: list
+        :param seed: random seed (synthetic data and error injection)
+        :type seed: int
+        :param as_of: date the option chains and price history are generated for (defaults to today)
+        :type as_of: datetime
+        :param chain_kwargs: extra SyntheticOptionChain arguments (expirations, strikes, volatility...)
+        :type chain_kwargs: dict
+        """
+        self.store = RecordingStore(recordings) if recordings else None
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.error_rate = error_rate
+        self.requests_per_minute = requests_per_minute
+        self.retry_after = retry_after
+        self.invalid_symbols = set(invalid_symbols)
+        self.seed = seed
+        self.as_of = (as_of or datetime.now()).replace(hour=0, minute=0, second=0, microsecond=0)
+        self.chain_kwargs = chain_kwargs or {}
+        self.requests = {}  # handler name -> requests served
+        self.throttled = 0  # 429 responses sent
+        self.orders = {}  # order id -> order
+        self._random = random.Random(seed)
+        self._accepted = deque()  # times of the requests accepted within the last minute
+        self._chain_cache = {}  # symbol -> generated option chain
+        self._lock = threading.Lock()
+        self._routes = [(method, re.compile(pattern), name) for method, pattern, name in ROUTES]
+        self._thread = None
+
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # Note: keep-alive, as the api does
+
+            def do_GET(self):
+                mock._handle(self)
+
+            do_POST = do_PUT = do_DELETE = do_GET
+
+            def log_message(self, format, *args):
+                pass
+
+        class Server(ThreadingHTTPServer):
+            allow_reuse_address = True
+            daemon_threads = True
+
+        self.server = Server((host, port), Handler)
+
+    @property
+    def url(self):
+        """
+        Base url to hand to Client(base_url=...)
+        """
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """
+        Serves in a background thread
+        :return: self
+        """
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def stats(self):
+        """
+        :return: requests served per handler and 429 responses sent
+        :rtype: dict
+        """
+        with self._lock:
+            return {'requests': dict(self.requests), 'throttled': self.throttled}
+
+    @staticmethod
+    def write_tokens(tokens_file):
+        """
+        Writes a tokens file with freshly issued mock tokens, so a Client starts without the browser login
+        :param tokens_file: path to tokens file
+        :type tokens_file: str
+        """
+        from .token_broker import TokenBroker
+
+        tokens = TokenBroker(tokens_file)
+        with tokens.lock():
+            now = datetime.now()
+            tokens.write(now, now, token_payload())
+
+    def _handle(self, handler):
+        parts = urlsplit(handler.path)
+        query = {name: values[-1] for name, values in parse_qs(parts.query, keep_blank_values=True).items()}
+        length = int(handler.headers.get('Content-Length') or 0)
+        body = handler.rfile.read(length) if length else b''
+
+        delay = self.latency + (self._uniform(self.latency_jitter) if self.latency_jitter else 0.0)
+        if delay > 0:
+            time.sleep(delay)
+
+        route, match = None, None
+        for method, pattern, name in self._routes:
+            match = pattern.fullmatch(parts.path) if method == handler.command else None
+            if match is not None:
+                route = name
+                break
+
+        if route != '_token':
+            if not handler.headers.get('Authorization', '').startswith('Bearer '):
+                return self._send(handler, 401, self._error(401, 'Unauthorized'))
+            if self._throttle():
+                headers = {'Retry-After': str(self.retry_after)} if self.retry_after is not None else {}
+                return self._send(handler, 429, self._error(429, 'Too Many Requests'), headers)
+
+        with self._lock:
+            self.requests[route] = self.requests.get(route, 0) + 1
+
+        if self.store is not None:
+            recorded = self.store.next(request_key(handler.command, handler.path, body))
+            if recorded is not None:
+                status_code, headers, content = recorded
+                return self._send(handler, status_code, content, headers)
+        if route is None:
+            return self._send(handler, 404, self._error(404, 'Not Found'))
+        try:
+            result = getattr(self, route)(query, body, **match.groupdict())
+        except (KeyError, ValueError) as e:
+            return self._send(handler, 400, self._error(400, 'Bad Request', f"{type(e).__name__}: {e}"))
+        except Exception as e:
+            return self._send(handler, 500, self._error(500, 'Internal Server Error', f"{type(e).__name__}: {e}"))
+        if isinstance(result, tuple):
+            return self._send(handler, *result)
+        self._send(handler, 200, result)
+
+    def _send(self, handler, status_code, payload, headers=None):
+        if isinstance(payload, bytes):
+            content = payload
+        else:
+            content = json.dumps(payload).encode('utf-8') if payload is not None else b''
+        handler.send_response(status_code)
+        headers = dict(headers or {})
+        if content and not any(name.lower() == 'content-type' for name in headers):
+            headers['Content-Type'] = 'application/json'
+        for name, value in headers.items():
+            handler.send_header(name, value)
+        handler.send_header('Content-Length', str(len(content)))
+        handler.end_headers()
+        handler.wfile.write(content)
+
+    def _uniform(self, high):
+        with self._lock:
+            return self._random.uniform(0, high)
+
+    def _throttle(self):
+        # Action: whether this request gets a 429 (rolling minute limit first, then the random injection)
+        with self._lock:
+            if self.requests_per_minute is not None:
+                now = time.monotonic()
+                while self._accepted and now - self._accepted[0] >= 60:
+                    self._accepted.popleft()
+                if len(self._accepted) >= self.requests_per_minute:
+                    self.throttled += 1
+                    return True
+                self._accepted.append(now)
+            if self.error_rate and self._random.random() < self.error_rate:
+                self.throttled += 1
+                return True
+        return False
+
+    @staticmethod
+    def _error(status, title, detail=None):
+        return {'errors': [{'status': status, 'title': title, 'detail': detail or title}]}
+
+    def _symbol_seed(self, symbol):
+        # Note: same per symbol seed as SyntheticChainClient
+        return self.seed + sum(ord(ch) for ch in symbol)
+
+    @staticmethod
+    def _price(symbol):
+        return round(20 + zlib.crc32(symbol.encode('utf-8')) % 48000 / 100, 2)
+
+    """
+    Accounts and Trading
+    """
+
+    def _token(self, query, body):
+        return token_payload()
+
+    def _account_numbers(self, query, body):
+        return [{'accountNumber': ACCOUNT_NUMBER, 'hashValue': ACCOUNT_HASH}]
+
+    def _securities_account(self):
+        return {'securitiesAccount': {
+            'type': 'MARGIN', 'accountNumber': ACCOUNT_NUMBER, 'roundTrips': 0, 'isDayTrader': False,
+            'isClosingOnlyRestricted': False, 'pfcbFlag': False, 'positions': [],
+            'currentBalances': {'cashBalance': 100000.0, 'buyingPower': 200000.0, 'liquidationValue': 100000.0,
+                                'equity': 100000.0, 'availableFunds': 100000.0}}}
+
+    def _accounts(self, query, body):
+        return [self._securities_account()]
+
+    def _account(self, query, body, account):
+        if account != ACCOUNT_HASH:
+            return 404, self._error(404, 'Not Found', f"Unknown account {account}")
+        return self._securities_account()
+
+    def _orders(self, query, body, account=None):
+        with self._lock:
+            orders = list(self.orders.values())
+        status = query.get('status')
+        return [order for order in orders if status is None or order['status'] == status]
+
+    def _order_place(self, query, body, account):
+        order = json.loads(body or b'{}')
+        with self._lock:
+            order_id = 1000 + len(self.orders)
+            self.orders[order_id] = {**order, 'orderId': order_id, 'accountNumber': ACCOUNT_NUMBER,
+                                     'status': 'WORKING', 'enteredTime': datetime.now().isoformat()}
+        return 201, None, {'Location': f"{self.url}/trader/v1/accounts/{account}/orders/{order_id}"}
+
+    def _order(self, query, body, account, order):
+        with self._lock:
+            found = self.orders.get(int(order))
+        return found if found is not None else (404, self._error(404, 'Not Found', f"Unknown order {order}"))
+
+    def _order_cancel(self, query, body, account, order):
+        with self._lock:
+            found = self.orders.get(int(order))
+            if found is not None:
+                found['status'] = 'CANCELED'
+        return (200, None) if found is not None else (404, self._error(404, 'Not Found', f"Unknown order {order}"))
+
+    def _order_replace(self, query, body, account, order):
+        cancelled = self._order_cancel(query, body, account, order)
+        if cancelled[0] != 200:
+            return cancelled
+        return self._order_place(query, body, account)
+
+    def _transactions(self, query, body, account):
+        return []
+
+    def _transaction(self, query, body, account, transaction):
+        return 404, self._error(404, 'Not Found', f"Unknown transaction {transaction}")
+
+    def _preferences(self, query, body):
+        return {'accounts': [{'accountNumber': ACCOUNT_NUMBER, 'primaryAccount': True, 'type': 'BROKERAGE',
+                              'nickName': 'Mock', 'displayAcctId': f"...{ACCOUNT_NUMBER[-3:]}",
+                              'autoPositionEffect': False, 'accountColor': 'Green'}],
+                'streamerInfo': [{'streamerSocketUrl': 'wss://127.0.0.1/ws', 'schwabClientCustomerId': 'mock',
+                                  'schwabClientCorrelId': 'mock', 'schwabClientChannel': 'N9',
+                                  'schwabClientFunctionId': 'APIAPP'}],
+                'offers': [{'level2Permissions': True, 'mktDataPermission': 'NP'}]}
+
+    """
+    Market Data
+    """
+
+    def _quote_payload(self, symbol):
+        price = self._price(symbol)
+        spread = max(round(price * 0.0005, 2), 0.01)
+        volume = zlib.crc32(symbol.encode('utf-8')) % 50_000_000
+        return {'assetMainType': 'EQUITY', 'assetSubType': 'COE', 'quoteType': 'NBBO', 'realtime': True,
+                'ssid': zlib.crc32(symbol.encode('utf-8')), 'symbol': symbol,
+                'quote': {'askPrice': round(price + spread, 2), 'askSize': 100, 'bidPrice': round(price - spread, 2),
+                          'bidSize': 100, 'closePrice': round(price * 0.99, 2), 'highPrice': round(price * 1.01, 2),
+                          'lastPrice': price, 'lastSize': 100, 'lowPrice': round(price * 0.98, 2), 'mark': price,
+                          'netChange': round(price * 0.01, 2), 'netPercentChange': 1.0,
+                          'openPrice': round(price * 0.995, 2), 'totalVolume': volume,
+                          'quoteTime': int(time.time() * 1000), 'tradeTime': int(time.time() * 1000)},
+                'reference': {'description': f"{symbol} Mock Corp", 'exchange': 'Q', 'exchangeName': 'NASDAQ'}}
+
+    def _quotes(self, query, body):
+        symbols = [symbol.strip() for symbol in query.get('symbols', '').split(',') if symbol.strip()]
+        payload = {symbol: self._quote_payload(symbol) for symbol in symbols if symbol not in self.invalid_symbols}
+        invalid = [symbol for symbol in symbols if symbol in self.invalid_symbols]
+        if invalid:
+            payload['errors'] = {'invalidSymbols': invalid}
+        return payload
+
+    def _quote(self, query, body, symbol):
+        if symbol in self.invalid_symbols:
+            return {'errors': {'invalidSymbols': [symbol]}}
+        return {symbol: self._quote_payload(symbol)}
+
+    def _chain(self, symbol):
+        # Action: one generated chain per symbol, filtered per request
+        with self._lock:
+            chain = self._chain_cache.get(symbol)
+        if chain is None:
+            from marketquant.strategy_simulator.core.data_sources.synthetic import SyntheticOptionChain
+
+            chain = SyntheticOptionChain(symbol, **{'underlying_price': self._price(symbol), 'as_of': self.as_of,
+                                                    'seed': self._symbol_seed(symbol), **self.chain_kwargs}).generate()
+            with self._lock:
+                chain = self._chain_cache.setdefault(symbol, chain)
+        return chain
+
+    def _chains(self, query, body):
+        chain = self._chain(query['symbol'])
+        from_date, to_date = query.get('fromDate'), query.get('toDate')
+        contract_type = query.get('contractType', 'ALL').upper()
+
+        def expirations(date_map, keep):
+            if not keep:
+                return {}
+            return {key: strikes for key, strikes in date_map.items()
+                    if (from_date is None or key[:10] >= from_date[:10])
+                    and (to_date is None or key[:10] <= to_date[:10])}
+
+        calls = expirations(chain['callExpDateMap'], contract_type in ('ALL', 'CALL'))
+        puts = expirations(chain['putExpDateMap'], contract_type in ('ALL', 'PUT'))
+        contracts = sum(len(strikes) for date_map in (calls, puts) for strikes in date_map.values())
+        return {**chain, 'numberOfContracts': contracts, 'callExpDateMap': calls, 'putExpDateMap': puts}
+
+    def _expiration_chain(self, query, body):
+        chain = self._chain(query['symbol'])
+        expirations = []
+        for key in chain['callExpDateMap']:
+            date, days = key.split(':')
+            expirations.append({'expirationDate': date, 'daysToExpiration': int(days), 'expirationType': 'W',
+                                'settlementType': 'P', 'optionRoots': query['symbol'], 'standard': True})
+        return {'status': 'SUCCESS', 'expirationList': expirations}
+
+    def _price_history(self, query, body):
+        import pandas as pd
+        from marketquant.strategy_simulator.core.data_sources.synthetic import SyntheticDataSource
+
+        symbol = query['symbol']
+        frequency_type = query.get('frequencyType', 'minute' if query.get('periodType', 'day') == 'day' else 'daily')
+        unit = FREQUENCY_AGGREGATIONS[frequency_type]
+        aggregation = f"{query.get('frequency', 1)}{unit}" if unit in ('m', 'd') else unit
+
+        end = pd.Timestamp(int(query['endDate']), unit='ms', tz='UTC') if 'endDate' in query \
+            else pd.Timestamp(self.as_of + timedelta(days=1), tz='UTC')
+        if 'startDate' in query:
+            start = pd.Timestamp(int(query['startDate']), unit='ms', tz='UTC')
+        else:
+            period_type = query.get('periodType', 'day')
+            default_period, days = PERIOD_DAYS[period_type]
+            if days is None:
+                start = end.replace(month=1, day=1)
+            else:
+                start = end - pd.Timedelta(days=int(query.get('period', default_period)) * days)
+        extended = query.get('needExtendedHoursData', 'false').lower() == 'true'
+
+        # Note: every request is generated on its own (deterministic per symbol and start day, not continuous
+        # across requests), starting from the quote price
+        start_day = start.tz_convert('America/New_York').normalize().tz_localize(None)
+        end_day = end.tz_convert('America/New_York').normalize().tz_localize(None) + pd.Timedelta(days=1)
+        source = SyntheticDataSource(symbol, start_date=start_day, end_date=end_day, aggregation=aggregation,
+                                     seed=self._symbol_seed(symbol) + start_day.toordinal(),
+                                     start_price=self._price(symbol),
+                                     session_start='04:00' if extended else '09:30',
+                                     session_end='20:00' if extended else '16:00')
+        bars = source.get_data() if start < end else None
+        candles = []
+        if bars is not None and len(bars):
+            bars = bars[(bars['Date'] >= start) & (bars['Date'] < end)]
+            epoch = bars['Date'].dt.tz_convert('UTC').dt.as_unit('ms').astype('int64')
+            candles = [{'open': o, 'high': h, 'low': lo, 'close': c, 'volume': int(v), 'datetime': int(t)}
+                       for o, h, lo, c, v, t in zip(bars['Open'].round(2), bars['High'].round(2), bars['Low'].round(2),
+                                                    bars['Close'].round(2), bars['Volume'], epoch)]
+        return {'candles': candles, 'symbol': symbol, 'empty': not candles}
+
+    def _movers(self, query, body, index):
+        screeners = []
+        for symbol in MOVERS:
+            quote = self._quote_payload(symbol)['quote']
+            screeners.append({'symbol': symbol, 'description': f"{symbol} Mock Corp", 'lastPrice': quote['lastPrice'],
+                              'netChange': quote['netChange'], 'netPercentChange': quote['netPercentChange'] / 100,
+                              'volume': quote['totalVolume'], 'totalVolume': quote['totalVolume'], 'trades': 0})
+        return {'screeners': screeners}
+
+    def _market_hours(self, market, date):
+        day = date or self.as_of.strftime('%Y-%m-%d')
+        is_open = datetime.strptime(day, '%Y-%m-%d').weekday() < 5
+        product = {'equity': 'EQ', 'option': 'EQO'}.get(market, market)
+        hours = {'date': day, 'marketType': market.upper(), 'product': product, 'productName': market,
+                 'isOpen': is_open}
+        if is_open:
+            hours['sessionHours'] = {'regularMarket': [{'start': f"{day}T09:30:00-04:00",
+                                                        'end': f"{day}T16:00:00-04:00"}]}
+        return {market: {product: hours}}
+
+    def _markets(self, query, body):
+        payload = {}
+        for market in query.get('markets', 'equity').split(','):
+            payload.update(self._market_hours(market.strip().lower(), query.get('date')))
+        return payload
+
+    def _market(self, query, body, market):
+        return self._market_hours(market.lower(), query.get('date'))
+
+    def _instrument_payload(self, symbol):
+        return {'cusip': f"{zlib.crc32(symbol.encode('utf-8')) % 10 ** 9:09d}", 'symbol': symbol,
+                'description': f"{symbol} Mock Corp", 'exchange': 'NASDAQ', 'assetType': 'EQUITY'}
+
+    def _instruments(self, query, body):
+        return {'instruments': [self._instrument_payload(symbol.strip()) for symbol in query['symbol'].split(',')]}
+
+    def _instrument(self, query, body, cusip):
+        return {'instruments': [{**self._instrument_payload(f"CUSIP{cusip[-4:]}"), 'cusip': cusip}]}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m marketquant.data_provider.schwab.mock_server',
+                                     description='Serve a mock Schwab API for offline load tests and benchmarks.')
+    parser.add_argument('--host', default='127.0.0.1', help='Interface to listen on (default: 127.0.0.1).')
+    parser.add_argument('--port', type=int, default=8080, help='Port to listen on (default: 8080).')
+    parser.add_argument('--recordings', help='Directory of recorded responses served before the synthetic ones.')
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds added to every response.')
+    parser.add_argument('--latency-jitter', type=float, default=0.0, help='Random extra seconds per response.')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Share of requests answered with a 429.')
+    parser.add_argument('--requests-per-minute', type=int, help='Requests accepted per minute before 429s.')
+    parser.add_argument('--retry-after', type=float, help='Retry-After seconds sent with the 429 responses.')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed (default: 0).')
+    parser.add_argument('--tokens-file', help='Writes a tokens file with mock tokens for the Client first.')
+    args = parser.parse_args(argv)
+
+    if args.tokens_file:
+        MockSchwabServer.write_tokens(args.tokens_file)
+    server = MockSchwabServer(args.host, args.port, recordings=args.recordings, latency=args.latency,
+                              latency_jitter=args.latency_jitter, error_rate=args.error_rate,
+                              requests_per_minute=args.requests_per_minute, retry_after=args.retry_after,
+                              seed=args.seed)
+    print(f"Serving a mock Schwab API on {server.url}...")
+    try:
+        server.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server.server_close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,110 @@
+import json
+import numpy as np
+
+try:
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+
+# Note: numeric contract fields decoded into columns (missing or null values become NaN)
+NUMERIC_FIELDS = ('bid', 'ask', 'last', 'mark', 'bidSize', 'askSize', 'totalVolume', 'volatility', 'delta', 'gamma',
+                  'theta', 'vega', 'rho', 'openInterest', 'timeValue', 'theoreticalOptionValue', 'daysToExpiration',
+                  'multiplier')
+
+
+def loads(content):
+    """
+    Parses JSON with orjson when it is installed (several times faster on large chains), json otherwise.
+    """
+    if _orjson is not None:
+        return _orjson.loads(content)
+    return json.loads(content)
+
+
+class OptionChain:
+
+    def __init__(self, columns, symbol=None, underlying_price=None):
+        """
+        Option chain held column-wise, one NumPy array per field and one row per contract (calls, then puts).
+        Columns: symbol, isCall, strikePrice, expirationKey (the "date:days" key of the Schwab maps), expiration
+        (datetime64 of the expiration date) and NUMERIC_FIELDS.
+        :param columns: dictionary of column name -> array
+        :param symbol: underlying symbol
+        :param underlying_price: underlying price
+        """
+        self.columns = columns
+        self.symbol = symbol
+        self.underlying_price = underlying_price
+
+    def __len__(self):
+        return len(self.columns['strikePrice'])
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    @classmethod
+    def concat(cls, chains):
+        """
+        Merges chains of the same underlying (e.g. fetched per expiration window), in the given order.
+        """
+        chains = [chain for chain in chains if chain is not None]
+        if not chains:
+            return decode_option_chain({})
+        names = chains[0].columns.keys()
+        columns = {name: np.concatenate([chain.columns[name] for chain in chains]) for name in names}
+        underlying_price = next((chain.underlying_price for chain in chains if chain.underlying_price is not None), None)
+        return cls(columns, chains[0].symbol, underlying_price)
+
+    def to_pandas(self):
+        import pandas as pd
+
+        return pd.DataFrame(self.columns)
+
+    def to_arrow(self):
+        import pyarrow as pa
+
+        return pa.table(self.columns)
+
+
+def decode_option_chain(payload):
+    """
+    Decodes an option_chains response straight into columns, without building a dictionary per contract.
+    :param payload: response (anything with .content), raw JSON (bytes or str) or the parsed dictionary
+    :return: OptionChain
+    """
+    if hasattr(payload, 'content'):
+        payload = payload.content
+    elif hasattr(payload, 'json'):
+        payload = payload.json()  # Note: responses without the raw body (e.g. SyntheticResponse)
+    if isinstance(payload, (bytes, bytearray, memoryview, str)):
+        payload = loads(payload)
+
+    contracts, is_call, expiration_keys, strikes, strike_counts = [], [], [], [], []
+    counts = []  # contracts per expiration map key, used to repeat the per expiration values
+    for call, date_map in ((True, payload.get('callExpDateMap') or {}), (False, payload.get('putExpDateMap') or {})):
+        for expiration_key, strike_map in date_map.items():
+            start = len(contracts)
+            for strike_key, group in strike_map.items():
+                contracts.extend(group)
+                strikes.append(float(strike_key))
+                strike_counts.append(len(group))
+            expiration_keys.append(expiration_key)
+            counts.append(len(contracts) - start)
+            is_call.append(call)
+
+    count = len(contracts)
+    counts = np.asarray(counts, dtype=np.int64)
+    # Note: expiration values are parsed once per expiration key, then repeated for its contracts
+    expiration_dates = np.array([key.split(':')[0] for key in expiration_keys], dtype='datetime64[ns]')
+
+    columns = {
+        'symbol': np.array([contract.get('symbol') for contract in contracts], dtype=object),
+        'isCall': np.repeat(np.asarray(is_call, dtype=bool), counts),
+        'strikePrice': np.repeat(np.asarray(strikes, dtype=float), np.asarray(strike_counts, dtype=np.int64)),
+        'expirationKey': np.repeat(np.asarray(expiration_keys, dtype=object), counts),
+        'expiration': np.repeat(expiration_dates, counts),
+    }
+    for field in NUMERIC_FIELDS:
+        values = [contract.get(field) for contract in contracts]
+        columns[field] = np.array(values, dtype=float) if count else np.empty(0)
+    return OptionChain(columns, payload.get('symbol'), payload.get('underlyingPrice'))
@@ -0,0 +1,154 @@
+import time
+import asyncio
+import heapq
+import itertools
+import threading
+
+# Note: lower values are served first when requests are waiting for the rate limit
+ORDER = 0
+ACCOUNT = 1
+MARKET_DATA = 2
+PRIORITY_NAMES = {ORDER: 'order', ACCOUNT: 'account', MARKET_DATA: 'market_data'}
+
+# Note: priority of the Client endpoints (method names), endpoints missing here are market data
+ENDPOINT_PRIORITIES = {
+    'order_place': ORDER, 'order_cancel': ORDER, 'order_replace': ORDER, 'order_details': ORDER,
+    'account_orders': ORDER, 'account_orders_all': ORDER,
+    'account_linked': ACCOUNT, 'account_details_all': ACCOUNT, 'account_details': ACCOUNT,
+    'transactions': ACCOUNT, 'transaction_details': ACCOUNT, 'preferences': ACCOUNT,
+}
+
+
+def priority_of(endpoint):
+    return ENDPOINT_PRIORITIES.get(endpoint, MARKET_DATA)
+
+
+class RateLimiter:
+
+    def __init__(self, requests_per_minute=120, burst=None):
+        """
+        Token bucket shared by every thread using a Client. When requests have to wait, orders go first, then account
+        calls, then market data, so a bulk scan never delays an order by more than one token.
+        :param requests_per_minute: sustained request rate (Schwab allows 120 per minute per app by default)
+        :type requests_per_minute: float
+        :param burst: requests that can be sent at once after an idle period (defaults to a twentieth of a minute)
+        :type burst: int
+        """
+        self.rate = requests_per_minute / 60.0  # tokens per second
+        self.burst = burst or max(1, int(requests_per_minute / 20))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._condition = threading.Condition()
+        self._waiting = []  # heap of (priority, sequence)
+        self._sequence = itertools.count()
+        self._stats = {priority: {'requests': 0, 'wait_seconds': 0.0, 'max_wait_seconds': 0.0}
+                       for priority in PRIORITY_NAMES}
+        self._throttled = 0
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _turn(self, entry):
+        # Action: takes a token for a queued request once every request ahead of it can be served too, else returns
+        # the seconds until its turn (call while holding the condition)
+        self._refill()
+        ahead = sum(1 for waiting in self._waiting if waiting < entry)
+        if self._tokens >= ahead + 1:
+            self._tokens -= 1
+            return 0.0
+        return (ahead + 1 - self._tokens) / self.rate
+
+    def _record(self, priority, waited):
+        stats = self._stats[priority]
+        stats['requests'] += 1
+        stats['wait_seconds'] += waited
+        stats['max_wait_seconds'] = max(stats['max_wait_seconds'], waited)
+
+    def acquire(self, priority=MARKET_DATA):
+        """
+        Blocks until the request may be sent.
+        :param priority: ORDER, ACCOUNT or MARKET_DATA
+        :type priority: int
+        :return: seconds waited
+        :rtype: float
+        """
+        start = time.monotonic()
+        with self._condition:
+            entry = (priority, next(self._sequence))
+            heapq.heappush(self._waiting, entry)
+            try:
+                while True:
+                    delay = self._turn(entry)
+                    if delay == 0:
+                        break
+                    # Note: every waiter sleeps until its expected turn, served requests wake them up earlier
+                    self._condition.wait(delay)
+            finally:
+                self._waiting.remove(entry)
+                heapq.heapify(self._waiting)
+                self._condition.notify_all()
+
+            waited = time.monotonic() - start
+            self._record(priority, waited)
+        return waited
+
+    async def acquire_async(self, priority=MARKET_DATA):
+        """
+        Same as acquire() for asyncio, waiting on the event loop instead of blocking a thread (shares the queue and
+        the priorities with the threads). A cancelled wait does not take a token.
+        :param priority: ORDER, ACCOUNT or MARKET_DATA
+        :type priority: int
+        :return: seconds waited
+        :rtype: float
+        """
+        start = time.monotonic()
+        with self._condition:
+            entry = (priority, next(self._sequence))
+            heapq.heappush(self._waiting, entry)
+        try:
+            while True:
+                with self._condition:
+                    delay = self._turn(entry)
+                if delay == 0:
+                    break
+                await asyncio.sleep(delay)
+        finally:
+            with self._condition:
+                self._waiting.remove(entry)
+                heapq.heapify(self._waiting)
+                self._condition.notify_all()
+
+        waited = time.monotonic() - start
+        with self._condition:
+            self._record(priority, waited)
+        return waited
+
+    def throttled(self):
+        """
+        Called when the api answers 429, empties the bucket so the next requests wait for the rate to recover
+        instead of failing again.
+        """
+        with self._condition:
+            self._refill()
+            self._tokens = min(self._tokens, 0.0)
+            self._throttled += 1
+
+    def stats(self):
+        """
+        :return: queue depth and wait times per priority, and the number of 429 responses
+        :rtype: dict
+        """
+        with self._condition:
+            self._refill()
+            queued = {name: 0 for name in PRIORITY_NAMES.values()}
+            for priority, _ in self._waiting:
+                queued[PRIORITY_NAMES[priority]] += 1
+            priorities = {}
+            for priority, stats in self._stats.items():
+                priorities[PRIORITY_NAMES[priority]] = {
+                    **stats, 'queued': queued[PRIORITY_NAMES[priority]],
+                    'mean_wait_seconds': stats['wait_seconds'] / stats['requests'] if stats['requests'] else 0.0}
+            return {'tokens': self._tokens, 'queued': len(self._waiting), 'throttled': self._throttled,
+                    'priorities': priorities}
@@ -0,0 +1,151 @@
+import os
+import json
+import time
+import atexit
+import base64
+import threading
+from collections import OrderedDict
+
+# Note: seconds a response stays valid for the endpoints whose data rarely changes, other endpoints are never cached
+CACHE_TTLS = {
+    'market_hours': 3600,
+    'market_hour': 3600,
+    'instruments': 86400,
+    'instrument_cusip': 86400,
+    'option_expiration_chain': 3600,
+    'preferences': 3600,
+}
+# Note: headers describing the body as sent over the wire, the cached content is already decoded
+TRANSFER_HEADERS = ('content-encoding', 'content-length', 'transfer-encoding')
+
+
+class ResponseCache:
+
+    def __init__(self, ttls=None, max_entries=1024, path=None, flush_interval=60):
+        """
+        Cache of successful GET responses for slow changing endpoints, kept in memory (least recently used entries
+        are evicted past max_entries) and optionally persisted to disk so restarts skip the calls too.
+        The file is JSON (bodies as text or base64, like the recordings of RecordingStore), written at most every
+        flush_interval seconds when new responses come in, on close() and at exit.
+        :param ttls: seconds to keep each endpoint (Client method name), merged over CACHE_TTLS (0 disables one)
+        :type ttls: dict
+        :param max_entries: responses kept in memory
+        :type max_entries: int
+        :param path: file to persist the cache to (None to keep it in memory only)
+        :type path: str
+        :param flush_interval: minimum seconds between two writes of the file while responses are added
+        :type flush_interval: float
+        """
+        self.ttls = {**CACHE_TTLS, **(ttls or {})}
+        self.max_entries = max_entries
+        self.path = path
+        self.flush_interval = flush_interval
+        self._entries = OrderedDict()  # key -> (expires, status code, headers, content)
+        self._lock = threading.Lock()
+        self._dirty = False  # Note: entries added since the file was last written
+        self._saved = time.monotonic()
+        self.hits = 0
+        self.misses = 0
+        if path is not None:
+            if os.path.exists(path):
+                self._load()
+            atexit.register(self.close)
+
+    def cacheable(self, method, endpoint):
+        return method == 'GET' and self.ttls.get(endpoint, 0) > 0
+
+    @staticmethod
+    def key(endpoint, path, params):
+        return endpoint, path, tuple(sorted((name, str(value)) for name, value in (params or {}).items()))
+
+    def get(self, key):
+        """
+        :return: (status code, headers, content) of the cached response, None when missing or expired
+        :rtype: tuple | None
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.time():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1:]
+
+    @staticmethod
+    def _headers(headers):
+        return {name: value for name, value in headers.items() if name.lower() not in TRANSFER_HEADERS}
+
+    def put(self, key, status_code, headers, content):
+        with self._lock:
+            self._entries[key] = (time.time() + self.ttls[key[0]], status_code, self._headers(headers), content)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._dirty = True
+        # Note: the file is rewritten in full, so it is only written periodically (and on close), not on every miss
+        if self.path is not None and time.monotonic() - self._saved >= self.flush_interval:
+            self.save()
+
+    def close(self):
+        """
+        Writes the responses added since the last write to the file (called at exit too)
+        """
+        if self.path is not None and self._dirty:
+            self.save()
+
+    def invalidate(self, endpoint=None):
+        """
+        Drops cached responses.
+        :param endpoint: Client method name to drop (e.g. "market_hours"), None drops everything
+        :type endpoint: str
+        """
+        with self._lock:
+            for key in [key for key in self._entries if endpoint is None or key[0] == endpoint]:
+                del self._entries[key]
+        if self.path is not None:
+            self.save()
+
+    def save(self):
+        # Action: writes a temporary file and swaps it in, readers never see a partial cache
+        with self._lock:
+            entries = list(self._entries.items())
+            self._dirty = False
+            self._saved = time.monotonic()
+        records = []
+        for (endpoint, path, params), (expires, status_code, headers, content) in entries:
+            record = {'endpoint': endpoint, 'path': path, 'params': [list(param) for param in params],
+                      'expires': expires, 'status_code': status_code, 'headers': dict(headers)}
+            try:
+                record['text'] = content.decode('utf-8')
+            except UnicodeDecodeError:
+                record['base64'] = base64.b64encode(content).decode('ascii')
+            records.append(record)
+        temporary = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temporary, 'w', encoding='utf-8') as f:
+            json.dump({'entries': records}, f, ensure_ascii=False)
+        os.replace(temporary, self.path)
+
+    def _load(self):
+        # Note: plain JSON, a cache file is only ever read as data (never unpickled)
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                records = json.load(f)['entries']
+            entries = []
+            for record in records:
+                key = (record['endpoint'], record['path'], tuple(tuple(param) for param in record['params']))
+                content = base64.b64decode(record['base64']) if 'base64' in record \
+                    else record.get('text', '').encode('utf-8')
+                entries.append((key, (float(record['expires']), int(record['status_code']),
+                                      self._headers(record['headers']), content)))
+        except Exception as e:
+            print(f"Warning: could not load the response cache {self.path}: {e}")
+            return
+        now = time.time()
+        for key, entry in sorted(entries, key=lambda item: item[1][0]):
+            if entry[0] > now:
+                self._entries[key] = entry
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
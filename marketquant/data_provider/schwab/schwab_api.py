@@ -1,18 +1,36 @@
-import json
 import time
 import base64
+import random
 import requests
 import threading
 import webbrowser
 import urllib.parse
 from .schwab_stream import Stream
-from datetime import datetime
+from .rate_limiter import RateLimiter, priority_of
+from .response_cache import ResponseCache
+from .token_broker import TokenBroker
+from .metrics import ClientMetrics, parse_timer
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+# Note: seconds allowed per endpoint (large payloads), the other endpoints use the client's timeout
+ENDPOINT_TIMEOUTS = {'option_chains': 30, 'price_history': 15, 'transactions': 15, 'account_orders_all': 15}
+# Note: 429 (rate limited) and transient server errors are retried with backoff
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+# Note: Client methods that send one api call and return self._request(...) unchanged, AsyncClient exposes each of
+# them as a coroutine (keep the list in sync when adding an endpoint)
+ENDPOINTS = ('account_linked', 'account_details_all', 'account_details', 'account_orders', 'order_place',
+             'order_details', 'order_cancel', 'order_replace', 'account_orders_all', 'transactions',
+             'transaction_details', 'preferences', 'quotes', 'quote', 'option_chains', 'option_expiration_chain',
+             'price_history', 'movers', 'market_hours', 'market_hour', 'instruments', 'instrument_cusip')
 
 
 class Client:
 
     def __init__(self, app_key, app_secret, callback_url="https://127.0.0.1", tokens_file="tokens.json", timeout=5,
-                 verbose=False, update_tokens_auto=True):
+                 verbose=False, update_tokens_auto=True, pool_size=10, max_retries=3, backoff_factor=0.5,
+                 max_backoff=30, timeouts=None, rate_limiter=None, cache=None,
+                 metrics=None, base_url=None, transport=None):
         """
         Initialize a client to access the Schwab API.
         :param app_key: app key credentials
@@ -29,6 +47,27 @@ class Client:
         :type verbose: bool
         :param show_linked: print linked accounts
         :type show_linked: bool
+        :param pool_size: keep-alive connections kept open (use at least the number of threads sharing the client)
+        :type pool_size: int
+        :param max_retries: retries of a request answered with 429 or 5xx (or failing to connect)
+        :type max_retries: int
+        :param backoff_factor: first retry waits up to this many seconds, doubling with every retry (full jitter)
+        :type backoff_factor: float
+        :param max_backoff: longest wait between two retries in seconds
+        :type max_backoff: float
+        :param timeouts: request timeout per endpoint (method name, e.g. {"option_chains": 60}), others use timeout
+        :type timeouts: dict
+        :param rate_limiter: RateLimiter to share (None creates one at 120 requests per minute, False disables it)
+        :type rate_limiter: RateLimiter | None | bool
+        :param cache: ResponseCache for slow changing endpoints (None creates one in memory, False disables it)
+        :type cache: ResponseCache | None | bool
+        :param metrics: ClientMetrics recording every request (None creates one, False disables them)
+        :type metrics: ClientMetrics | None | bool
+        :param base_url: api root (e.g. the url of a MockSchwabServer), None uses https://api.schwabapi.com
+        :type base_url: str
+        :param transport: requests adapter sending the requests (e.g. RecordingAdapter or ReplayAdapter), None pools
+                          connections to the api
+        :type transport: requests.adapters.BaseAdapter
         """
 
         if app_key is None:
@@ -61,8 +100,20 @@ class Client:
         self._access_token_timeout = 1800  # in seconds (from schwab)
         self._refresh_token_timeout = 7  # in days (from schwab)
         self._tokens_file = tokens_file  # path to tokens file
+        self._tokens = TokenBroker(tokens_file)  # locked, atomic access to the tokens file shared by all processes
         self.timeout = timeout  # timeout to use in requests
         self.verbose = verbose  # verbose mode
+        self.timeouts = {**ENDPOINT_TIMEOUTS, **(timeouts or {})}  # timeout per endpoint
+        self.max_retries = max_retries  # retries on 429/5xx
+        self.backoff_factor = backoff_factor  # base of the exponential backoff
+        self.max_backoff = max_backoff  # cap of the exponential backoff
+        if base_url is not None:
+            self._base_api_url = base_url.rstrip('/')  # api root, the class default is the Schwab api
+        self._session = self._create_session(pool_size, transport)  # pooled keep-alive connections
+        self._authorization = (None, None)  # (access token, header) built once per token
+        self.rate_limiter = RateLimiter() if rate_limiter is None else (rate_limiter or None)  # client side throttling
+        self.cache = ResponseCache() if cache is None else (cache or None)  # cache of slow changing endpoints
+        self.metrics = ClientMetrics() if metrics is None else (metrics or None)  # request level metrics
         self.stream = Stream(self)  # init the streaming object
         self.awaiting_input = False  # whether we are awaiting user input
 
@@ -83,12 +134,15 @@ class Client:
             # check if tokens need to be updated and update if needed
             self.update_tokens()
         else:
-            # The tokens file doesn't exist, so create it.
-            if self.verbose:
-                print(f"Token file does not exist or invalid formatting, creating \"{str(tokens_file)}\"")
-            open(self._tokens_file, 'w').close()
-            # Tokens must be updated.
-            self._update_refresh_token()
+            with self._tokens.lock():
+                # Note: another process may have created the tokens while this one waited for the lock
+                loaded = self._load_tokens()
+            if not loaded:
+                # The tokens file doesn't exist, so create it.
+                if self.verbose:
+                    print(f"Token file does not exist or invalid formatting, creating \"{str(tokens_file)}\"")
+                # Tokens must be updated.
+                self._update_refresh_token()
 
         # Spawns a thread to check the access token and update if necessary
         if update_tokens_auto:
@@ -106,19 +160,50 @@ class Client:
 
     def update_tokens(self, force=False):
         """
-        Checks if tokens need to be updated and updates if needed (only access token is automatically updated)
+        Checks if tokens need to be updated and updates if needed (only access token is automatically updated).
+        Tokens refreshed by another process (or client) sharing the tokens file are picked up instead of refreshed
+        again, the refresh itself happens under the tokens file lock (except the browser login, see
+        _update_refresh_token).
         :param force: force update of refresh token (also updates access token)
         :type force: bool
         """
-        if (datetime.now() - self._refresh_token_issued).days >= (
-                self._refresh_token_timeout - 1) or force:  # check if we need to update refresh (and access) token
+        self._load_tokens()
+        if self._refresh_token_expiring() or force:  # check if we need to update refresh (and access) token
+            with self._tokens.lock():
+                if self._load_tokens() and not force and not self._refresh_token_expiring():
+                    return  # Note: updated by another process while this one waited for the lock
             print("The refresh token has expired, please update!")
             self._update_refresh_token()
-        elif ((datetime.now() - self._access_token_issued).days >= 1) or (
-                (datetime.now() - self._access_token_issued).seconds > (
-                self._access_token_timeout - 61)):  # check if we need to update access token
-            if self.verbose: print("The access token has expired, updating automatically.")
-            self._update_access_token()
+        elif self._access_token_expiring():  # check if we need to update access token
+            with self._tokens.lock():
+                if self._load_tokens() and not self._access_token_expiring():
+                    return
+                if self.verbose: print("The access token has expired, updating automatically.")
+                self._update_access_token()
+
+    def _refresh_token_expiring(self):
+        return (datetime.now() - self._refresh_token_issued).days >= (self._refresh_token_timeout - 1)
+
+    def _access_token_expiring(self):
+        return ((datetime.now() - self._access_token_issued).days >= 1) or (
+                (datetime.now() - self._access_token_issued).seconds > (self._access_token_timeout - 61))
+
+    def _load_tokens(self):
+        """
+        Adopts the tokens of the tokens file when it changed (a stat call when it did not)
+        :return: whether valid tokens are loaded
+        :rtype: bool
+        """
+        if self._tokens.changed() or self.access_token is None:
+            at_issued, rt_issued, token_dictionary = self._read_tokens_file()
+            if None in [at_issued, rt_issued, token_dictionary]:
+                return False
+            self.access_token = token_dictionary.get("access_token")
+            self.refresh_token = token_dictionary.get("refresh_token")
+            self.id_token = token_dictionary.get("id_token")
+            self._access_token_issued = at_issued
+            self._refresh_token_issued = rt_issued
+        return self.access_token is not None
 
     def update_tokens_auto(self):
         import warnings
@@ -155,15 +240,32 @@ class Client:
     def _update_refresh_token(self):
         """
         Get new access and refresh tokens using authorization code.
+        The tokens file lock is not held while waiting for the pasted url (other processes keep working), it is taken
+        afterwards and the tokens file read again: tokens another process got in the meantime are kept.
         """
+        refresh_token_issued = self._refresh_token_issued
         self.awaiting_input = True  # set flag since we are waiting for user input
         # get authorization code (requires user to authorize)
         # print("Please authorize this program to access your schwab account.")
-        auth_url = f'https://api.schwabapi.com/v1/oauth/authorize?client_id={self._app_key}&redirect_uri={self._callback_url}'
+        auth_url = f'{self._base_api_url}/v1/oauth/authorize?client_id={self._app_key}&redirect_uri={self._callback_url}'
         print(f"Open to authenticate: {auth_url}")
         webbrowser.open(auth_url)
         response_url = input("After authorizing, paste the address bar url here: ")
         code = f"{response_url[response_url.index('code=') + 5:response_url.index('%40')]}@"  # session = responseURL[responseURL.index("session=")+8:]
+        with self._tokens.lock():
+            if self._load_tokens() and self._refresh_token_issued != refresh_token_issued \
+                    and not self._refresh_token_expiring():
+                self.awaiting_input = False
+                if self.verbose: print("Tokens were updated by another process, keeping them")
+                return
+            self._exchange_authorization_code(code)
+
+    def _exchange_authorization_code(self, code):
+        """
+        Gets new access and refresh tokens for an authorization code and writes them (under the tokens file lock)
+        :param code: authorization code
+        :type code: str
+        """
         # get new access and refresh tokens
         response = self._post_oauth_token('authorization_code', code)
         if response.ok:
@@ -202,11 +304,11 @@ class Client:
             data = {'grant_type': 'refresh_token', 'refresh_token': code}
         else:
             raise Exception("Invalid grant type; options are 'authorization_code' or 'refresh_token'")
-        return requests.post('https://api.schwabapi.com/v1/oauth/token', headers=headers, data=data)
+        return self._request('POST', '/v1/oauth/token', 'oauth_token', headers=headers, data=data, authorize=False)
 
     def _write_tokens_file(self, at_issued, rt_issued, token_dictionary):
         """
-        Writes token file
+        Writes token file (atomically, see TokenBroker)
         :param at_issued: access token issued
         :type at_issued: datetime
         :param rt_issued: refresh token issued
@@ -215,28 +317,17 @@ class Client:
         :type token_dictionary: dict
         """
         try:
-            with open(self._tokens_file, 'w') as f:
-                toWrite = {"access_token_issued": at_issued.isoformat(), "refresh_token_issued": rt_issued.isoformat(),
-                           "token_dictionary": token_dictionary}
-                json.dump(toWrite, f, ensure_ascii=False, indent=4)
-                f.flush()
+            self._tokens.write(at_issued, rt_issued, token_dictionary)
         except Exception as e:
             print(e)
 
     def _read_tokens_file(self):
         """
-        Reads token file
+        Reads token file (parsed again only when it changed, see TokenBroker)
         :return: access token issued, refresh token issued, token dictionary
         :rtype: datetime, datetime, dict
         """
-        try:
-            with open(self._tokens_file, 'r') as f:
-                d = json.load(f)
-                return datetime.fromisoformat(d.get("access_token_issued")), datetime.fromisoformat(
-                    d.get("refresh_token_issued")), d.get("token_dictionary")
-        except Exception as e:
-            print(e)
-            return None, None, None
+        return self._tokens.read()
 
     def _params_parser(self, params):
         """
@@ -290,6 +381,165 @@ class Client:
 
     _base_api_url = "https://api.schwabapi.com"
 
+    def _create_session(self, pool_size, transport=None):
+        """
+        Creates the session shared by every request, so connections (TCP + TLS) are reused
+        :param pool_size: connections kept open per host
+        :type pool_size: int
+        :param transport: adapter to mount instead of the pooled HTTPAdapter
+        :type transport: requests.adapters.BaseAdapter
+        :return: session
+        :rtype: requests.Session
+        """
+        session = requests.Session()
+        # Note: retries are handled in _request (jittered backoff, Retry-After), the adapter only pools connections
+        adapter = transport or requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size,
+                                                             max_retries=0)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        session.headers.update({"Accept": "application/json"})
+        return session
+
+    def _authorization_header(self):
+        """
+        Authorization header for the current access token (rebuilt only when the token changes)
+        :return: headers
+        :rtype: dict
+        """
+        token, header = self._authorization
+        if token != self.access_token or header is None:
+            header = {'Authorization': f'Bearer {self.access_token}'}
+            self._authorization = (self.access_token, header)
+        return header
+
+    def _retry_delay(self, attempt, response=None):
+        """
+        Seconds to wait before retrying, Retry-After when the server sends one, else jittered exponential backoff
+        :param attempt: number of the failed attempt (0 for the first)
+        :type attempt: int
+        :param response: failed response (None for connection errors)
+        :type response: requests.Response
+        :return: seconds
+        :rtype: float
+        """
+        retry_after = response.headers.get('Retry-After') if response is not None else None
+        if retry_after:
+            try:
+                return min(float(retry_after), self.max_backoff)
+            except ValueError:
+                try:
+                    delay = (parsedate_to_datetime(retry_after) - datetime.now(timezone.utc)).total_seconds()
+                    return min(max(delay, 0.0), self.max_backoff)
+                except (TypeError, ValueError):
+                    pass
+        return random.uniform(0, min(self.max_backoff, self.backoff_factor * 2 ** attempt))
+
+    def _request(self, method, path, endpoint, params=None, json=None, data=None, headers=None, authorize=True):
+        """
+        Sends a request through the pooled session once the rate limiter allows it, retrying 429 and 5xx responses.
+        Endpoints with a cache ttl are answered from the cache while it is fresh.
+        :param method: http method ("GET"|"POST"|"PUT"|"DELETE")
+        :type method: str
+        :param path: path after the base url
+        :type path: str
+        :param endpoint: endpoint name (the Client method name), used to look up the timeout and the priority
+        :type endpoint: str
+        :param params: query parameters
+        :type params: dict
+        :param json: json body
+        :type json: dict
+        :param data: form body
+        :type data: dict
+        :param headers: extra headers
+        :type headers: dict
+        :param authorize: whether to send the bearer token
+        :type authorize: bool
+        :return: response
+        :rtype: requests.Response
+        """
+        cache_key = None
+        if self.cache is not None and self.cache.cacheable(method, endpoint):
+            cache_key = self.cache.key(endpoint, path, params)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                if self.metrics is not None:
+                    self.metrics.cache_hit(endpoint)
+                return self._cached_response(path, *cached)
+
+        request_headers = self._authorization_header() if authorize else {}
+        if headers:
+            request_headers = {**request_headers, **headers}
+        timeout = self.timeouts.get(endpoint, self.timeout)
+        # Note: only reads are retried on 5xx and connection errors, an order may have gone through even if the
+        # response says otherwise, a 429 on the other hand means the request was not processed
+        idempotent = method == 'GET'
+        limiter = self.rate_limiter if authorize else None  # Note: the oauth endpoint is not rate limited
+        metrics = self.metrics
+
+        attempt, waited = 0, 0.0
+        while True:
+            if limiter is not None:
+                waited += limiter.acquire(priority_of(endpoint))
+            start = time.perf_counter()
+            try:
+                response = self._session.request(method, f'{self._base_api_url}{path}', params=params, json=json,
+                                                 data=data, headers=request_headers, timeout=timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if metrics is not None:
+                    metrics.attempt(endpoint, time.perf_counter() - start, error=e)
+                if not idempotent or attempt >= self.max_retries:
+                    if metrics is not None:
+                        metrics.request(endpoint, attempt, waited)
+                    raise
+                delay = self._retry_delay(attempt)
+                if self.verbose: print(f"{endpoint} request failed ({e}), retrying in {delay:.2f} seconds.")
+            else:
+                if metrics is not None:
+                    metrics.attempt(endpoint, time.perf_counter() - start, response)
+                if response.status_code == 429 and limiter is not None:
+                    limiter.throttled()
+                retry = response.status_code == 429 or (idempotent and response.status_code in RETRY_STATUSES)
+                if not retry or attempt >= self.max_retries:
+                    if cache_key is not None and response.ok:
+                        self.cache.put(cache_key, response.status_code, response.headers, response.content)
+                    if metrics is not None:
+                        metrics.request(endpoint, attempt, waited)
+                    return response
+                delay = self._retry_delay(attempt, response)
+                if self.verbose: print(f"{endpoint} returned {response.status_code}, retrying in {delay:.2f} seconds.")
+            time.sleep(delay)
+            attempt += 1
+
+    def _cached_response(self, path, status_code, headers, content):
+        """
+        Rebuilds a response from the cache (a new one each time, so callers can not alter the cached content)
+        :rtype: requests.Response
+        """
+        response = requests.Response()
+        response.status_code = status_code
+        response.headers = requests.structures.CaseInsensitiveDict(headers)
+        response._content = content
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response.url = f'{self._base_api_url}{path}'
+        return response
+
+    def invalidate_cache(self, endpoint=None):
+        """
+        Drops cached responses so the next call fetches them again
+        :param endpoint: endpoint to drop (e.g. "market_hours"), None drops everything
+        :type endpoint: str
+        """
+        if self.cache is not None:
+            self.cache.invalidate(endpoint)
+
+    def close(self):
+        """
+        Closes the pooled connections and writes the persisted response cache
+        """
+        self._session.close()
+        if self.cache is not None:
+            self.cache.close()
+
     """
     Accounts and Trading Production
     """
@@ -300,9 +550,7 @@ class Client:
         :return: All linked account numbers and hashes
         :rtype: request.Response
         """
-        return requests.get(f'{self._base_api_url}/trader/v1/accounts/accountNumbers',
-                            headers={'Authorization': f'Bearer {self.access_token}'},
-                            timeout=self.timeout)
+        return self._request('GET', '/trader/v1/accounts/accountNumbers', 'account_linked')
 
     def account_details_all(self, fields=None):
         """
@@ -312,10 +560,8 @@ class Client:
         :return: details for all linked accounts
         :rtype: request.Response
         """
-        return requests.get(f'{self._base_api_url}/trader/v1/accounts/',
-                            headers={'Authorization': f'Bearer {self.access_token}'},
-                            params=self._params_parser({'fields': fields}),
-                            timeout=self.timeout)
+        return self._request('GET', '/trader/v1/accounts/', 'account_details_all',
+                             params=self._params_parser({'fields': fields}))
 
     def account_details(self, accountHash, fields=None):
         """
@@ -327,10 +573,8 @@ class Client:
         :return: details for one linked account
         :rtype: request.Response
         """
-        return requests.get(f'{self._base_api_url}/trader/v1/accounts/{accountHash}',
-                            headers={'Authorization': f'Bearer {self.access_token}'},
-                            params=self._params_parser({'fields': fields}),
-                            timeout=self.timeout)
+        return self._request('GET', f'/trader/v1/accounts/{accountHash}', 'account_details',
+                             params=self._params_parser({'fields': fields}))
 
     def account_orders(self, accountHash, fromEnteredTime, toEnteredTime, maxResults=None, status=None):
         """
@@ -348,13 +592,11 @@ class Client:
         :return: orders for one linked account hash
         :rtype: request.Response
         """
-        return requests.get(f'{self._base_api_url}/trader/v1/accounts/{accountHash}/orders',
-                            headers={"Accept": "application/json", 'Authorization': f'Bearer {self.access_token}'},
-                            params=self._params_parser(
-                                {'maxResults': maxResults,
-                                 'fromEnteredTime': self._time_convert(fromEnteredTime, "8601"),
-                                 'toEnteredTime': self._time_convert(toEnteredTime, "8601"), 'status': status}),
-                            timeout=self.timeout)
+        return self._request('GET', f'/trader/v1/accounts/{accountHash}/orders', 'account_orders',
+                             params=self._params_parser(
+                                 {'maxResults': maxResults,
+                                  'fromEnteredTime': self._time_convert(fromEnteredTime, "8601"),
+                                  'toEnteredTime': self._time_convert(toEnteredTime, "8601"), 'status': status}))
 
     def order_place(self, accountHash, order):
         """
@@ -366,11 +608,7 @@ class Client:
         :return: order number in response header (if immediately filled then order number not returned)
         :rtype: request.Response
         """
-        return requests.post(f'{self._base_api_url}/trader/v1/accounts/{accountHash}/orders',
-                             headers={"Accept": "application/json", 'Authorization': f'Bearer {self.access_token}',
-                                      "Content-Type": "application/json"},
-                             json=order,
-                             timeout=self.timeout)
+        return self._request('POST', f'/trader/v1/accounts/{accountHash}/orders', 'order_place', json=order)
 
     def order_details(self, accountHash, orderId):
         """
@@ -382,9 +620,7 @@ class Client:
         :return: order details
         :rtype: request.Response
         """
-        return requests.get(f'{self._base_api_url}/trader/v1/accounts/{accountHash}/orders/{orderId}',
-                            headers={'Authorization': f'Bearer {self.access_token}'},
-                            timeout=self.timeout)
+        return self._request('GET', f'/trader/v1/accounts/{accountHash}/orders/{orderId}', 'order_details')
 
     def order_cancel(self, accountHash, orderId):
         """
@@ -396,9 +632,7 @@ class Client:
         :return: response code
         :rtype: request.Response
         """
-        return requests.delete(f'{self._base_api_url}/trader/v1/accounts/{accountHash}/orders/{orderId}',
-                               headers={'Authorization': f'Bearer {self.access_token}'},
-                               timeout=self.timeout)
+        return self._request('DELETE', f'/trader/v1/accounts/{accountHash}/orders/{orderId}', 'order_cancel')
 
     def order_replace(self, accountHash, orderId, order):
         """
@@ -412,11 +646,8 @@ class Client:
         :return: response code
         :rtype: request.Response
         """
-        return requests.put(f'{self._base_api_url}/trader/v1/accounts/{accountHash}/orders/{orderId}',
-                            headers={"Accept": "application/json", 'Authorization': f'Bearer {self.access_token}',
-                                     "Content-Type": "application/json"},
-                            json=order,
-                            timeout=self.timeout)
+        return self._request('PUT', f'/trader/v1/accounts/{accountHash}/orders/{orderId}', 'order_replace',
+                             json=order)
 
     def account_orders_all(self, fromEnteredTime, toEnteredTime, maxResults=None, status=None):
         """
@@ -432,13 +663,11 @@ class Client:
         :return: all orders
         :rtype: request.Response
         """
-        return requests.get(f'{self._base_api_url}/trader/v1/orders',
-                            headers={"Accept": "application/json", 'Authorization': f'Bearer {self.access_token}'},
-                            params=self._params_parser(
-                                {'maxResults': maxResults,
-                                 'fromEnteredTime': self._time_convert(fromEnteredTime, "8601"),
-                                 'toEnteredTime': self._time_convert(toEnteredTime, "8601"), 'status': status}),
-                            timeout=self.timeout)
+        return self._request('GET', '/trader/v1/orders', 'account_orders_all',
+                             params=self._params_parser(
+                                 {'maxResults': maxResults,
+                                  'fromEnteredTime': self._time_convert(fromEnteredTime, "8601"),
+                                  'toEnteredTime': self._time_convert(toEnteredTime, "8601"), 'status': status}))
 
     """
     def order_preview(self, accountHash, orderObject):
@@ -463,12 +692,10 @@ class Client:
         :return: list of transactions for a specific account
         :rtype: request.Response
         """
-        return requests.get(f'{self._base_api_url}/trader/v1/accounts/{accountHash}/transactions',
-                            headers={'Authorization': f'Bearer {self.access_token}'},
-                            params=self._params_parser(
-                                {'accountNumber': accountHash, 'startDate': self._time_convert(startDate, "8601"),
-                                 'endDate': self._time_convert(endDate, "8601"), 'symbol': symbol, 'types': types}),
-                            timeout=self.timeout)
+        return self._request('GET', f'/trader/v1/accounts/{accountHash}/transactions', 'transactions',
+                             params=self._params_parser(
+                                 {'accountNumber': accountHash, 'startDate': self._time_convert(startDate, "8601"),
+                                  'endDate': self._time_convert(endDate, "8601"), 'symbol': symbol, 'types': types}))
 
     def transaction_details(self, accountHash, transactionId):
         """
@@ -480,10 +707,8 @@ class Client:
         :return: transaction details of transaction id using accountHash
         :rtype: request.Response
         """
-        return requests.get(f'{self._base_api_url}/trader/v1/accounts/{accountHash}/transactions/{transactionId}',
-                            headers={'Authorization': f'Bearer {self.access_token}'},
-                            params={'accountNumber': accountHash, 'transactionId': transactionId},
-                            timeout=self.timeout)
+        return self._request('GET', f'/trader/v1/accounts/{accountHash}/transactions/{transactionId}',
+                             'transaction_details', params={'accountNumber': accountHash, 'transactionId': transactionId})
 
     def preferences(self):
         """
@@ -491,9 +716,7 @@ class Client:
         :return: User Preferences and Streaming Info
         :rtype: request.Response
         """
-        return requests.get(f'{self._base_api_url}/trader/v1/userPreference',
-                            headers={'Authorization': f'Bearer {self.access_token}'},
-                            timeout=self.timeout)
+        return self._request('GET', '/trader/v1/userPreference', 'preferences')
 
     """
     Market Data
@@ -511,11 +734,9 @@ class Client:
         :return: list of quotes
         :rtype: request.Response
         """
-        return requests.get(f'{self._base_api_url}/marketdata/v1/quotes',
-                            headers={'Authorization': f'Bearer {self.access_token}'},
-                            params=self._params_parser(
-                                {'symbols': self._format_list(symbols), 'fields': fields, 'indicative': indicative}),
-                            timeout=self.timeout)
+        return self._request('GET', '/marketdata/v1/quotes', 'quotes',
+                             params=self._params_parser(
+                                 {'symbols': self._format_list(symbols), 'fields': fields, 'indicative': indicative}))
 
     def quote(self, symbol_id, fields=None):
         """
@@ -527,10 +748,78 @@ class Client:
         :return: quote for a single symbol
         :rtype: request.Response
         """
-        return requests.get(f'{self._base_api_url}/marketdata/v1/{urllib.parse.quote(symbol_id)}/quotes',
-                            headers={'Authorization': f'Bearer {self.access_token}'},
-                            params=self._params_parser({'fields': fields}),
-                            timeout=self.timeout)
+        return self._request('GET', f'/marketdata/v1/{urllib.parse.quote(symbol_id)}/quotes', 'quote',
+                             params=self._params_parser({'fields': fields}))
+
+    def quotes_bulk(self, symbols, fields=None, indicative=False, batch_size=500, max_workers=4):
+        """
+        Get quotes for any number of symbols, split into batches fetched concurrently (within the rate limiter)
+        :param symbols: list of symbols (duplicates are fetched once)
+        :type symbols: [str]
+        :param fields: list of fields to get ("all", "quote", "fundamental")
+        :type fields: list
+        :param indicative: whether to get indicative quotes (True/False)
+        :type indicative: boolean
+        :param batch_size: symbols per request
+        :type batch_size: int
+        :param max_workers: batches in flight at once
+        :type max_workers: int
+        :return: quotes indexed by symbol (nested fields flattened, e.g. "quote.lastPrice"), failed symbols and reasons
+        :rtype: (pandas.DataFrame, dict)
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        batches = self._symbol_batches(symbols, batch_size)
+
+        def fetch(batch):
+            try:
+                return batch, self.quotes(batch, self._format_list(fields), indicative)
+            except requests.RequestException as e:
+                return batch, e
+
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(batches)))) as executor:
+            results = list(executor.map(fetch, batches))
+        with parse_timer(self, 'quotes'):
+            return self._merge_quotes(results)
+
+    @staticmethod
+    def _symbol_batches(symbols, batch_size):
+        symbols = list(dict.fromkeys([symbols] if isinstance(symbols, str) else symbols))
+        return [symbols[i:i + batch_size] for i in range(0, len(symbols), batch_size)]
+
+    @staticmethod
+    def _merge_quotes(results):
+        """
+        Merges quote responses into one DataFrame
+        :param results: list of (symbols, response or exception)
+        :type results: list
+        :return: quotes indexed by symbol, failed symbols and reasons
+        :rtype: (pandas.DataFrame, dict)
+        """
+        import pandas as pd
+
+        records, failed = {}, {}
+        for batch, response in results:
+            if isinstance(response, Exception):
+                failed.update(dict.fromkeys(batch, str(response)))
+                continue
+            if response.status_code >= 400:
+                failed.update(dict.fromkeys(batch, f"{response.status_code} {response.text[:200]}"))
+                continue
+            payload = response.json()
+            errors = payload.pop('errors', {})
+            for reason, invalid in errors.items():
+                failed.update(dict.fromkeys(invalid, reason))
+            for symbol in batch:
+                if symbol in payload:
+                    records[symbol] = payload[symbol]
+                elif symbol not in failed:
+                    failed[symbol] = 'missing'
+
+        # Note: one normalization over all the batches, nested sections become "section.field" columns
+        quotes = pd.json_normalize(list(records.values()))
+        quotes.index = pd.Index(list(records.keys()), name='symbol')
+        return quotes, failed
 
     def option_chains(self, symbol, contractType=None, strikeCount=None, includeUnderlyingQuote=None, strategy=None,
                       interval=None, strike=None, range=None, fromDate=None, toDate=None, volatility=None,
@@ -575,18 +864,16 @@ class Client:
         :return: list of option chains
         :rtype: request.Response
         """
-        return requests.get(f'{self._base_api_url}/marketdata/v1/chains',
-                            headers={'Authorization': f'Bearer {self.access_token}'},
-                            params=self._params_parser(
-                                {'symbol': symbol, 'contractType': contractType, 'strikeCount': strikeCount,
-                                 'includeUnderlyingQuote': includeUnderlyingQuote, 'strategy': strategy,
-                                 'interval': interval, 'strike': strike, 'range': range,
-                                 'fromDate': self._time_convert(fromDate, "YYYY-MM-DD"),
-                                 'toDate': self._time_convert(toDate, "YYYY-MM-DD"), 'volatility': volatility,
-                                 'underlyingPrice': underlyingPrice,
-                                 'interestRate': interestRate, 'daysToExpiration': daysToExpiration,
-                                 'expMonth': expMonth, 'optionType': optionType, 'entitlement': entitlement}),
-                            timeout=self.timeout)
+        return self._request('GET', '/marketdata/v1/chains', 'option_chains',
+                             params=self._params_parser(
+                                 {'symbol': symbol, 'contractType': contractType, 'strikeCount': strikeCount,
+                                  'includeUnderlyingQuote': includeUnderlyingQuote, 'strategy': strategy,
+                                  'interval': interval, 'strike': strike, 'range': range,
+                                  'fromDate': self._time_convert(fromDate, "YYYY-MM-DD"),
+                                  'toDate': self._time_convert(toDate, "YYYY-MM-DD"), 'volatility': volatility,
+                                  'underlyingPrice': underlyingPrice,
+                                  'interestRate': interestRate, 'daysToExpiration': daysToExpiration,
+                                  'expMonth': expMonth, 'optionType': optionType, 'entitlement': entitlement}))
 
     def option_expiration_chain(self, symbol):
         """
@@ -596,10 +883,8 @@ class Client:
         :return: option expiration chain
         :rtype: request.Response
         """
-        return requests.get(f'{self._base_api_url}/marketdata/v1/expirationchain',
-                            headers={'Authorization': f'Bearer {self.access_token}'},
-                            params=self._params_parser({'symbol': symbol}),
-                            timeout=self.timeout)
+        return self._request('GET', '/marketdata/v1/expirationchain', 'option_expiration_chain',
+                             params=self._params_parser({'symbol': symbol}))
 
     def price_history(self, symbol, periodType=None, period=None, frequencyType=None, frequency=None, startDate=None,
                       endDate=None, needExtendedHoursData=None, needPreviousClose=None):
@@ -626,15 +911,13 @@ class Client:
         :return: dictionary of containing candle history
         :rtype: request.Response
         """
-        return requests.get(f'{self._base_api_url}/marketdata/v1/pricehistory',
-                            headers={'Authorization': f'Bearer {self.access_token}'},
-                            params=self._params_parser({'symbol': symbol, 'periodType': periodType, 'period': period,
-                                                        'frequencyType': frequencyType, 'frequency': frequency,
-                                                        'startDate': self._time_convert(startDate, 'epoch_ms'),
-                                                        'endDate': self._time_convert(endDate, 'epoch_ms'),
-                                                        'needExtendedHoursData': needExtendedHoursData,
-                                                        'needPreviousClose': needPreviousClose}),
-                            timeout=self.timeout)
+        return self._request('GET', '/marketdata/v1/pricehistory', 'price_history',
+                             params=self._params_parser({'symbol': symbol, 'periodType': periodType, 'period': period,
+                                                         'frequencyType': frequencyType, 'frequency': frequency,
+                                                         'startDate': self._time_convert(startDate, 'epoch_ms'),
+                                                         'endDate': self._time_convert(endDate, 'epoch_ms'),
+                                                         'needExtendedHoursData': needExtendedHoursData,
+                                                         'needPreviousClose': needPreviousClose}))
 
     def movers(self, symbol, sort=None, frequency=None):
         """
@@ -648,10 +931,8 @@ class Client:
         :return: movers
         :rtype: request.Response
         """
-        return requests.get(f'{self._base_api_url}/marketdata/v1/movers/{symbol}',
-                            headers={"accept": "application/json", 'Authorization': f'Bearer {self.access_token}'},
-                            params=self._params_parser({'sort': sort, 'frequency': frequency}),
-                            timeout=self.timeout)
+        return self._request('GET', f'/marketdata/v1/movers/{symbol}', 'movers',
+                             params=self._params_parser({'sort': sort, 'frequency': frequency}))
 
     def market_hours(self, symbols, date=None):
         """
@@ -663,12 +944,10 @@ class Client:
         :return: market hours
         :rtype: request.Response
         """
-        return requests.get(f'{self._base_api_url}/marketdata/v1/markets',
-                            headers={'Authorization': f'Bearer {self.access_token}'},
-                            params=self._params_parser(
-                                {'markets': symbols,  # self._format_list(symbols),
-                                 'date': self._time_convert(date, 'YYYY-MM-DD')}),
-                            timeout=self.timeout)
+        return self._request('GET', '/marketdata/v1/markets', 'market_hours',
+                             params=self._params_parser(
+                                 {'markets': symbols,  # self._format_list(symbols),
+                                  'date': self._time_convert(date, 'YYYY-MM-DD')}))
 
     def market_hour(self, market_id, date=None):
         """
@@ -680,10 +959,8 @@ class Client:
         :return: market hours
         :rtype: request.Response
         """
-        return requests.get(f'{self._base_api_url}/marketdata/v1/markets/{market_id}',
-                            headers={'Authorization': f'Bearer {self.access_token}'},
-                            params=self._params_parser({'date': self._time_convert(date, 'YYYY-MM-DD')}),
-                            timeout=self.timeout)
+        return self._request('GET', f'/marketdata/v1/markets/{market_id}', 'market_hour',
+                             params=self._params_parser({'date': self._time_convert(date, 'YYYY-MM-DD')}))
 
     def instruments(self, symbol, projection):
         """
@@ -695,10 +972,8 @@ class Client:
         :return: instruments
         :rtype: request.Response
         """
-        return requests.get(f'{self._base_api_url}/marketdata/v1/instruments',
-                            headers={'Authorization': f'Bearer {self.access_token}'},
-                            params={'symbol': symbol, 'projection': projection},
-                            timeout=self.timeout)
+        return self._request('GET', '/marketdata/v1/instruments', 'instruments',
+                             params={'symbol': symbol, 'projection': projection})
 
     def instrument_cusip(self, cusip_id):
         """
@@ -708,6 +983,4 @@ class Client:
         :return: instrument
         :rtype: request.Response
         """
-        return requests.get(f'{self._base_api_url}/marketdata/v1/instruments/{cusip_id}',
-                            headers={'Authorization': f'Bearer {self.access_token}'},
-                            timeout=self.timeout)
\ No newline at end of file
+        return self._request('GET', f'/marketdata/v1/instruments/{cusip_id}', 'instrument_cusip')
\ No newline at end of file
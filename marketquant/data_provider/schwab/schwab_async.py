@@ -0,0 +1,194 @@
+import time
+import asyncio
+import functools
+from .schwab_api import Client, ENDPOINTS, RETRY_STATUSES
+from .rate_limiter import priority_of
+from .metrics import parse_timer
+
+
+class AsyncClient:
+
+    def __init__(self, client, max_connections=100, max_in_flight=1000, http2=True, transport=None):
+        """
+        asyncio counterpart of Client for high concurrency market data (e.g. scanning hundreds of option chains).
+        Every endpoint of Client (ENDPOINTS) is available as a coroutine returning an httpx.Response.
+        Tokens are shared with the sync client (which keeps refreshing them), the retry and timeout settings and the
+        rate limiter, the response cache and the metrics too.
+        :param client: initialized Client (owns the tokens)
+        :type client: Client
+        :param max_connections: connections kept open to the api
+        :type max_connections: int
+        :param max_in_flight: requests sent at the same time, the others wait for a slot
+        :type max_in_flight: int
+        :param http2: multiplex requests over HTTP/2 connections (needs the h2 package, falls back to HTTP/1.1)
+        :type http2: bool
+        :param transport: httpx transport sending the requests (e.g. ReplayAdapter.httpx_transport()), None connects
+                          to the api of the client
+        :type transport: httpx.AsyncBaseTransport
+        """
+        try:
+            import httpx
+        except ImportError:
+            raise ImportError("AsyncClient requires httpx (pip install httpx).")
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                print("Warning: h2 is not installed, AsyncClient falls back to HTTP/1.1 (pip install h2).")
+                http2 = False
+
+        self._client = client  # sync client holding the tokens
+        self._httpx = httpx
+        self.verbose = client.verbose  # inherit the client's verbose setting
+        self.max_in_flight = max_in_flight
+        self._session = httpx.AsyncClient(http2=http2, headers={"Accept": "application/json"},
+                                          limits=httpx.Limits(max_connections=max_connections,
+                                                              max_keepalive_connections=max_connections),
+                                          transport=transport)
+        self._in_flight = None  # semaphore, created in the running event loop
+
+    @property
+    def access_token(self):
+        return self._client.access_token
+
+    @property
+    def metrics(self):
+        return self._client.metrics
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def aclose(self):
+        """
+        Closes the pooled connections
+        """
+        await self._session.aclose()
+
+    async def _request(self, method, path, endpoint, params=None, json=None, data=None, headers=None, authorize=True):
+        """
+        Same as Client._request, awaiting instead of blocking
+        :return: response
+        :rtype: httpx.Response
+        """
+        client = self._client
+        cache_key = None
+        if client.cache is not None and client.cache.cacheable(method, endpoint):
+            cache_key = client.cache.key(endpoint, path, params)
+            cached = client.cache.get(cache_key)
+            if cached is not None:
+                if client.metrics is not None:
+                    client.metrics.cache_hit(endpoint)
+                status_code, cached_headers, content = cached
+                return self._httpx.Response(status_code, headers=cached_headers, content=content,
+                                            request=self._httpx.Request(method, f'{client._base_api_url}{path}'))
+
+        if self._in_flight is None:
+            self._in_flight = asyncio.Semaphore(self.max_in_flight)
+        request_headers = client._authorization_header() if authorize else {}
+        if headers:
+            request_headers = {**request_headers, **headers}
+        timeout = client.timeouts.get(endpoint, client.timeout)
+        idempotent = method == 'GET'
+        limiter = client.rate_limiter if authorize else None
+        metrics = client.metrics
+
+        attempt, waited = 0, 0.0
+        while True:
+            if limiter is not None:
+                # Note: the limiter is shared with the sync client's threads, the wait sleeps on the event loop
+                waited += await limiter.acquire_async(priority_of(endpoint))
+            try:
+                async with self._in_flight:
+                    start = time.perf_counter()
+                    response = await self._session.request(method, f'{client._base_api_url}{path}', params=params,
+                                                           json=json, data=data, headers=request_headers,
+                                                           timeout=timeout)
+            except (self._httpx.TransportError, self._httpx.TimeoutException) as e:
+                if metrics is not None:
+                    metrics.attempt(endpoint, time.perf_counter() - start, error=e)
+                if not idempotent or attempt >= client.max_retries:
+                    if metrics is not None:
+                        metrics.request(endpoint, attempt, waited)
+                    raise
+                delay = client._retry_delay(attempt)
+                if self.verbose: print(f"{endpoint} request failed ({e}), retrying in {delay:.2f} seconds.")
+            else:
+                if metrics is not None:
+                    metrics.attempt(endpoint, time.perf_counter() - start, response)
+                if response.status_code == 429 and limiter is not None:
+                    limiter.throttled()
+                retry = response.status_code == 429 or (idempotent and response.status_code in RETRY_STATUSES)
+                if not retry or attempt >= client.max_retries:
+                    if cache_key is not None and response.is_success:
+                        client.cache.put(cache_key, response.status_code, response.headers, response.content)
+                    if metrics is not None:
+                        metrics.request(endpoint, attempt, waited)
+                    return response
+                delay = client._retry_delay(attempt, response)
+                if self.verbose: print(f"{endpoint} returned {response.status_code}, retrying in {delay:.2f} seconds.")
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def quotes_bulk(self, symbols, fields=None, indicative=False, batch_size=500):
+        """
+        Same as Client.quotes_bulk, with every batch in flight at once (within the rate limiter)
+        :return: quotes indexed by symbol, failed symbols and reasons
+        :rtype: (pandas.DataFrame, dict)
+        """
+        async def fetch(batch):
+            try:
+                return batch, await self.quotes(batch, self._format_list(fields), indicative)
+            except self._httpx.HTTPError as e:
+                return batch, e
+
+        results = await asyncio.gather(*[fetch(batch) for batch in Client._symbol_batches(symbols, batch_size)])
+        with parse_timer(self, 'quotes'):
+            return Client._merge_quotes(results)
+
+    # Note: the endpoints (ENDPOINTS) are added below the class, built by the Client methods of the same name
+    _time_convert = Client._time_convert
+    _format_list = Client._format_list
+
+
+class _RequestSpec:
+
+    def __init__(self, args, kwargs):
+        self.args = args  # arguments of one Client._request call
+        self.kwargs = kwargs
+
+
+class _RequestBuilder:
+
+    def __init__(self, client):
+        """
+        Stands in for the Client while one of its endpoint methods builds a request: _request() returns the
+        arguments instead of sending them, everything else is the client's.
+        """
+        self._client = client
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+    def _request(self, *args, **kwargs):
+        return _RequestSpec(args, kwargs)
+
+
+def _endpoint(name):
+    # Action: coroutine sending the request built by Client.<name> through AsyncClient._request
+    build = getattr(Client, name)
+
+    @functools.wraps(build)
+    async def endpoint(self, *args, **kwargs):
+        request = build(_RequestBuilder(self._client), *args, **kwargs)
+        if not isinstance(request, _RequestSpec):
+            raise TypeError(f"Client.{name} must end with `return self._request(...)` to be used by AsyncClient.")
+        return await self._request(*request.args, **request.kwargs)
+
+    return endpoint
+
+
+for _name in ENDPOINTS:
+    setattr(AsyncClient, _name, _endpoint(_name))
@@ -1,11 +1,11 @@
 
 import os
-from dotenv import load_dotenv
 from .schwab_api import Client
 
 
 class SchwabInitializer:
     def __init__(self):
+        from dotenv import load_dotenv
         load_dotenv()
 
         self.app_key = os.getenv('app_key')
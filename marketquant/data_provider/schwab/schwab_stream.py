@@ -8,9 +8,7 @@ import json
 import atexit
 import asyncio
 import threading
-import websockets
 from time import sleep
-import websockets.exceptions
 from datetime import datetime, time
 
 
@@ -44,6 +42,9 @@ class Stream:
         :param receiver_func: function to call when data is received
         :type receiver_func: function
         """
+        import websockets
+        import websockets.exceptions
+
         # get streamer info
         response = self._client.preferences()
         if response.ok:
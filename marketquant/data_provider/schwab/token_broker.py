@@ -0,0 +1,117 @@
+import os
+import json
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+
+class TokenBroker:
+
+    def __init__(self, tokens_file):
+        """
+        Shares the tokens file between every Client of every process on the machine. Refreshes happen under an
+        exclusive file lock (so only one process refreshes, the others find the new token once they get the lock),
+        writes replace the file atomically (so readers never see a partial file) and reads only parse the file again
+        when it changed on disk (a stat call otherwise).
+        :param tokens_file: path to tokens file
+        :type tokens_file: str
+        """
+        self.tokens_file = tokens_file
+        self.lock_file = f"{tokens_file}.lock"
+        self._signature = None  # (mtime, inode, size) of the file last read
+        self._tokens = (None, None, None)
+        self._read_lock = threading.Lock()
+
+    @contextmanager
+    def lock(self):
+        """
+        Exclusive lock across processes (and threads, every call opens its own handle), held while refreshing.
+        Not reentrant. Prints a message when another process holds it.
+        """
+        with open(self.lock_file, 'a+') as handle:
+            if os.name == 'nt':
+                import msvcrt
+                handle.seek(0)
+                try:
+                    msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+                except OSError:
+                    print(f"Waiting for another process to update the tokens ({self.lock_file})...")
+                    while True:
+                        try:
+                            msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+                            break
+                        except OSError:
+                            continue  # Note: LK_LOCK gives up after 10 seconds, keep waiting
+                try:
+                    yield
+                finally:
+                    handle.seek(0)
+                    msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                import fcntl
+                try:
+                    fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    print(f"Waiting for another process to update the tokens ({self.lock_file})...")
+                    fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+    def changed(self):
+        """
+        :return: whether the file changed since it was last read
+        :rtype: bool
+        """
+        return self._stat() != self._signature
+
+    def _stat(self):
+        try:
+            stat = os.stat(self.tokens_file)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_ino, stat.st_size
+
+    def read(self):
+        """
+        Reads token file (parsed again only when it changed on disk)
+        :return: access token issued, refresh token issued, token dictionary (None, None, None if missing or invalid)
+        :rtype: datetime, datetime, dict
+        """
+        with self._read_lock:
+            signature = self._stat()
+            if signature is not None and signature == self._signature:
+                return self._tokens
+            try:
+                with open(self.tokens_file, 'r') as f:
+                    d = json.load(f)
+                self._tokens = (datetime.fromisoformat(d.get("access_token_issued")),
+                                datetime.fromisoformat(d.get("refresh_token_issued")), d.get("token_dictionary"))
+            except Exception as e:
+                print(e)
+                self._tokens = (None, None, None)
+            self._signature = signature
+            return self._tokens
+
+    def write(self, at_issued, rt_issued, token_dictionary):
+        """
+        Writes token file atomically (call it while holding lock())
+        :param at_issued: access token issued
+        :type at_issued: datetime
+        :param rt_issued: refresh token issued
+        :type rt_issued: datetime
+        :param token_dictionary: token dictionary
+        :type token_dictionary: dict
+        """
+        temporary = f"{self.tokens_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temporary, 'w') as f:
+            toWrite = {"access_token_issued": at_issued.isoformat(), "refresh_token_issued": rt_issued.isoformat(),
+                       "token_dictionary": token_dictionary}
+            json.dump(toWrite, f, ensure_ascii=False, indent=4)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary, self.tokens_file)
+        with self._read_lock:
+            self._tokens = (at_issued, rt_issued, token_dictionary)
+            self._signature = self._stat()
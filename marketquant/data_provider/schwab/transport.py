@@ -0,0 +1,221 @@
+import os
+import json
+import base64
+import hashlib
+import threading
+from datetime import timedelta
+from urllib.parse import urlsplit, parse_qsl, urlencode
+import requests
+
+# Note: response headers kept in recordings (the others are connection or tracing details)
+RECORDED_HEADERS = ('Content-Type', 'Location', 'Retry-After')
+# Note: token responses hold live credentials, they are never written to disk by default
+UNRECORDED_PATHS = ('/v1/oauth/token',)
+
+
+def request_key(method, url, body=None):
+    """
+    Key of a request, independent of the host so recordings of the Schwab API replay on a MockSchwabServer too:
+    method, path, sorted query and a digest of the body (e.g. "GET /marketdata/v1/quotes?symbols=AMD").
+    :param method: http method
+    :type method: str
+    :param url: full url with the query
+    :type url: str
+    :param body: request body
+    :type body: bytes | str
+    :return: key
+    :rtype: str
+    """
+    parts = urlsplit(url)
+    key = f"{method.upper()} {parts.path}"
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    if query:
+        key += f"?{query}"
+    if body:
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        key += f" #{hashlib.sha256(body).hexdigest()[:16]}"
+    return key
+
+
+def token_payload():
+    """
+    Token response handed out when no real one is available (replays and MockSchwabServer)
+    :rtype: dict
+    """
+    return {'expires_in': 1800, 'token_type': 'Bearer', 'scope': 'api', 'refresh_token': 'mock-refresh-token',
+            'access_token': 'mock-access-token', 'id_token': 'mock-id-token'}
+
+
+class RecordingStore:
+
+    def __init__(self, directory):
+        """
+        Responses recorded on disk, one JSON file per request key holding every response recorded for it, in order.
+        Bodies are kept as text when they are UTF-8 (so recordings can be read and edited by hand), base64 otherwise.
+        :param directory: directory of the recordings (created if missing)
+        :type directory: str
+        """
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._positions = {}  # request key -> next response to replay
+        self._replayed = {}  # request key -> responses read for replay (the files are read once)
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{hashlib.sha256(key.encode('utf-8')).hexdigest()[:32]}.json")
+
+    def load(self, key):
+        """
+        :return: responses recorded for the key (empty if never recorded)
+        :rtype: list
+        """
+        try:
+            with open(self._path(key), 'r', encoding='utf-8') as f:
+                return json.load(f)['responses']
+        except FileNotFoundError:
+            return []
+
+    def append(self, key, status_code, headers, content):
+        """
+        Adds a response after the ones already recorded for the key
+        :param key: request_key()
+        :type key: str
+        :param status_code: http status
+        :type status_code: int
+        :param headers: response headers (only RECORDED_HEADERS are kept)
+        :type headers: dict
+        :param content: response body
+        :type content: bytes
+        """
+        entry = {'status_code': status_code,
+                 'headers': {name: headers[name] for name in RECORDED_HEADERS if name in headers}}
+        try:
+            entry['text'] = content.decode('utf-8')
+        except UnicodeDecodeError:
+            entry['base64'] = base64.b64encode(content).decode('ascii')
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            responses = self.load(key) + [entry]
+            path = self._path(key)
+            temporary = f"{path}.{os.getpid()}.tmp"
+            with open(temporary, 'w', encoding='utf-8') as f:
+                json.dump({'request': key, 'responses': responses}, f, ensure_ascii=False, indent=1)
+            os.replace(temporary, path)
+
+    def next(self, key):
+        """
+        Next recorded response of a request, responses replay in the recorded order and the last one repeats
+        (so a 429 recorded before a 200 is replayed before it too)
+        :param key: request_key()
+        :type key: str
+        :return: (status code, headers, body) or None if the request was never recorded
+        :rtype: tuple
+        """
+        responses = self._replayed.get(key)
+        if responses is None:
+            responses = self._replayed.setdefault(key, self.load(key))
+        if not responses:
+            return None
+        with self._lock:
+            position = self._positions.get(key, 0)
+            self._positions[key] = position + 1
+        entry = responses[min(position, len(responses) - 1)]
+        if 'base64' in entry:
+            content = base64.b64decode(entry['base64'])
+        else:
+            content = entry.get('text', '').encode('utf-8')
+        return entry['status_code'], entry.get('headers', {}), content
+
+    def rewind(self):
+        """
+        Replays every request from its first recorded response again (reading the files again)
+        """
+        with self._lock:
+            self._positions = {}
+            self._replayed = {}
+
+
+class RecordingAdapter(requests.adapters.HTTPAdapter):
+
+    def __init__(self, directory, exclude=UNRECORDED_PATHS, **kwargs):
+        """
+        Transport of a Client that sends requests to the api as usual and records every response (retried ones
+        included) to disk, e.g. Client(..., transport=RecordingAdapter("recordings")).
+        Recorded urls hold the account hashes, review them before sharing the recordings.
+        :param directory: directory of the recordings
+        :type directory: str
+        :param exclude: paths never recorded (the token endpoint by default)
+        :type exclude: tuple
+        :param kwargs: HTTPAdapter arguments (pool_connections, pool_maxsize...)
+        """
+        super().__init__(**kwargs)
+        self.store = RecordingStore(directory)
+        self.exclude = tuple(exclude)
+
+    def send(self, request, **kwargs):
+        response = super().send(request, **kwargs)
+        if urlsplit(request.url).path not in self.exclude:
+            self.store.append(request_key(request.method, request.url, request.body), response.status_code,
+                              response.headers, response.content)
+        return response
+
+
+class ReplayAdapter(requests.adapters.BaseAdapter):
+
+    def __init__(self, directory, strict=True):
+        """
+        Transport of a Client that answers from recordings only, without any network access, the same requests
+        always getting the same responses, e.g. Client(..., transport=ReplayAdapter("recordings")).
+        Token requests that were not recorded get a mock token.
+        :param directory: directory of the recordings (see RecordingAdapter)
+        :type directory: str
+        :param strict: raise on requests never recorded (False answers them with a 404)
+        :type strict: bool
+        """
+        super().__init__()
+        self.store = RecordingStore(directory)
+        self.strict = strict
+
+    def _lookup(self, method, url, body):
+        # Action: (status code, headers, body) of the recorded response, a mock token or a 404
+        key = request_key(method, url, body)
+        recorded = self.store.next(key)
+        if recorded is not None:
+            return recorded
+        if urlsplit(url).path in UNRECORDED_PATHS:
+            return 200, {'Content-Type': 'application/json'}, json.dumps(token_payload()).encode('utf-8')
+        if self.strict:
+            raise requests.RequestException(f"No recorded response for {key} in {self.store.directory}")
+        return 404, {'Content-Type': 'application/json'}, json.dumps(
+            {'errors': [{'status': 404, 'title': 'Not recorded', 'detail': key}]}).encode('utf-8')
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        status_code, headers, content = self._lookup(request.method, request.url, request.body)
+        response = requests.Response()
+        response.status_code = status_code
+        response.reason = requests.status_codes._codes.get(status_code, ('',))[0].upper().replace('_', ' ')
+        response.headers = requests.structures.CaseInsensitiveDict(headers)
+        response._content = content
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        response.elapsed = timedelta(0)
+        return response
+
+    def close(self):
+        pass
+
+    def httpx_transport(self):
+        """
+        Same replay for an AsyncClient, e.g. AsyncClient(client, transport=adapter.httpx_transport())
+        :return: httpx transport
+        :rtype: httpx.MockTransport
+        """
+        import httpx
+
+        def handler(request):
+            status_code, headers, content = self._lookup(request.method, str(request.url), request.content)
+            # Note: streamed like a network response, so the client reads it (and sets elapsed) as usual
+            return httpx.Response(status_code, headers=headers, stream=httpx.ByteStream(content))
+
+        return httpx.MockTransport(handler)
@@ -0,0 +1,10 @@
+from ..._lazy import lazy_module
+
+_LAZY_IMPORTS = {
+    'YahooMarketData': ('.market_data', 'YahooMarketData'),
+    'get_market_data': ('.market_data', 'get_market_data'),
+}
+
+__all__ = ['YahooMarketData', 'get_market_data']
+
+__getattr__, __dir__ = lazy_module(__name__, _LAZY_IMPORTS)
@@ -0,0 +1,178 @@
+import time
+import threading
+import pandas as pd
+from collections import OrderedDict
+from concurrent.futures import Future
+
+
+class YahooMarketData:
+    def __init__(self, batch_window=0.02, max_cache_entries=512):
+        """
+        Shared access layer for Yahoo Finance downloads used by the simulator and the tools.
+        - Identical requests made at the same time are merged into a single download.
+        - Single-ticker requests for the same range/interval that arrive within batch_window seconds of each other
+          are sent as one multi-ticker download (only while other requests are being served, a lone caller never
+          waits).
+        - Results of ranges that ended before today are kept in memory (LRU bounded), callers always receive their
+          own copy.
+        :param batch_window: Seconds the first request waits for other tickers to join its download.
+        :param max_cache_entries: Maximum number of (ticker, range, interval) frames kept in memory.
+        """
+        self.batch_window = batch_window
+        self.max_cache_entries = max_cache_entries
+        self._lock = threading.Lock()
+        self._cache = OrderedDict()     # key -> DataFrame
+        self._in_flight = {}            # key -> Future
+        self._pending = {}              # request group -> tickers waiting for the next download
+        self._callers = 0               # download() calls in progress, the batch window only applies when > 1
+        self.downloads = 0              # number of yfinance calls made (useful to check coalescing)
+
+    @staticmethod
+    def _group(start, end, interval, period, auto_adjust):
+        # Note: dates are compared as strings so '2024-01-01' and datetime(2024, 1, 1) share the same entry
+        def normalize(value, round_up=False):
+            if value is None:
+                return None
+            value = pd.Timestamp(value)
+            if not interval.endswith(('d', 'wk', 'mo')):
+                return str(value)
+            # Note: daily bars are keyed by date, an end within a day (e.g. now) is rounded up to the next day so the
+            # bar of that day is still returned (end is exclusive)
+            if round_up and value != value.normalize():
+                value = value.normalize() + pd.Timedelta(days=1)
+            return str(value.date())
+        return normalize(start), normalize(end, round_up=True), interval, period, bool(auto_adjust)
+
+    @staticmethod
+    def _final(group):
+        # Action: whether the data of a request can not change anymore (a range that ended before today)
+        end, period = group[1], group[3]
+        if period is not None or end is None:
+            return False
+        end = pd.Timestamp(end)
+        return end <= pd.Timestamp.now(tz=end.tz).normalize()
+
+    def download(self, tickers, start=None, end=None, interval='1d', period=None, auto_adjust=True):
+        """
+        Downloads (or reuses) OHLCV data for one or many tickers.
+        :param tickers: Ticker symbol or list of ticker symbols.
+        :param start: Start date.
+        :param end: End date (exclusive).
+        :param interval: Candle interval ('1m', '1h', '1d'...).
+        :param period: Period instead of start/end (e.g. '1d', '1mo').
+        :param auto_adjust: Whether prices are adjusted for splits and dividends (yfinance's default), False keeps
+                            the unadjusted Close and adds Adj Close.
+        :return: Dictionary of ticker -> DataFrame (Open, High, Low, Close, Volume indexed by date, plus Adj Close
+                 when auto_adjust is False).
+        """
+        tickers = [tickers] if isinstance(tickers, str) else list(dict.fromkeys(tickers))
+        group = self._group(start, end, interval, period, auto_adjust)
+        results, futures = {}, {}
+        leader = False
+
+        with self._lock:
+            self._callers += 1
+            for ticker in tickers:
+                key = (ticker,) + group
+                if key in self._cache:
+                    self._cache.move_to_end(key)
+                    results[ticker] = self._cache[key]
+                elif key in self._in_flight:
+                    futures[ticker] = self._in_flight[key]
+                else:
+                    futures[ticker] = self._in_flight[key] = Future()
+                    if group not in self._pending:
+                        # Note: whoever opens a batch for this group is the one who downloads it
+                        self._pending[group] = []
+                        leader = True
+                    self._pending[group].append(ticker)
+
+        try:
+            if leader:
+                # Note: only waits for other tickers when other requests are in progress (e.g. engines prefetching
+                # in parallel), a single caller is never delayed
+                if self.batch_window and self._callers > 1:
+                    time.sleep(self.batch_window)
+                with self._lock:
+                    batch = self._pending.pop(group)
+                self._fetch(batch, group)
+
+            for ticker, future in futures.items():
+                results[ticker] = future.result()
+        finally:
+            with self._lock:
+                self._callers -= 1
+        return {ticker: results[ticker].copy() for ticker in tickers}
+
+    def history(self, ticker, start=None, end=None, interval='1d', period=None, auto_adjust=True):
+        """
+        Same as download() for a single ticker.
+        :return: DataFrame for the ticker.
+        """
+        return self.download([ticker], start, end, interval, period, auto_adjust)[ticker]
+
+    def _fetch(self, tickers, group):
+        start, end, interval, period, auto_adjust = group
+        keys = [(ticker,) + group for ticker in tickers]
+        try:
+            # Note: imported in the try so a missing yfinance fails the waiting requests instead of leaving them hanging
+            import yfinance as yf
+
+            # Note: yfinance only parses plain dates from strings, the normalized dates are passed as timestamps
+            kwargs = {'period': period} if period is not None else {
+                'start': pd.Timestamp(start) if start is not None else None,
+                'end': pd.Timestamp(end) if end is not None else None}
+            data = yf.download(tickers, interval=interval, group_by='ticker', auto_adjust=auto_adjust, progress=False,
+                               **kwargs)
+            self.downloads += 1
+            frames = {ticker: self._split(data, ticker) for ticker in tickers}
+        except Exception as e:
+            with self._lock:
+                for key in keys:
+                    self._in_flight.pop(key).set_exception(e)
+            return
+
+        with self._lock:
+            for ticker, key in zip(tickers, keys):
+                frame = frames[ticker]
+                # Note: empty results are not cached (often transient) and neither are period requests or ranges
+                # reaching today (no end or a later one), they always mean "the latest" data
+                if not frame.empty and self._final(group):
+                    self._cache[key] = frame
+                    self._cache.move_to_end(key)
+                self._in_flight.pop(key).set_result(frame)
+            while len(self._cache) > self.max_cache_entries:
+                self._cache.popitem(last=False)
+
+    @staticmethod
+    def _split(data, ticker):
+        if data is None or data.empty:
+            return pd.DataFrame()
+        if isinstance(data.columns, pd.MultiIndex):
+            if ticker not in data.columns.get_level_values(0):
+                return pd.DataFrame()
+            frame = data[ticker]
+        else:
+            frame = data
+        frame = frame.dropna(how='all')
+        frame.columns.name = None
+        return frame
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def get_market_data():
+    """
+    Returns the process wide YahooMarketData instance shared by the simulator and the tools.
+    """
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = YahooMarketData()
+        return _shared
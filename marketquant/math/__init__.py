@@ -1,4 +1,11 @@
-from .greeks.yfinance_greeks import BSOptionPricing
-from .calculators.interpolate import Interpolate
+from .._lazy import lazy_module
 
-__all__ = ['BSOptionPricing', 'Interpolate' ]
+_LAZY_IMPORTS = {
+    'BSOptionPricing': ('.greeks.yfinance_greeks', 'BSOptionPricing'),
+    'BlackScholes': ('.greeks.black_scholes', 'BlackScholes'),
+    'Interpolate': ('.calculators.interpolate', 'Interpolate'),
+}
+
+__all__ = ['BSOptionPricing', 'BlackScholes', 'Interpolate']
+
+__getattr__, __dir__ = lazy_module(__name__, _LAZY_IMPORTS)
@@ -0,0 +1,73 @@
+import numpy as np
+from scipy.special import ndtr
+
+
+def _norm_pdf(x):
+    return np.exp(-0.5 * x * x) / np.sqrt(2 * np.pi)
+
+
+class BlackScholes:
+    """
+    Vectorized Black-Scholes pricer. Every argument may be a scalar or a NumPy array (arrays broadcast), so a whole
+    chain or book of contracts is priced in one call. Greeks use the same conventions as the Option class in
+    yfinance_greeks: theta per calendar day, vega and rho per 1% move.
+    """
+
+    @staticmethod
+    def _d1_d2(S, K, t, r, sigma, q):
+        S, K = np.asarray(S, dtype=float), np.asarray(K, dtype=float)
+        t = np.maximum(np.asarray(t, dtype=float), 1e-8)  # Avoid division by zero at expiry
+        sigma = np.maximum(np.asarray(sigma, dtype=float), 1e-8)
+        sqrt_t = np.sqrt(t)
+        d1 = (np.log(S / K) + (r - q + 0.5 * sigma ** 2) * t) / (sigma * sqrt_t)
+        d2 = d1 - sigma * sqrt_t
+        return S, K, t, sigma, sqrt_t, d1, d2
+
+    @staticmethod
+    def price(S, K, t, r, sigma, is_call, q=0.0):
+        """
+        Option prices.
+        :param S: Underlying price(s).
+        :param K: Strike price(s).
+        :param t: Time to expiration in years.
+        :param r: Risk free rate as a decimal (e.g., 0.05).
+        :param sigma: Implied volatility as a decimal.
+        :param is_call: Boolean (array), True for calls and False for puts.
+        :param q: Dividend yield as a decimal.
+        :return: NumPy array of prices.
+        """
+        S, K, t, sigma, sqrt_t, d1, d2 = BlackScholes._d1_d2(S, K, t, r, sigma, q)
+        discounted_s = S * np.exp(-q * t)
+        discounted_k = K * np.exp(-r * t)
+        call = discounted_s * ndtr(d1) - discounted_k * ndtr(d2)
+        put = discounted_k * ndtr(-d2) - discounted_s * ndtr(-d1)
+        return np.where(is_call, call, put)
+
+    @staticmethod
+    def greeks(S, K, t, r, sigma, is_call, q=0.0):
+        """
+        Option prices and greeks, same arguments as price().
+        :return: Dictionary of NumPy arrays ('price', 'delta', 'gamma', 'theta', 'vega', 'rho').
+        """
+        S, K, t, sigma, sqrt_t, d1, d2 = BlackScholes._d1_d2(S, K, t, r, sigma, q)
+        is_call = np.asarray(is_call, dtype=bool)
+        dividend_discount = np.exp(-q * t)
+        rate_discount = np.exp(-r * t)
+        pdf_d1 = _norm_pdf(d1)
+        cdf_d1, cdf_d2 = ndtr(d1), ndtr(d2)
+        cdf_neg_d1, cdf_neg_d2 = ndtr(-d1), ndtr(-d2)
+
+        call_price = S * dividend_discount * cdf_d1 - K * rate_discount * cdf_d2
+        put_price = K * rate_discount * cdf_neg_d2 - S * dividend_discount * cdf_neg_d1
+        decay = -(S * sigma * dividend_discount * pdf_d1) / (2 * sqrt_t)
+        call_theta = (decay - r * K * rate_discount * cdf_d2 + q * S * dividend_discount * cdf_d1) / 365
+        put_theta = (decay + r * K * rate_discount * cdf_neg_d2 - q * S * dividend_discount * cdf_neg_d1) / 365
+
+        return {
+            'price': np.where(is_call, call_price, put_price),
+            'delta': np.where(is_call, dividend_discount * cdf_d1, -dividend_discount * cdf_neg_d1),
+            'gamma': dividend_discount * pdf_d1 / (S * sigma * sqrt_t),
+            'theta': np.where(is_call, call_theta, put_theta),
+            'vega': S * dividend_discount * sqrt_t * pdf_d1 / 100,
+            'rho': np.where(is_call, K * t * rate_discount * cdf_d2, -K * t * rate_discount * cdf_neg_d2) / 100,
+        }
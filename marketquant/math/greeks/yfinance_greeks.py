@@ -1,4 +1,3 @@
-import yfinance as yf
 import datetime
 from math import log, sqrt, exp
 from scipy.stats import norm
@@ -135,8 +134,10 @@ class OptionChain:
         self.fetch_options()
 
     def fetch_options(self):
+        import yfinance as yf
+        from marketquant.data_provider.yahoo import get_market_data
         ticker = yf.Ticker(self.stock_ticker)
-        hist = ticker.history(period='1d')
+        hist = get_market_data().history(self.stock_ticker, period='1d')
         if hist.empty:
             print('Error fetching historical data for the underlying stock.')
             return
@@ -259,14 +260,15 @@ class BSOptionPricing:
 
     @staticmethod
     def get_expiration_dates(stock_ticker):
+        import yfinance as yf
         ticker = yf.Ticker(stock_ticker)
         expirations = ticker.options
         return expirations
 
     @staticmethod
     def get_underlying_price(stock_ticker):
-        ticker = yf.Ticker(stock_ticker)
-        hist = ticker.history(period='1d')
+        from marketquant.data_provider.yahoo import get_market_data
+        hist = get_market_data().history(stock_ticker, period='1d')
         if hist.empty:
             print('Error fetching historical data for the underlying stock.')
             return None
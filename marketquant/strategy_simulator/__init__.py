@@ -1,5 +1,16 @@
-from .core.trade_engine import TradingEngine
-from .demo_examples.indicators import MACDIndicator
-from .demo_examples.strategies import MACDStrategy
+from .._lazy import lazy_module
 
-__all__ = ['TradingEngine', 'MACDIndicator', 'MACDStrategy']
+_LAZY_IMPORTS = {
+    'TradingEngine': ('.core.trade_engine', 'TradingEngine'),
+    'DataPrefetcher': ('.core.data', 'DataPrefetcher'),
+    'save_checkpoint': ('.core.checkpoint', 'save_checkpoint'),
+    'load_checkpoint': ('.core.checkpoint', 'load_checkpoint'),
+    'PaperTrader': ('.core.paper_trading', 'PaperTrader'),
+    'MACDIndicator': ('.demo_examples.indicators.macd', 'MACDIndicator'),
+    'MACDStrategy': ('.demo_examples.strategies.macd_strategy', 'MACDStrategy'),
+}
+
+__all__ = ['TradingEngine', 'DataPrefetcher', 'save_checkpoint', 'load_checkpoint', 'PaperTrader',
+           'MACDIndicator', 'MACDStrategy']
+
+__getattr__, __dir__ = lazy_module(__name__, _LAZY_IMPORTS)
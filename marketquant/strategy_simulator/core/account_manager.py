@@ -1,3 +1,6 @@
+import numpy as np
+from marketquant.strategy_simulator.core.options import OptionBook
+
 class AccountManager:
     def __init__(self, starting_balance):
         self.balance = starting_balance
@@ -6,6 +9,7 @@ class AccountManager:
         self.positions = {}
         self.realized_pnl = 0
         self.unrealized_pnl = 0
+        self.options = OptionBook()
 
     def update_position(self, action, price, quantity):
         # print(f"Action: {action}, Price: {price}, Quantity: {quantity}, Buying Power Before: {self.buying_power}")
@@ -86,6 +90,54 @@ class AccountManager:
             # Action: Restore buying power after covering shorts
             self.buying_power += total_cost
 
+    def open_option(self, price, quantity, strike, expiry, is_call, iv, spread=0):
+        # Action: Long legs pay the premium out of buying power, short legs hold the premium as collateral (like
+        # share shorts do)
+        premium = price * abs(quantity) * self.options.multiplier
+        if quantity > 0 and self.buying_power < premium:
+            raise ValueError("Not enough buying power to execute the option order.")
+        self.buying_power -= premium
+        return self.options.add(strike, expiry, is_call, quantity, price, iv, spread)
+
+    def close_options(self, mask, prices):
+        """
+        Closes (or settles) the option legs selected by mask at the given per share prices.
+        :return: (closed legs, realized profit) tuple.
+        """
+        closed = self.options.remove(mask)
+        prices = np.broadcast_to(np.asarray(prices, dtype=float), closed['quantity'].shape)
+        multiplier = self.options.multiplier
+        realized_profit = float(np.sum((prices - closed['entry_price']) * closed['quantity']) * multiplier)
+        self.balance += realized_profit
+        self.realized_pnl += realized_profit
+
+        # Action: Restore the buying power used when the legs were opened
+        self.buying_power += float(np.sum(closed['entry_price'] * np.abs(closed['quantity'])) * multiplier)
+        return closed, realized_profit
+
+    def get_state(self):
+        # Action: Returns a copy of the account state (used by checkpoints)
+        return {
+            'balance': self.balance,
+            'buying_power': self.buying_power,
+            'starting_balance': self.starting_balance,
+            'positions': {side: dict(position) for side, position in self.positions.items()},
+            'realized_pnl': self.realized_pnl,
+            'unrealized_pnl': self.unrealized_pnl,
+            'options': self.options.get_state(),
+        }
+
+    def set_state(self, state):
+        # Action: Restores a state returned by get_state()
+        self.balance = state['balance']
+        self.buying_power = state['buying_power']
+        self.starting_balance = state['starting_balance']
+        self.positions = {side: dict(position) for side, position in state['positions'].items()}
+        self.realized_pnl = state['realized_pnl']
+        self.unrealized_pnl = state['unrealized_pnl']
+        if 'options' in state:
+            self.options.set_state(state['options'])
+
     def get_unrealized_pnl(self, current_price):
         # Action: Calculate unrealized PNL for open positions
         unrealized_pnl = 0
@@ -95,6 +147,8 @@ class AccountManager:
         if 'short' in self.positions:
             position = self.positions['short']
             unrealized_pnl += (position['avg_price'] - current_price) * position['quantity']
+        # Note: option legs use their marks from the last TradeSimulator.on_bar()
+        unrealized_pnl += self.options.unrealized_pnl()
         return unrealized_pnl
 
     def get_pnl(self):
@@ -0,0 +1,169 @@
+import numpy as np
+import pandas as pd
+
+# Note: the standardized bar frame (Date, Open, High, Low, Close, Volume) can be held by pandas, Polars or Arrow.
+# Data sources still return pandas, the frame is converted once by DataEngine and indicators then work on the native
+# frame through these small backends. Polars and pyarrow are optional and only imported when their backend is used.
+
+
+def _ema_numpy(values, span, initial=None):
+    # Action: adjust=False EMA, y[n] = a * x[n] + (1 - a) * y[n - 1], starting from initial (or the first value)
+    from scipy.signal import lfilter
+
+    values = np.asarray(values, dtype=float)
+    if len(values) == 0:
+        return values
+    alpha = 2.0 / (span + 1.0)
+    previous = values[0] if initial is None else initial
+    ema, _ = lfilter([alpha], [1.0, alpha - 1.0], values, zi=[(1.0 - alpha) * previous])
+    return ema
+
+
+class PandasBackend:
+    name = 'pandas'
+
+    def from_pandas(self, df):
+        return df
+
+    def to_pandas(self, frame):
+        return frame
+
+    def to_numpy(self, frame, column):
+        return frame[column].to_numpy()
+
+    def ema(self, frame, column, span, name, initial=None):
+        if initial is None:
+            frame[name] = frame[column].ewm(span=span, adjust=False).mean()
+        else:
+            # Note: with adjust=False the first EMA value is the first input, so prepending the previous EMA value
+            # continues the exact same recursion over the new values
+            seeded = pd.concat([pd.Series([initial]), frame[column].reset_index(drop=True)], ignore_index=True)
+            ewm = seeded.ewm(span=span, adjust=False).mean().iloc[1:]
+            ewm.index = frame.index
+            frame[name] = ewm
+        return frame
+
+    def subtract(self, frame, left, right, name):
+        frame[name] = frame[left] - frame[right]
+        return frame
+
+    def dates(self, frame, column='Date'):
+        return pd.DatetimeIndex(frame[column])
+
+    def after(self, frame, column, value):
+        return frame[frame[column] > value].reset_index(drop=True)
+
+
+class PolarsBackend:
+    name = 'polars'
+
+    def __init__(self):
+        try:
+            import polars
+        except ImportError:
+            raise ImportError("The 'polars' backend requires polars (pip install polars).")
+        self.pl = polars
+
+    def from_pandas(self, df):
+        return self.pl.from_pandas(df)
+
+    def to_pandas(self, frame):
+        return frame.to_pandas()
+
+    def to_numpy(self, frame, column):
+        # Note: zero-copy for numeric columns without nulls
+        return frame.get_column(column).to_numpy()
+
+    def ema(self, frame, column, span, name, initial=None):
+        pl = self.pl
+        if initial is None:
+            return frame.with_columns(pl.col(column).ewm_mean(span=span, adjust=False).alias(name))
+        seeded = pl.concat([pl.Series([float(initial)]), frame.get_column(column).cast(pl.Float64)])
+        return frame.with_columns(seeded.ewm_mean(span=span, adjust=False).slice(1).alias(name))
+
+    def subtract(self, frame, left, right, name):
+        pl = self.pl
+        return frame.with_columns((pl.col(left) - pl.col(right)).alias(name))
+
+    def dates(self, frame, column='Date'):
+        # Note: NumPy has no time zones, values come back as UTC and the column's zone is restored here
+        dates = pd.DatetimeIndex(frame.get_column(column).to_numpy())
+        time_zone = frame.schema[column].time_zone
+        return dates.tz_localize('UTC').tz_convert(time_zone) if time_zone else dates
+
+    def after(self, frame, column, value):
+        return frame.filter(self.pl.Series(self.dates(frame, column) > value))
+
+
+class ArrowBackend:
+    name = 'arrow'
+
+    def __init__(self):
+        try:
+            import pyarrow
+            import pyarrow.compute
+        except ImportError:
+            raise ImportError("The 'arrow' backend requires pyarrow (pip install pyarrow).")
+        self.pa = pyarrow
+        self.pc = pyarrow.compute
+
+    def from_pandas(self, df):
+        return self.pa.Table.from_pandas(df, preserve_index=False)
+
+    def to_pandas(self, frame):
+        return frame.to_pandas()
+
+    def to_numpy(self, frame, column):
+        # Note: zero-copy when the column is a single chunk without nulls
+        return frame.column(column).to_numpy()
+
+    def _set(self, frame, name, values):
+        if name in frame.column_names:
+            return frame.set_column(frame.column_names.index(name), name, values)
+        return frame.append_column(name, values)
+
+    def ema(self, frame, column, span, name, initial=None):
+        # Note: Arrow compute has no EMA kernel, the recursion runs on the NumPy view of the column
+        return self._set(frame, name, self.pa.array(_ema_numpy(self.to_numpy(frame, column), span, initial)))
+
+    def subtract(self, frame, left, right, name):
+        return self._set(frame, name, self.pc.subtract(frame.column(left), frame.column(right)))
+
+    def dates(self, frame, column='Date'):
+        # Note: NumPy has no time zones, values come back as UTC and the column's zone is restored here
+        dates = pd.DatetimeIndex(frame.column(column).to_numpy())
+        time_zone = frame.schema.field(column).type.tz
+        return dates.tz_localize('UTC').tz_convert(time_zone) if time_zone else dates
+
+    def after(self, frame, column, value):
+        return frame.filter(self.pa.array(self.dates(frame, column) > value))
+
+
+BACKENDS = {'pandas': PandasBackend, 'polars': PolarsBackend, 'arrow': ArrowBackend}
+_instances = {}
+
+
+def get_backend(name='pandas'):
+    """
+    Returns the backend for a name.
+    :param name: 'pandas', 'polars' or 'arrow'.
+    """
+    if name not in BACKENDS:
+        raise ValueError(f"Unsupported backend '{name}'. Options are {', '.join(repr(key) for key in BACKENDS)}.")
+    if name not in _instances:
+        _instances[name] = BACKENDS[name]()
+    return _instances[name]
+
+
+def backend_of(frame):
+    """
+    Returns the backend a frame belongs to (so indicators can work on whatever DataEngine produced).
+    """
+    if isinstance(frame, pd.DataFrame):
+        return get_backend('pandas')
+    module = type(frame).__module__.split('.')[0]
+    if module == 'polars':
+        return get_backend('polars')
+    if module == 'pyarrow':
+        return get_backend('arrow')
+    raise ValueError(f"Unsupported frame type {type(frame).__name__}.")
@@ -0,0 +1,71 @@
+import gzip
+import pickle
+import importlib
+import pandas as pd
+
+from marketquant.strategy_simulator.core.trade_engine import TradingEngine
+
+CHECKPOINT_VERSION = 1
+
+
+def save_checkpoint(engine, strategy, path):
+    """
+    Saves the state of a finished backtest (engine settings, account, trade history and strategy/indicator state)
+    to a compressed file, so it can be resumed later on newer bars with load_checkpoint().
+    :param engine: TradingEngine the strategy ran on.
+    :param strategy: Strategy instance, it must implement get_state() and set_state(state).
+    :param path: Checkpoint file path.
+    """
+    if not hasattr(strategy, 'get_state') or not hasattr(strategy, 'set_state'):
+        raise ValueError(f"{type(strategy).__name__} does not support checkpoints (get_state/set_state missing).")
+    checkpoint = {
+        'version': CHECKPOINT_VERSION,
+        'engine': engine.get_state(),
+        'account': engine.account_manager.get_state(),
+        'simulator': engine.simulator.get_state(),
+        'strategy_class': f"{type(strategy).__module__}:{type(strategy).__qualname__}",
+        'strategy': strategy.get_state(),
+    }
+    with gzip.open(path, 'wb') as f:
+        pickle.dump(checkpoint, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def load_checkpoint(path, end_date=None, data_source=None, client=None, **engine_overrides):
+    """
+    Rebuilds an engine and strategy from a checkpoint. The engine only fetches the bars from the last processed
+    date to end_date, and apply_strategy() then simulates the new bars only.
+    Note: the 'synthetic' provider generates its path from the start date, resumed runs are only consistent with
+    real data providers.
+    :param path: Checkpoint file written by save_checkpoint().
+    :param end_date: New end date (defaults to the checkpoint's end date).
+    :param data_source: Optional custom data source providing the new bars.
+    :param client: Schwab client for the 'schwab' provider.
+    :param engine_overrides: Other TradingEngine settings to change (e.g. print flags, chart).
+    :return: (engine, strategy) tuple.
+    """
+    with gzip.open(path, 'rb') as f:
+        checkpoint = pickle.load(f)
+    if checkpoint.get('version') != CHECKPOINT_VERSION:
+        raise ValueError(f"Unsupported checkpoint version {checkpoint.get('version')} in {path}.")
+
+    settings = dict(checkpoint['engine'])
+    settings.update(engine_overrides)
+    if end_date is not None:
+        settings['end_date'] = end_date
+
+    last_date = checkpoint['strategy'].get('last_date')
+    if data_source is None:
+        # Action: fetch from the last processed bar onward (inclusive, the strategy skips what it already saw)
+        resume_from = pd.Timestamp(last_date).strftime('%Y-%m-%d') if last_date is not None else settings['start_date']
+        data_source = TradingEngine.build_data_source(settings['data_provider'], settings['ticker'], resume_from,
+                                                      settings['end_date'], settings['candle_aggregation'], client,
+                                                      settings.get('base_aggregation'))
+
+    engine = TradingEngine(**settings, data_source=data_source)
+    engine.account_manager.set_state(checkpoint['account'])
+    engine.simulator.set_state(checkpoint['simulator'])
+
+    module_name, class_name = checkpoint['strategy_class'].split(':', 1)
+    strategy = getattr(importlib.import_module(module_name), class_name)(engine)
+    strategy.set_state(checkpoint['strategy'])
+    return engine, strategy
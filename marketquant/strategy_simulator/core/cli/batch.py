@@ -0,0 +1,273 @@
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+import importlib
+import contextlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from marketquant.strategy_simulator.core.config import DEFAULT_CONFIG
+from marketquant.strategy_simulator.core.data import DataPrefetcher
+
+# Note: batch runs never print per-trade output or open charts, whatever the job config says
+BATCH_OVERRIDES = {
+    'print_tradehistory': False,
+    'print_pnl': False,
+    'print_balance': False,
+    'print_buypower': False,
+    'print_unrealizedpnl': False,
+    'print_timecomplexity': False,
+    'chart': False,
+}
+
+
+def load_jobs(path):
+    """
+    Loads a job file, either a JSON list of jobs or JSON lines with one job per line.
+    A job looks like {"id": "...", "config": {...DEFAULT_CONFIG keys...}, "strategy": "module:Class",
+    "strategy_params": {...}}; "id" is optional and derived from the job contents when missing.
+    :param path: Path to the job file.
+    :return: List of job dictionaries, each with an "id".
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read().strip()
+    if text.startswith('['):
+        jobs = json.loads(text)
+    else:
+        jobs = [json.loads(line) for line in text.splitlines() if line.strip()]
+
+    for job in jobs:
+        if 'strategy' not in job:
+            raise ValueError(f"Job {job.get('id', job)} is missing a 'strategy' reference.")
+        unknown = set(job.get('config', {})) - set(DEFAULT_CONFIG)
+        if unknown:
+            raise ValueError(f"Job {job.get('id', job)} has unknown config keys: {sorted(unknown)}")
+        job.setdefault('id', job_id(job))
+    return jobs
+
+
+def job_id(job):
+    # Action: stable id from the job contents so re-runs of an unnamed job are recognized
+    content = json.dumps({k: v for k, v in job.items() if k != 'id'}, sort_keys=True, default=str)
+    return hashlib.sha1(content.encode('utf-8')).hexdigest()[:12]
+
+
+def resolve_strategy(reference):
+    """
+    Resolves a strategy reference, either 'package.module:ClassName' or a name exported by
+    marketquant.strategy_simulator (e.g. 'MACDStrategy').
+    """
+    if ':' in reference:
+        module_name, class_name = reference.split(':', 1)
+    else:
+        module_name, class_name = 'marketquant.strategy_simulator', reference
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def build_engine(job):
+    from marketquant.strategy_simulator.core.trade_engine import TradingEngine
+
+    config = dict(DEFAULT_CONFIG)
+    config.update(job.get('config', {}))
+    config.update(BATCH_OVERRIDES)
+    return TradingEngine(**config)
+
+
+def summarize(job, engine, elapsed):
+    account_manager = engine.account_manager
+    data = engine.data_engine.fetch_data()
+    if len(data) == 0:
+        raise ValueError(f"No data was returned for {engine.ticker} ({engine.start_date} to {engine.end_date}).")
+    unrealized_pnl = account_manager.get_unrealized_pnl(float(engine.data_engine.to_numpy('Close')[-1]))
+    return {
+        'id': job['id'],
+        'status': 'ok',
+        'ticker': engine.ticker,
+        'start_date': str(engine.start_date),
+        'end_date': str(engine.end_date),
+        'candle_aggregation': engine.candle_aggregation,
+        'bars': len(data),
+        'trades': len(engine.simulator.get_trade_history()),
+        'pnl': float(account_manager.get_pnl()),
+        'balance': float(account_manager.get_balance()),
+        'buying_power': float(account_manager.get_buying_power()),
+        'unrealized_pnl': float(unrealized_pnl),
+        'elapsed': round(elapsed, 4),
+    }
+
+
+def run_job(job, verbose=False, engine=None):
+    """
+    Runs a single job and returns its result record. Errors are captured into the record instead of raised
+    so one bad job does not stop the batch.
+    :param engine: Already built TradingEngine for the job (e.g. with prefetched data), or the exception raised
+                   while building it.
+    """
+    start = time.perf_counter()
+    try:
+        with contextlib.ExitStack() as stack:
+            if not verbose:
+                stack.enter_context(contextlib.redirect_stdout(stack.enter_context(open(os.devnull, 'w'))))
+            if isinstance(engine, Exception):
+                raise engine
+            engine = engine or build_engine(job)
+            strategy = resolve_strategy(job['strategy'])(engine, **job.get('strategy_params', {}))
+            strategy.apply_strategy()
+            return summarize(job, engine, time.perf_counter() - start)
+    except Exception as e:
+        return {'id': job['id'], 'status': 'error', 'error': f"{type(e).__name__}: {e}",
+                'elapsed': round(time.perf_counter() - start, 4)}
+
+
+def prefetch_jobs(jobs, depth=2):
+    """
+    Yields (job, engine) pairs, building the engines ahead and fetching the data of the next `depth` jobs in the
+    background while the current job runs. A failed build yields the exception in place of the engine.
+    A depth of 0 (or less) builds and fetches every job in turn, without prefetching.
+    """
+    def engines():
+        for job in jobs:
+            try:
+                yield job, build_engine(job)
+            except Exception as e:
+                yield job, e
+
+    def data_engine(item):
+        engine = item[1]
+        return None if isinstance(engine, Exception) else engine.data_engine
+
+    if depth < 1:
+        return engines()
+    return DataPrefetcher(engines(), depth=depth, data_engine=data_engine)
+
+
+def load_completed(results_path):
+    # Action: ids of jobs that already finished successfully, failed jobs are retried on the next run
+    completed = set()
+    if not os.path.exists(results_path):
+        return completed
+    with open(results_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # Note: a partially written last line from an interrupted run
+            if record.get('status') == 'ok':
+                completed.add(record.get('id'))
+    return completed
+
+
+def run_batch(jobs, results_path, workers=1, verbose=False, prefetch=2):
+    """
+    Runs every job that has no successful result in results_path yet, appending each result as soon as its job
+    finishes.
+    :param jobs: List of job dictionaries (see load_jobs).
+    :param results_path: JSON lines file results are appended to.
+    :param workers: Number of worker processes, 1 runs the jobs in this process.
+    :param verbose: Whether to show the simulator's output for every job.
+    :param prefetch: Number of jobs whose data is fetched ahead when running in this process.
+    :return: Number of (ok, failed, skipped) jobs.
+    """
+    completed = load_completed(results_path)
+    pending = [job for job in jobs if job['id'] not in completed]
+    skipped = len(jobs) - len(pending)
+    ok = failed = 0
+
+    with open(results_path, 'a', encoding='utf-8') as results:
+        def write(record):
+            results.write(json.dumps(record) + '\n')
+            results.flush()
+            return record['status'] == 'ok'
+
+        if workers <= 1:
+            with contextlib.ExitStack() as stack:
+                # Note: prefetching prints from background threads, keep it quiet outside of the jobs as well
+                if not verbose:
+                    stack.enter_context(contextlib.redirect_stdout(stack.enter_context(open(os.devnull, 'w'))))
+                for job, engine in prefetch_jobs(pending, depth=prefetch):
+                    if write(run_job(job, verbose, engine)):
+                        ok += 1
+                    else:
+                        failed += 1
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(run_job, job, verbose) for job in pending]
+                for future in as_completed(futures):
+                    if write(future.result()):
+                        ok += 1
+                    else:
+                        failed += 1
+
+    return ok, failed, skipped
+
+
+def parse_address(address, default_host='127.0.0.1'):
+    # Action: 'host:port' or 'port' -> (host, port)
+    host, _, port = address.rpartition(':')
+    return host or default_host, int(port)
+
+
+def run_worker(host, port, bar_store_path=None, verbose=False):
+    from marketquant.strategy_simulator.core.data import BarStore
+    from marketquant.strategy_simulator.core.distributed import Worker
+
+    bar_store = BarStore(bar_store_path) if bar_store_path else None
+    return Worker(host, port, bar_store=bar_store, verbose=verbose).run()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='marketquant-backtest',
+                                     description='Run a batch of TradingEngine backtests from a job file.')
+    parser.add_argument('jobs', nargs='?', help='JSON (list) or JSON lines job file.')
+    parser.add_argument('-o', '--output', help='Results file (JSON lines), defaults to <jobs>.results.jsonl.')
+    parser.add_argument('-w', '--workers', type=int, default=os.cpu_count() or 1,
+                        help='Number of worker processes (default: CPU count).')
+    parser.add_argument('-p', '--prefetch', type=int, default=2,
+                        help='Jobs whose data is fetched ahead with one worker, 0 disables it (default: 2).')
+    parser.add_argument('-v', '--verbose', action='store_true', help="Show the simulator's output for every job.")
+    distributed = parser.add_argument_group('distributed runs')
+    distributed.add_argument('--serve', metavar='[HOST:]PORT',
+                             help='Coordinate the jobs for remote workers instead of running them.')
+    distributed.add_argument('--connect', metavar='HOST:PORT',
+                             help='Run --workers worker processes for the coordinator at HOST:PORT (no job file).')
+    distributed.add_argument('--batch-size', type=int, default=4, help='Jobs per worker lease (default: 4).')
+    distributed.add_argument('--lease-timeout', type=float, default=600,
+                             help='Seconds of worker silence before its jobs are reassigned (default: 600).')
+    distributed.add_argument('--bar-store', help='Shared directory workers read and write market data from.')
+    args = parser.parse_args(argv)
+
+    if args.connect:
+        host, port = parse_address(args.connect)
+        with ProcessPoolExecutor(max_workers=max(args.workers, 1)) as executor:
+            futures = [executor.submit(run_worker, host, port, args.bar_store, args.verbose)
+                       for _ in range(max(args.workers, 1))]
+            jobs_run = sum(future.result() for future in futures)
+        print(f"Workers finished after running {jobs_run} jobs.")
+        return 0
+
+    if not args.jobs:
+        parser.error('a job file is required unless --connect is used.')
+    jobs = load_jobs(args.jobs)
+    results_path = args.output or f"{os.path.splitext(args.jobs)[0]}.results.jsonl"
+
+    start = time.perf_counter()
+    if args.serve:
+        from marketquant.strategy_simulator.core.distributed import Coordinator
+
+        host, port = parse_address(args.serve, default_host='0.0.0.0')
+        coordinator = Coordinator(jobs, results_path, host, port, batch_size=args.batch_size,
+                                  lease_timeout=args.lease_timeout)
+        print(f"Serving {len(coordinator.remaining)} jobs on {host}:{coordinator.address[1]}...")
+        ok, failed, skipped = coordinator.serve()
+    else:
+        ok, failed, skipped = run_batch(jobs, results_path, workers=args.workers, verbose=args.verbose,
+                                        prefetch=args.prefetch)
+    print(f"Finished {ok + failed} jobs in {time.perf_counter() - start:.2f}s: {ok} ok, {failed} failed, "
+          f"{skipped} skipped (already in {results_path}).")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
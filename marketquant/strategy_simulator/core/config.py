@@ -2,6 +2,7 @@ DEFAULT_CONFIG = {
     'starting_balance': 100000,
     'data_provider': 'yahoo',
     'candle_aggregation': '1d',
+    'base_aggregation': None,
     'ticker': 'AAPL',
     'start_date': '2023-01-01',
     'end_date': '2023-06-01',
@@ -12,5 +13,6 @@ DEFAULT_CONFIG = {
     'print_buypower': True,
     'print_unrealizedpnl': True,
     'print_timecomplexity': True,
-    'chart': True
+    'chart': True,
+    'backend': 'pandas'
 }
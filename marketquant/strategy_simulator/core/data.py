@@ -1,26 +1,52 @@
-from functools import lru_cache
+import os
+import json
+import pickle
+import hashlib
+import threading
 import pandas as pd
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from marketquant.strategy_simulator.core.cli.cli_output import CLIOutput
+from marketquant.strategy_simulator.core.backends import get_backend
 
 class DataEngine:
-    def __init__(self, data_source):
+    def __init__(self, data_source, backend='pandas'):
+        """
+        :param data_source: Any data source with a get_data() method.
+        :param backend: Frame backend of the standardized data, 'pandas', 'polars' or 'arrow'.
+        """
         self.data_source = data_source
+        self.backend = get_backend(backend)
+        self._data = None
 
-    @lru_cache(maxsize=None)  # Dev Note: This is used to improve execution time by caching results.
     def fetch_data(self):
+        # Dev Note: results are cached per engine to improve execution time. This used to be a class level
+        # lru_cache, which kept every engine's data alive for the life of the process (bad for batch runs).
+        if self._data is None:
+            self._data = self._fetch_data()
+        return self._data
+
+    def to_numpy(self, column):
+        # Action: NumPy view of one column of the standardized data (zero-copy where the backend allows it)
+        return self.backend.to_numpy(self.fetch_data(), column)
+
+    def to_pandas(self):
+        return self.backend.to_pandas(self.fetch_data())
+
+    def _fetch_data(self):
         CLIOutput.print_welcome_message()
         print("\033[92mFetching data...\033[0m")
         try:
             raw_data = self.data_source.get_data()
             if raw_data is None or len(raw_data) == 0:
                 print("\033[92mWarning: No data was returned by the data source. Check the time range or data provider.\033[0m")
-                return pd.DataFrame()
+                return self.backend.from_pandas(pd.DataFrame())
 
             print(f"\033[92mSuccessfully fetched {len(raw_data)} records of raw data.\033[0m")
             return self._standardize_data(raw_data)
         except Exception as e:
             print(f"Error fetching data: {e}")
-            return pd.DataFrame()
+            return self.backend.from_pandas(pd.DataFrame())
 
     def _standardize_data(self, data):
         # Dev Note: this will standardize data to a common format.
@@ -29,10 +55,110 @@ class DataEngine:
         df = pd.DataFrame(data)
         if df.empty:
             print("\033[92mWarning: DataFrame is empty after fetching data. Please verify the input parameters.\033[0m")
-            return df
+            return self.backend.from_pandas(df)
 
         df.columns = ['Date', 'Open', 'High', 'Low', 'Close', 'Volume']
         df['Date'] = pd.to_datetime(df['Date'])
 
         print(f"\033[92mData has been standardized. Available data from \033[95m{df['Date'].min()}\033[0m to \033[95m{df['Date'].max()}\033[0m.\033[0m")
-        return df
+        return self.backend.from_pandas(df)
+
+
+class DataPrefetcher:
+    def __init__(self, items, depth=2, max_workers=2, data_engine=None):
+        """
+        Iterates over items (engines, jobs...) while the data of the next ones is fetched and standardized on a
+        background thread pool, so waiting on the network overlaps with running the current backtest.
+        :param items: Iterable of items, consumed lazily.
+        :param depth: Maximum number of items fetched ahead of the current one, bounds the memory held by the queue.
+        :param max_workers: Number of background I/O threads.
+        :param data_engine: Function returning the DataEngine of an item (or None to skip it), by default the items
+                            themselves are DataEngines or have a data_engine attribute (e.g. TradingEngine).
+        """
+        if depth < 1:
+            raise ValueError("depth must be at least 1.")
+        self.items = items
+        self.depth = depth
+        self.max_workers = max_workers
+        self.data_engine = data_engine or self._default_data_engine
+
+    @staticmethod
+    def _default_data_engine(item):
+        return item if isinstance(item, DataEngine) else getattr(item, 'data_engine', None)
+
+    def __iter__(self):
+        items = iter(self.items)
+        window = deque()
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='prefetch')
+
+        def submit_next():
+            for item in items:
+                data_engine = self.data_engine(item)
+                future = executor.submit(data_engine.fetch_data) if data_engine is not None else None
+                window.append((item, future))
+                return
+
+        try:
+            for _ in range(self.depth):
+                submit_next()
+            while window:
+                item, future = window.popleft()
+                # Action: queue the next fetch before handing this item out, keeping `depth` fetches in flight
+                submit_next()
+                if future is not None:
+                    future.result()
+                yield item
+        finally:
+            # Note: cancels the fetches not started yet by hand (shutdown's cancel_futures needs Python 3.9)
+            for _, future in window:
+                if future is not None:
+                    future.cancel()
+            executor.shutdown(wait=False)
+
+
+class BarStore:
+    def __init__(self, directory):
+        """
+        Directory of standardized bar frames shared by several processes or nodes (e.g. on a network share).
+        The first engine asking for a (provider, ticker, range, aggregation) fetches it, every other one reads it
+        from the store. Files are written to a temporary name and renamed, so readers never see partial files.
+        :param directory: Store directory, created if missing.
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(data_provider, ticker, start_date, end_date, candle_aggregation, backend='pandas'):
+        content = json.dumps([data_provider, ticker, str(start_date), str(end_date), candle_aggregation, backend])
+        return hashlib.sha1(content.encode('utf-8')).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.pkl")
+
+    def get(self, key):
+        try:
+            with open(self._path(key), 'rb') as f:
+                return pickle.load(f)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return None
+
+    def put(self, key, data):
+        tmp_path = f"{self._path(key)}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self._path(key))
+
+    def attach(self, engine):
+        """
+        Loads a TradingEngine's bars from the store, or fetches them and adds them to the store.
+        :param engine: TradingEngine (built from a data provider, not a custom data source).
+        """
+        key = self.key(engine.data_provider, engine.ticker, engine.start_date, engine.end_date,
+                       engine.candle_aggregation, engine.data_engine.backend.name)
+        data = self.get(key)
+        if data is not None:
+            engine.data_engine._data = data
+            return
+        data = engine.data_engine.fetch_data()
+        if len(data) > 0:  # Note: empty results are not stored, they are often transient
+            self.put(key, data)
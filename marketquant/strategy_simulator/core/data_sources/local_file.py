@@ -0,0 +1,152 @@
+import os
+import pandas as pd
+
+from marketquant.strategy_simulator.core.resampler import BarResampler, parse_aggregation
+
+OHLCV_COLUMNS = ['Date', 'Open', 'High', 'Low', 'Close', 'Volume']
+
+
+class LocalFileDataSource:
+    def __init__(self, path, ticker=None, start_date=None, end_date=None, aggregation=None, base_aggregation=None,
+                 columns=None, ticker_column=None, timezone=None, file_format=None, chunksize=500_000,
+                 assume_sorted=True):
+        """
+        Reads bars from local CSV or Parquet files, loading only the OHLCV columns and the requested date range.
+        - Parquet: the column projection and the date/ticker filters are pushed down into the reader, so row groups
+          outside of the range are skipped from their statistics, and the file is memory-mapped.
+        - CSV: only the needed columns are parsed, in chunks, and reading stops once the range is passed (when the
+          file is sorted by date).
+        :param path: File path (a directory of Parquet files works too).
+        :param ticker: Symbol to keep when the file holds several tickers (see ticker_column).
+        :param start_date: First date to load (inclusive), None for the start of the file.
+        :param end_date: Last date to load (exclusive), None for the end of the file.
+        :param aggregation: Candle aggregation to return, only used with base_aggregation.
+        :param base_aggregation: Aggregation of the bars in the file, when it differs from aggregation the bars are
+                                 resampled locally (see BarResampler).
+        :param columns: Mapping of standard names to the vendor's column names, e.g. {'Date': 'timestamp',
+                        'Close': 'close_px'}. Missing names default to the standard ones.
+        :param ticker_column: Column holding the symbol in multi-ticker files.
+        :param timezone: Time zone to localize naive dates to (or convert aware ones to), e.g. 'America/New_York'.
+        :param file_format: 'csv' or 'parquet', guessed from the extension when None.
+        :param chunksize: Rows per CSV chunk.
+        :param assume_sorted: Whether CSV rows are sorted by date, which lets reading stop after end_date.
+        """
+        self.path = path
+        self.ticker = ticker
+        self.start_date = pd.Timestamp(start_date) if start_date is not None else None
+        self.end_date = pd.Timestamp(end_date) if end_date is not None else None
+        self.aggregation = aggregation
+        self.base_aggregation = base_aggregation
+        self.columns = {name: (columns or {}).get(name, name) for name in OHLCV_COLUMNS}
+        self.ticker_column = ticker_column
+        self.timezone = timezone
+        self.file_format = file_format or self._guess_format(path)
+        self.chunksize = chunksize
+        self.assume_sorted = assume_sorted
+
+    @staticmethod
+    def _guess_format(path):
+        extension = os.path.splitext(path.rstrip('/\\'))[1].lower()
+        if extension in ('.parquet', '.pq') or os.path.isdir(path):
+            return 'parquet'
+        if extension in ('.csv', '.txt', '.gz', '.zip', '.bz2'):
+            return 'csv'
+        raise ValueError(f"Cannot tell the format of '{path}', pass file_format='csv' or 'parquet'.")
+
+    def get_data(self):
+        if self.file_format == 'parquet':
+            data = self._read_parquet()
+        elif self.file_format == 'csv':
+            data = self._read_csv()
+        else:
+            raise ValueError(f"Unsupported file format '{self.file_format}'. Options are 'csv' or 'parquet'.")
+
+        if self.base_aggregation and self.aggregation and self.base_aggregation != self.aggregation:
+            # Note: daily (or coarser) files carry midnight dates, the session filter only applies to intraday bars
+            intraday = parse_aggregation(self.base_aggregation) < pd.Timedelta(days=1)
+            return BarResampler(data, regular_hours_only=intraday).resample(self.aggregation)
+        return data
+
+    def _bounds(self, date_type_tz=None):
+        # Action: align the range bounds with the time zone of the dates they are compared to
+        bounds = []
+        for value in (self.start_date, self.end_date):
+            if value is not None:
+                if date_type_tz is not None and value.tzinfo is None:
+                    value = value.tz_localize(self.timezone or date_type_tz)
+                elif date_type_tz is None and value.tzinfo is not None:
+                    value = value.tz_convert(None)
+            bounds.append(value)
+        return bounds
+
+    def _read_parquet(self):
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        import pyarrow.parquet as pq
+
+        names = list(self.columns.values()) + ([self.ticker_column] if self.ticker_column else [])
+        date_column = self.columns['Date']
+        date_type = pq.ParquetDataset(self.path).schema.field(date_column).type
+        dates_pushed_down = pa.types.is_timestamp(date_type)
+
+        condition = None
+        if dates_pushed_down:
+            start, end = self._bounds(date_type.tz)
+            if start is not None:
+                condition = pc.field(date_column) >= pa.scalar(start, date_type)
+            if end is not None:
+                upper = pc.field(date_column) < pa.scalar(end, date_type)
+                condition = upper if condition is None else condition & upper
+        if self.ticker_column and self.ticker is not None:
+            match = pc.field(self.ticker_column) == self.ticker
+            condition = match if condition is None else condition & match
+
+        table = pq.read_table(self.path, columns=names, filters=condition, memory_map=True)
+        df = table.select(list(self.columns.values())).to_pandas()
+        df.columns = OHLCV_COLUMNS
+        # Note: dates stored as strings can not be compared in the reader, they are filtered after parsing
+        return self._finish(df, filtered=dates_pushed_down)
+
+    def _read_csv(self):
+        usecols = list(self.columns.values()) + ([self.ticker_column] if self.ticker_column else [])
+        rename = {vendor: name for name, vendor in self.columns.items()}
+        chunks = []
+        for chunk in pd.read_csv(self.path, usecols=usecols, chunksize=self.chunksize, memory_map=True):
+            if self.ticker_column and self.ticker is not None:
+                chunk = chunk[chunk[self.ticker_column] == self.ticker]
+            chunk = chunk.rename(columns=rename)[OHLCV_COLUMNS]
+            chunk['Date'] = self._parse_dates(chunk['Date'])
+            start, end = self._bounds(chunk['Date'].dt.tz)
+            if start is not None:
+                chunk = chunk[chunk['Date'] >= start]
+            if end is not None:
+                past_end = chunk['Date'] >= end
+                if self.assume_sorted and past_end.any():
+                    chunks.append(chunk[~past_end])
+                    break
+                chunk = chunk[~past_end]
+            chunks.append(chunk)
+
+        df = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame(columns=OHLCV_COLUMNS)
+        return self._finish(df, filtered=True)
+
+    def _parse_dates(self, dates):
+        try:
+            dates = pd.to_datetime(dates)
+        except ValueError:
+            # Note: offsets that change across the file (daylight saving time) can only be parsed as UTC
+            dates = pd.to_datetime(dates, utc=True)
+        if self.timezone is None:
+            return dates
+        return dates.dt.tz_localize(self.timezone) if dates.dt.tz is None else dates.dt.tz_convert(self.timezone)
+
+    def _finish(self, df, filtered):
+        if not pd.api.types.is_datetime64_any_dtype(df['Date']) or self.timezone is not None:
+            df['Date'] = self._parse_dates(df['Date'])
+        if not filtered:
+            start, end = self._bounds(df['Date'].dt.tz)
+            if start is not None:
+                df = df[df['Date'] >= start]
+            if end is not None:
+                df = df[df['Date'] < end]
+        return df.sort_values('Date', kind='stable').reset_index(drop=True)
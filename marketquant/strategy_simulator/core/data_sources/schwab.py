@@ -1 +1,140 @@
-# Schwab Market Data API implementation coming in a future update.
\ No newline at end of file
+import time
+import threading
+import numpy as np
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+
+# Note: maps Yahoo style candle aggregations to Schwab's (periodType, frequencyType, frequency)
+SCHWAB_AGGREGATIONS = {
+    '1m': ('day', 'minute', 1),
+    '5m': ('day', 'minute', 5),
+    '10m': ('day', 'minute', 10),
+    '15m': ('day', 'minute', 15),
+    '30m': ('day', 'minute', 30),
+    '1d': ('year', 'daily', 1),
+    '1wk': ('year', 'weekly', 1),
+    '1mo': ('year', 'monthly', 1),
+}
+
+
+class SchwabDataSource:
+    def __init__(self, client, ticker, start_date, end_date, aggregation="1d", extended_hours=False,
+                 window_days=10, max_workers=4, requests_per_minute=120, timezone='America/New_York'):
+        """
+        Fetches price history from the Schwab API for the simulator.
+        :param client: Initialized Schwab API client.
+        :param ticker: Stock ticker symbol (e.g., 'AAPL').
+        :param start_date: Start date (inclusive).
+        :param end_date: End date (exclusive, same as Yahoo).
+        :param aggregation: Candle aggregation ('1m', '5m', '10m', '15m', '30m', '1d', '1wk', '1mo').
+        :param extended_hours: Whether to include extended hours candles.
+        :param window_days: Days per request for minute candles, long ranges are split into windows of this size.
+        :param max_workers: Number of windows fetched concurrently.
+        :param requests_per_minute: Upper bound on requests started per minute across all workers, only used when the
+                                    client has no rate limiter of its own.
+        :param timezone: Timezone the candle timestamps are converted to.
+        """
+        if aggregation not in SCHWAB_AGGREGATIONS:
+            raise ValueError(f"Unsupported candle aggregation '{aggregation}' for Schwab. "
+                             f"Options are {list(SCHWAB_AGGREGATIONS.keys())}")
+        self.client = client
+        self.ticker = ticker
+        self.start_date = start_date
+        self.end_date = end_date
+        self.aggregation = aggregation
+        self.extended_hours = extended_hours
+        self.window_days = window_days
+        self.max_workers = max_workers
+        self.requests_per_minute = requests_per_minute
+        self.timezone = timezone
+
+        self._throttle_lock = threading.Lock()
+        self._next_request_time = 0.0
+
+    def get_data(self):
+        period_type, frequency_type, frequency = SCHWAB_AGGREGATIONS[self.aggregation]
+        windows = self._split_windows(frequency_type)
+
+        # Action: fetches every window concurrently, results come back in window order
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(windows)))) as executor:
+            frames = list(executor.map(
+                lambda window: self._fetch_window(window[0], window[1], period_type, frequency_type, frequency),
+                windows))
+
+        data = pd.concat(frames, ignore_index=True)
+        data = data.drop_duplicates(subset='Date', keep='last').sort_values('Date', kind='stable')
+
+        start, end = self._date_range()
+        data = data[(data['Date'] >= start) & (data['Date'] < end)]
+        return data.reset_index(drop=True)
+
+    def _date_range(self):
+        start = pd.Timestamp(self.start_date)
+        end = pd.Timestamp(self.end_date)
+        start = start.tz_localize(self.timezone) if start.tzinfo is None else start.tz_convert(self.timezone)
+        end = end.tz_localize(self.timezone) if end.tzinfo is None else end.tz_convert(self.timezone)
+        if start > end:
+            raise ValueError(f"start_date ({self.start_date}) must not be after end_date ({self.end_date}).")
+        return start, end
+
+    def _split_windows(self, frequency_type):
+        start, end = self._date_range()
+        if frequency_type != 'minute':
+            return [(start, end)]
+
+        # Note: Schwab caps how many minute candles one call returns, so long ranges are split into windows
+        edges = list(pd.date_range(start, end, freq=pd.Timedelta(days=self.window_days)))
+        if edges[-1] < end:
+            edges.append(end)
+        return list(zip(edges[:-1], edges[1:])) or [(start, end)]
+
+    def _throttle(self):
+        # Action: spaces out request start times so concurrent workers stay within requests_per_minute
+        if getattr(self.client, 'rate_limiter', None) is not None:
+            return  # Note: the client already throttles (and prioritizes) every request
+        interval = 60.0 / self.requests_per_minute
+        with self._throttle_lock:
+            now = time.monotonic()
+            wait = self._next_request_time - now
+            self._next_request_time = max(now, self._next_request_time) + interval
+        if wait > 0:
+            time.sleep(wait)
+
+    def _fetch_window(self, start, end, period_type, frequency_type, frequency):
+        self._throttle()
+        response = self.client.price_history(self.ticker,
+                                             periodType=period_type,
+                                             frequencyType=frequency_type,
+                                             frequency=frequency,
+                                             startDate=start.to_pydatetime(),
+                                             endDate=end.to_pydatetime(),
+                                             needExtendedHoursData=self.extended_hours)
+        if not response.ok:
+            raise ValueError(f"Schwab price history request failed for {self.ticker} "
+                             f"({start} to {end}): {response.status_code} {response.text}")
+        return self.parse_candles(response.json(), self.timezone)
+
+    @staticmethod
+    def parse_candles(price_history, timezone='America/New_York'):
+        """
+        Converts a Schwab price history response into the standardized columns.
+        :param price_history: Parsed JSON from Client.price_history().
+        :param timezone: Timezone the candle timestamps are converted to.
+        :return: DataFrame with Date, Open, High, Low, Close and Volume columns.
+        """
+        candles = price_history.get('candles', [])
+        count = len(candles)
+
+        def column(name, dtype=np.float64, default=np.nan):
+            return np.fromiter((candle.get(name, default) for candle in candles), dtype=dtype, count=count)
+
+        # Note: the epoch milliseconds are converted in one vectorized call instead of per candle
+        dates = pd.to_datetime(column('datetime', np.int64, 0), unit='ms', utc=True).tz_convert(timezone)
+        return pd.DataFrame({
+            'Date': dates,
+            'Open': column('open'),
+            'High': column('high'),
+            'Low': column('low'),
+            'Close': column('close'),
+            'Volume': column('volume'),
+        })
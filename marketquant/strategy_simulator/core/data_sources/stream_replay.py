@@ -0,0 +1,161 @@
+import json
+import time
+import threading
+import numpy as np
+import pandas as pd
+
+# Note: numbered field ids sent by the Schwab streamer for the services that can be replayed
+STREAM_FIELDS = {
+    'LEVELONE_EQUITIES': {'1': 'Bid', '2': 'Ask', '3': 'Last', '4': 'BidSize', '5': 'AskSize', '8': 'TotalVolume',
+                          '9': 'LastSize', '34': 'QuoteTime', '35': 'TradeTime'},
+    'CHART_EQUITY': {'1': 'Open', '2': 'High', '3': 'Low', '4': 'Close', '5': 'Volume', '6': 'Sequence',
+                     '7': 'ChartTime'},
+}
+
+
+def parse_stream_messages(messages, service, keys=None):
+    """
+    Parses raw Schwab stream messages into columns in a single pass.
+    :param messages: Iterable of raw message strings (or already decoded dicts) as received by the Stream receiver.
+    :param service: Stream service to extract ('LEVELONE_EQUITIES' or 'CHART_EQUITY').
+    :param keys: Optional collection of symbols to keep, all symbols are kept if None.
+    :return: Dictionary of column name -> list, including 'Key' and the message 'Timestamp'.
+    """
+    if service not in STREAM_FIELDS:
+        raise ValueError(f"Unsupported stream service '{service}'. Options are {list(STREAM_FIELDS.keys())}")
+    fields = STREAM_FIELDS[service]
+    columns = {'Key': [], 'Timestamp': []}
+    columns.update({name: [] for name in fields.values()})
+    keys = set(keys) if keys is not None else None
+
+    for message in messages:
+        if isinstance(message, str):
+            if not message.strip():
+                continue
+            message = json.loads(message)
+        # Note: login/subscription responses and heartbeats come in as 'response'/'notify', only 'data' is replayed
+        for data in message.get('data', []):
+            if data.get('service') != service:
+                continue
+            timestamp = data.get('timestamp')
+            for content in data.get('content', []):
+                key = content.get('key')
+                if keys is not None and key not in keys:
+                    continue
+                columns['Key'].append(key)
+                columns['Timestamp'].append(timestamp)
+                for field_id, name in fields.items():
+                    columns[name].append(content.get(field_id))
+    return columns
+
+
+class StreamRecorder:
+    def __init__(self, path, receiver=None):
+        """
+        Stream receiver that appends every raw message to a file so it can be replayed later.
+        :param path: File the messages are appended to (one message per line).
+        :param receiver: Optional receiver to forward every message to (e.g. print).
+        """
+        self.path = path
+        self.receiver = receiver
+        self._lock = threading.Lock()
+        self._file = open(path, 'a', encoding='utf-8')
+
+    def __call__(self, message, *args, **kwargs):
+        with self._lock:
+            self._file.write(message.replace('\n', '') + '\n')
+            self._file.flush()
+        if self.receiver is not None:
+            self.receiver(message, *args, **kwargs)
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+class StreamReplayDataSource:
+    def __init__(self, path, ticker, service='CHART_EQUITY', speed=None):
+        """
+        Replays recorded Schwab stream messages (see StreamRecorder) as simulator data.
+        :param path: File with recorded stream messages.
+        :param ticker: Symbol to replay.
+        :param service: Recorded service ('CHART_EQUITY' for minute bars, 'LEVELONE_EQUITIES' for ticks).
+        :param speed: None to replay as fast as possible, otherwise a time scale (1 = real time, 10 = 10x faster).
+        """
+        if service not in STREAM_FIELDS:
+            raise ValueError(f"Unsupported stream service '{service}'. Options are {list(STREAM_FIELDS.keys())}")
+        self.path = path
+        self.ticker = ticker
+        self.service = service
+        self.speed = speed
+        self._buffer = None
+
+    def load(self):
+        """
+        Parses the recording once into a time sorted columnar buffer.
+        :return: DataFrame with one row per event.
+        """
+        if self._buffer is not None:
+            return self._buffer
+
+        with open(self.path, 'r', encoding='utf-8') as f:
+            columns = parse_stream_messages(f, self.service, keys=[self.ticker])
+        df = pd.DataFrame(columns)
+        numeric = [name for name in df.columns if name != 'Key']
+        df[numeric] = df[numeric].astype('float64')
+
+        if self.service == 'CHART_EQUITY':
+            event_time = df['ChartTime'].fillna(df['Timestamp'])
+        else:
+            # Note: an update is timed by its own trade or quote time (quote only updates have no TradeTime), taken
+            # before the values are carried forward so it never inherits the time of an earlier trade
+            event_time = df['TradeTime'].fillna(df['QuoteTime']).fillna(df['Timestamp'])
+            # Note: level one messages only carry the fields that changed, so values are carried forward
+            df = df.ffill()
+
+        df['Date'] = pd.to_datetime(event_time.astype('int64'), unit='ms', utc=True).dt.tz_convert('America/New_York')
+        order = np.argsort(df['Date'].to_numpy(), kind='stable')
+        self._buffer = df.iloc[order].reset_index(drop=True)
+        return self._buffer
+
+    def get_data(self):
+        buffer = self.load()
+        if self.service == 'CHART_EQUITY':
+            data = buffer[['Date', 'Open', 'High', 'Low', 'Close', 'Volume']]
+            return data.drop_duplicates(subset='Date', keep='last').reset_index(drop=True)
+
+        # Action: one row per trade, a trade is a level one update where the last price or trade time changed
+        trades = buffer[buffer['Last'].notna()]
+        changed = (trades['Last'].diff() != 0) | (trades['TradeTime'].diff() != 0)
+        trades = trades[changed]
+        return pd.DataFrame({'Date': trades['Date'], 'Open': trades['Last'], 'High': trades['Last'],
+                             'Low': trades['Last'], 'Close': trades['Last'],
+                             'Volume': trades['LastSize'].fillna(0)}).reset_index(drop=True)
+
+    def events(self, speed=None):
+        """
+        Yields every recorded event in time order as a dictionary, sleeping between events when time scaled.
+        :param speed: Overrides the data source speed for this replay.
+        """
+        speed = self.speed if speed is None else speed
+        buffer = self.load()
+        names = list(buffer.columns)
+        arrays = [buffer[name].to_numpy() for name in names]
+        times = (buffer['Date'] - buffer['Date'].iloc[0]).dt.total_seconds().to_numpy() if len(buffer) else []
+
+        replay_start = time.monotonic()
+        for i in range(len(buffer)):
+            if speed:
+                wait = times[i] / speed - (time.monotonic() - replay_start)
+                if wait > 0:
+                    time.sleep(wait)
+            yield {name: array[i] for name, array in zip(names, arrays)}
+
+    def replay(self, callback, speed=None):
+        """
+        Replays every recorded event into a callback (e.g. a strategy's on_tick).
+        :param callback: Function called with each event dictionary.
+        :param speed: Overrides the data source speed for this replay.
+        """
+        for event in self.events(speed):
+            callback(event)
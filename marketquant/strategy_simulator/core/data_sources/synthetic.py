@@ -0,0 +1,340 @@
+import numpy as np
+import pandas as pd
+from datetime import datetime, timedelta
+from marketquant.math.greeks.black_scholes import BlackScholes
+from marketquant.strategy_simulator.core.resampler import parse_aggregation
+
+TRADING_DAYS = 252
+
+
+class SyntheticDataSource:
+    def __init__(self, ticker='SYN', start_date='2023-01-01', end_date=None, aggregation="1d", bars=None,
+                 model='gbm', seed=None, start_price=100.0, drift=0.08, volatility=0.2, jump_intensity=5.0,
+                 jump_mean=-0.02, jump_std=0.05, garch_alpha=0.08, garch_beta=0.9, base_volume=1_000_000,
+                 session_start='09:30', session_end='16:00', timezone='America/New_York'):
+        """
+        Generates seeded OHLCV bars so the simulator and tools can be run and benchmarked without network access.
+        The same arguments always produce the same data.
+        :param ticker: Symbol reported for the generated data.
+        :param start_date: First trading day.
+        :param end_date: Last trading day (exclusive), ignored when bars is given.
+        :param aggregation: Candle aggregation (e.g. '1m', '5m', '1h', '1d').
+        :param bars: Exact number of bars to generate, any count works (e.g. 10**7).
+        :param model: Return model ('gbm', 'jump' for Merton jump-diffusion or 'garch' for GARCH(1,1)).
+        :param seed: Random seed, derived from the ticker when None (so every ticker gets its own path).
+        :param start_price: Price the path starts from.
+        :param drift: Annualized drift.
+        :param volatility: Annualized volatility (long run volatility for 'garch').
+        :param jump_intensity: Expected jumps per year ('jump' model).
+        :param jump_mean: Mean log jump size ('jump' model).
+        :param jump_std: Standard deviation of the log jump size ('jump' model).
+        :param garch_alpha: GARCH(1,1) reaction to the last shock ('garch' model).
+        :param garch_beta: GARCH(1,1) variance persistence ('garch' model).
+        :param base_volume: Typical volume per bar.
+        :param session_start: Session open for intraday bars.
+        :param session_end: Session close for intraday bars.
+        :param timezone: Timezone of the generated timestamps.
+        """
+        if model not in ('gbm', 'jump', 'garch'):
+            raise ValueError(f"Unsupported model '{model}'. Options are 'gbm', 'jump' or 'garch'.")
+        if end_date is None and bars is None:
+            raise ValueError("Either end_date or bars must be given.")
+        if model == 'garch' and garch_alpha + garch_beta >= 1:
+            raise ValueError("garch_alpha + garch_beta must be below 1 for a stationary variance.")
+
+        self.ticker = ticker
+        self.start_date = start_date
+        self.end_date = end_date
+        self.aggregation = aggregation
+        self.bars = bars
+        self.model = model
+        # Note: same per symbol seed as SyntheticChainClient
+        self.seed = seed if seed is not None else sum(ord(ch) for ch in ticker)
+        self.start_price = start_price
+        self.drift = drift
+        self.volatility = volatility
+        self.jump_intensity = jump_intensity
+        self.jump_mean = jump_mean
+        self.jump_std = jump_std
+        self.garch_alpha = garch_alpha
+        self.garch_beta = garch_beta
+        self.base_volume = base_volume
+        self.session_start = pd.Timedelta(f"{session_start}:00")
+        self.session_end = pd.Timedelta(f"{session_end}:00")
+        self.timezone = timezone
+
+    def get_data(self):
+        rng = np.random.default_rng(self.seed)
+        dates, dt = self._timestamps()
+        n = len(dates)
+
+        log_returns, variance = self._log_returns(rng, n, dt)
+        close = self.start_price * np.exp(np.cumsum(log_returns))
+        open_ = np.empty(n)
+        open_[0] = self.start_price
+        open_[1:] = close[:-1]
+
+        # Note: high/low are drawn from the exact distribution of a Brownian bridge's max/min between open and close
+        move = log_returns
+        high_excess = 0.5 * (move + np.sqrt(move ** 2 - 2 * variance * np.log(rng.random(n))))
+        low_excess = 0.5 * (move - np.sqrt(move ** 2 - 2 * variance * np.log(rng.random(n))))
+        high = open_ * np.exp(high_excess)
+        low = open_ * np.exp(low_excess)
+
+        # Note: busier bars on bigger moves, with lognormal noise
+        shock = np.abs(move) / np.sqrt(variance)
+        volume = np.round(self.base_volume * rng.lognormal(0.0, 0.5, n) * (0.5 + 0.5 * shock))
+
+        return pd.DataFrame({'Date': dates, 'Open': open_, 'High': high, 'Low': low, 'Close': close,
+                             'Volume': volume})
+
+    def _timestamps(self):
+        step = parse_aggregation(self.aggregation)
+        day = pd.Timedelta(1, unit='D')
+
+        if step >= day:
+            days_per_bar = int(step / day)
+            if self.bars is not None:
+                days = pd.bdate_range(self.start_date, periods=self.bars * days_per_bar)
+            else:
+                days = pd.bdate_range(self.start_date, self.end_date, inclusive='left')
+            days = days[::days_per_bar]
+            return days.tz_localize(self.timezone), days_per_bar / TRADING_DAYS
+
+        # Action: builds the intraday grid as (day x bar of the session) in one broadcast
+        session = self.session_end - self.session_start
+        per_day = int(np.ceil(session / step))
+        if self.bars is not None:
+            days = pd.bdate_range(self.start_date, periods=int(np.ceil(self.bars / per_day)))
+        else:
+            days = pd.bdate_range(self.start_date, self.end_date, inclusive='left')
+        # Note: only the session opens are localized (DST never changes mid-session), localizing every bar is slow
+        session_open = (days + self.session_start).tz_localize(self.timezone).tz_convert('UTC').tz_localize(None)
+        offsets = pd.to_timedelta(np.arange(per_day) * step.value, unit='ns').to_numpy()
+        grid = (session_open.to_numpy()[:, None] + offsets[None, :]).ravel()
+        if self.bars is not None:
+            grid = grid[:self.bars]
+        dates = pd.DatetimeIndex(grid).tz_localize('UTC').tz_convert(self.timezone)
+        return dates, (step / session) / TRADING_DAYS
+
+    def _log_returns(self, rng, n, dt):
+        z = rng.standard_normal(n)
+
+        if self.model == 'garch':
+            variance = self._garch_variance(z, self.volatility ** 2 * dt)
+            return self.drift * dt - 0.5 * variance + np.sqrt(variance) * z, variance
+
+        variance = np.full(n, self.volatility ** 2 * dt)
+        log_returns = (self.drift - 0.5 * self.volatility ** 2) * dt + self.volatility * np.sqrt(dt) * z
+        if self.model == 'jump':
+            # Note: compensated Merton jumps, the drift stays the same as without jumps
+            compensator = self.jump_intensity * (np.exp(self.jump_mean + 0.5 * self.jump_std ** 2) - 1) * dt
+            jumps = rng.poisson(self.jump_intensity * dt, n)
+            jump_sizes = self.jump_mean * jumps + self.jump_std * np.sqrt(jumps) * rng.standard_normal(n)
+            log_returns = log_returns + jump_sizes - compensator
+        return log_returns, variance
+
+    def _garch_variance(self, z, long_run_variance):
+        """
+        GARCH(1,1) variance path h[t] = omega + (alpha * z[t-1]**2 + beta) * h[t-1], solved block by block with
+        cumulative products instead of a Python loop per bar.
+        """
+        alpha, beta = self.garch_alpha, self.garch_beta
+        omega = long_run_variance * (1 - alpha - beta)
+        n = len(z)
+        growth = np.empty(n)
+        growth[0] = 1.0
+        growth[1:] = np.maximum(alpha * z[:-1] ** 2 + beta, 1e-300)
+
+        # Note: block size keeps the cumulative products inside float range (growth >= beta on every step)
+        block = int(np.clip(500 / max(-np.log(max(beta, 1e-300)), 1e-9), 1, 4096))
+        variance = np.empty(n)
+        previous = long_run_variance
+        for start in range(0, n, block):
+            log_product = np.cumsum(np.log(growth[start:start + block]))
+            if start == 0:
+                log_product -= log_product[0]
+                product = np.exp(log_product)
+                omega_sum = np.r_[0.0, np.cumsum(np.exp(-log_product[1:]))]
+            else:
+                product = np.exp(log_product)
+                omega_sum = np.cumsum(np.exp(-log_product))
+            variance[start:start + block] = product * (previous + omega * omega_sum)
+            previous = variance[start + len(product) - 1]
+        return variance
+
+
+class SyntheticResponse:
+    def __init__(self, payload, status_code=200):
+        """
+        Minimal stand-in for requests.Response so generated payloads can be passed where Client responses are
+        expected.
+        """
+        self._payload = payload
+        self.status_code = status_code
+        self.ok = status_code < 400
+        self.text = str(payload)
+
+    def json(self):
+        return self._payload
+
+
+class SyntheticOptionChain:
+    def __init__(self, symbol='SYN', underlying_price=100.0, expirations=8, strikes=50, strike_step=None,
+                 volatility=0.2, skew=-0.4, smile=1.5, risk_free_rate=0.05, as_of=None, seed=0):
+        """
+        Generates option chains shaped like the Schwab option_chains response (callExpDateMap/putExpDateMap).
+        :param symbol: Underlying symbol.
+        :param underlying_price: Underlying price.
+        :param expirations: Number of weekly (Friday) expirations.
+        :param strikes: Number of strikes per expiration, centered on the underlying price.
+        :param strike_step: Distance between strikes, defaults to about 1% of the underlying price.
+        :param volatility: At the money implied volatility.
+        :param skew: Slope of implied volatility against log moneyness.
+        :param smile: Curvature of implied volatility against log moneyness.
+        :param risk_free_rate: Risk free rate as a decimal.
+        :param as_of: Date the chain is generated for (defaults to today).
+        :param seed: Random seed.
+        """
+        self.symbol = symbol
+        self.underlying_price = float(underlying_price)
+        self.expirations = expirations
+        self.strikes = strikes
+        self.strike_step = strike_step or max(round(self.underlying_price * 0.01), 0.5)
+        self.volatility = volatility
+        self.skew = skew
+        self.smile = smile
+        self.risk_free_rate = risk_free_rate
+        self.as_of = as_of or datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        self.seed = seed
+
+    def generate(self):
+        rng = np.random.default_rng(self.seed)
+        spot = self.underlying_price
+
+        first_friday = self.as_of + timedelta(days=(4 - self.as_of.weekday()) % 7 or 7)
+        expiry_dates = [first_friday + timedelta(weeks=i) for i in range(self.expirations)]
+        days_to_expiry = np.array([(expiry - self.as_of).days for expiry in expiry_dates])
+        center = round(spot / self.strike_step) * self.strike_step
+        strike_values = center + (np.arange(self.strikes) - self.strikes // 2) * self.strike_step
+        strike_values = strike_values[strike_values > 0]
+
+        # Action: every (expiry, strike, call/put) priced in one vectorized call
+        dte, strike, is_call = np.meshgrid(days_to_expiry, strike_values, [True, False], indexing='ij')
+        moneyness = np.log(strike / spot)
+        iv = np.maximum(self.volatility * (1 + self.skew * moneyness + self.smile * moneyness ** 2), 0.01)
+        greeks = BlackScholes.greeks(spot, strike, dte / 365, self.risk_free_rate, iv, is_call)
+        spread = np.maximum(0.01, greeks['price'] * 0.02)
+        open_interest = np.round(rng.lognormal(7, 1, dte.shape) * np.exp(-20 * moneyness ** 2)).astype(int)
+        volume = np.round(open_interest * rng.random(dte.shape) * 0.3).astype(int)
+
+        maps = {True: {}, False: {}}
+        for e, expiry in enumerate(expiry_dates):
+            expiry_key = f"{expiry.strftime('%Y-%m-%d')}:{days_to_expiry[e]}"
+            for side in (True, False):
+                maps[side][expiry_key] = {}
+            for s, strike_price in enumerate(strike_values):
+                for c, side in enumerate((True, False)):
+                    i = (e, s, c)
+                    price = float(greeks['price'][i])
+                    maps[side][expiry_key][str(float(strike_price))] = [{
+                        'putCall': 'CALL' if side else 'PUT',
+                        'symbol': f"{self.symbol:<6}{expiry.strftime('%y%m%d')}{'C' if side else 'P'}"
+                                  f"{int(round(strike_price * 1000)):08d}",
+                        'bid': round(max(price - spread[i] / 2, 0.0), 2),
+                        'ask': round(price + spread[i] / 2, 2),
+                        'last': round(price, 2),
+                        'mark': round(price, 2),
+                        'totalVolume': int(volume[i]),
+                        'volatility': round(float(iv[i]) * 100, 3),
+                        'delta': round(float(greeks['delta'][i]), 4),
+                        'gamma': round(float(greeks['gamma'][i]), 4),
+                        'theta': round(float(greeks['theta'][i]), 4),
+                        'vega': round(float(greeks['vega'][i]), 4),
+                        'rho': round(float(greeks['rho'][i]), 4),
+                        'openInterest': int(open_interest[i]),
+                        'theoreticalOptionValue': round(price, 4),
+                        'strikePrice': float(strike_price),
+                        'expirationDate': expiry.strftime('%Y-%m-%dT20:00:00.000+00:00'),
+                        'daysToExpiration': int(days_to_expiry[e]),
+                        'multiplier': 100.0,
+                        'inTheMoney': bool(strike_price < spot if side else strike_price > spot),
+                    }]
+
+        return {
+            'symbol': self.symbol,
+            'status': 'SUCCESS',
+            'strategy': 'SINGLE',
+            'interval': 0.0,
+            'isDelayed': False,
+            'isIndex': False,
+            'interestRate': self.risk_free_rate * 100,
+            'underlyingPrice': spot,
+            'volatility': self.volatility * 100,
+            'daysToExpiration': 0.0,
+            'numberOfContracts': int(dte.size),
+            'callExpDateMap': maps[True],
+            'putExpDateMap': maps[False],
+        }
+
+
+class SyntheticChainClient:
+    def __init__(self, seed=0, **chain_kwargs):
+        """
+        Stands in for the Schwab Client's option_chains() and option_expiration_chain() (e.g. for GammaExposure and
+        fetch_option_chain) with generated chains.
+        :param seed: Random seed, each symbol gets its own deterministic chain.
+        :param chain_kwargs: Extra SyntheticOptionChain arguments (underlying_price, expirations, strikes...).
+        """
+        self.seed = seed
+        self.chain_kwargs = chain_kwargs
+        self._chains = {}  # symbol -> generated chain, so every window of a fetch sees the same chain
+
+    def _chain(self, symbol):
+        if symbol not in self._chains:
+            symbol_seed = self.seed + sum(ord(ch) for ch in symbol)
+            self._chains[symbol] = SyntheticOptionChain(symbol, seed=symbol_seed, **self.chain_kwargs).generate()
+        return self._chains[symbol]
+
+    def option_chains(self, symbol, contractType=None, fromDate=None, toDate=None, **kwargs):
+        # Note: honours the expiration range and contract type like the api, other parameters are ignored
+        chain = self._chain(symbol)
+        from_date = self._time_convert(fromDate, "YYYY-MM-DD")
+        to_date = self._time_convert(toDate, "YYYY-MM-DD")
+        contract_type = (contractType or 'ALL').upper()
+
+        def expirations(date_map, keep):
+            if not keep:
+                return {}
+            return {key: strikes for key, strikes in date_map.items()
+                    if (from_date is None or key[:10] >= from_date[:10])
+                    and (to_date is None or key[:10] <= to_date[:10])}
+
+        calls = expirations(chain['callExpDateMap'], contract_type in ('ALL', 'CALL'))
+        puts = expirations(chain['putExpDateMap'], contract_type in ('ALL', 'PUT'))
+        contracts = sum(len(strikes) for date_map in (calls, puts) for strikes in date_map.values())
+        return SyntheticResponse({**chain, 'numberOfContracts': contracts, 'callExpDateMap': calls,
+                                  'putExpDateMap': puts})
+
+    def option_expiration_chain(self, symbol):
+        expirations = []
+        for key in self._chain(symbol)['callExpDateMap']:
+            date, days = key.split(':')
+            expirations.append({'expirationDate': date, 'daysToExpiration': int(days), 'expirationType': 'W',
+                                'settlementType': 'P', 'optionRoots': symbol, 'standard': True})
+        return SyntheticResponse({'status': 'SUCCESS', 'expirationList': expirations})
+
+    @staticmethod
+    def _time_convert(dt=None, form="8601"):
+        # Action: same conversions as Client._time_convert (strings and None pass through)
+        if dt is None or isinstance(dt, str):
+            return dt
+        elif form == "8601":
+            return f'{dt.isoformat()[:-3]}Z'
+        elif form == "epoch":
+            return int(dt.timestamp())
+        elif form == "epoch_ms":
+            return int(dt.timestamp() * 1000)
+        elif form == "YYYY-MM-DD":
+            return dt.strftime("%Y-%m-%d")
+        return dt
@@ -1,22 +1,51 @@
-import yfinance as yf
+import threading
+import pandas as pd
+from collections import OrderedDict
+from marketquant.strategy_simulator.core.resampler import BarResampler, parse_aggregation
+
+# Note: base bars are downloaded once per (ticker, start, end, base_aggregation) and every derived timeframe is
+# built locally from them, so switching candle_aggregation does not hit the network again. Only the most recently
+# used series are kept (minute bases are large).
+MAX_RESAMPLERS = 8
+_resamplers = OrderedDict()
+_resamplers_lock = threading.Lock()
 
 
 class YahooDataSource:
-    def __init__(self, ticker, start_date, end_date, aggregation="1d"):
+    def __init__(self, ticker, start_date, end_date, aggregation="1d", base_aggregation=None):
         self.ticker = ticker
         self.start_date = start_date
         self.end_date = end_date
         self.aggregation = aggregation
+        self.base_aggregation = base_aggregation
 
     def get_data(self):
-        # Fetch data from Yahoo Finance using yfinance and disable the progress bar
-        ticker_data = yf.download(
-            self.ticker,
-            start=self.start_date,
-            end=self.end_date,
-            interval=self.aggregation,
-            progress=False  # Disable the progress bar
-        )
+        if self.base_aggregation and self.base_aggregation != self.aggregation:
+            return self.get_resampler().resample(self.aggregation)
+        return self._download(self.aggregation)
+
+    def get_resampler(self):
+        # Action: builds (or reuses) the resampler holding the stored base bars
+        key = (self.ticker, str(self.start_date), str(self.end_date), self.base_aggregation)
+        with _resamplers_lock:
+            if key in _resamplers:
+                _resamplers.move_to_end(key)
+                return _resamplers[key]
+        # Note: daily (or coarser) bars carry midnight dates, the session filter only applies to intraday bars
+        intraday = parse_aggregation(self.base_aggregation) < pd.Timedelta(days=1)
+        resampler = BarResampler(self._download(self.base_aggregation), regular_hours_only=intraday)
+        with _resamplers_lock:
+            _resamplers[key] = resampler
+            while len(_resamplers) > MAX_RESAMPLERS:
+                _resamplers.popitem(last=False)
+        return resampler
+
+    def _download(self, interval):
+        from marketquant.data_provider.yahoo import get_market_data
+
+        # Fetch data through the shared Yahoo layer, concurrent engines asking for the same range share one download
+        ticker_data = get_market_data().history(self.ticker, start=self.start_date, end=self.end_date,
+                                                interval=interval)
 
         # Reset index so that Date becomes a column
         ticker_data.reset_index(inplace=True)
@@ -0,0 +1,252 @@
+import os
+import json
+import time
+import uuid
+import socket
+import contextlib
+import threading
+import socketserver
+from collections import deque
+
+from marketquant.strategy_simulator.core.cli.batch import build_engine, run_job, load_completed
+
+# Note: the protocol is one JSON message per line over TCP, every worker message gets exactly one reply.
+#   worker -> {"type": "request", "worker": name, "batch": n}
+#   coordinator -> {"type": "jobs", "lease": id, "jobs": [...]} | {"type": "wait", "seconds": s} | {"type": "done"}
+#   worker -> {"type": "results", "lease": id, "results": [...]}
+#   coordinator -> {"type": "ok"}
+# A lease is given back to the queue when its worker disconnects or sends nothing for lease_timeout seconds.
+
+
+def _send(stream, message):
+    stream.write(json.dumps(message).encode('utf-8') + b'\n')
+    stream.flush()
+
+
+def _receive(stream):
+    line = stream.readline()
+    if not line:
+        raise ConnectionError("Connection closed.")
+    return json.loads(line)
+
+
+class Coordinator:
+    def __init__(self, jobs, results_path, host='127.0.0.1', port=5555, batch_size=4, lease_timeout=600, linger=5):
+        """
+        Hands out batches of backtest jobs to workers over TCP and appends their results to results_path.
+        Jobs that already have a successful result in results_path are skipped, like run_batch().
+        :param jobs: List of job dictionaries (see cli.batch.load_jobs).
+        :param results_path: JSON lines file results are appended to.
+        :param host: Interface to listen on, use '0.0.0.0' to accept workers from other nodes.
+        :param port: Port to listen on (0 picks a free port, see address).
+        :param batch_size: Maximum number of jobs per lease.
+        :param lease_timeout: Seconds without any message from a worker after which its jobs are reassigned.
+        :param linger: Seconds to keep answering 'done' after the last result, so idle workers exit cleanly.
+        """
+        completed = load_completed(results_path)
+        self.pending = deque(job for job in jobs if job['id'] not in completed)
+        self.skipped = len(jobs) - len(self.pending)
+        self.remaining = {job['id'] for job in self.pending}
+        self.results_path = results_path
+        self.batch_size = batch_size
+        self.lease_timeout = lease_timeout
+        self.linger = linger
+        self.leases = {}  # lease id -> {'jobs': {job id: job}, 'deadline': ..., 'worker': ...}
+        self.ok = self.failed = self.reassigned = 0
+        self._condition = threading.Condition()
+
+        coordinator = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                coordinator._handle(self.rfile, self.wfile)
+
+        class Server(socketserver.ThreadingTCPServer):
+            allow_reuse_address = True
+            daemon_threads = True
+
+        self.server = Server((host, port), Handler)
+        self._results = None
+
+    @property
+    def address(self):
+        return self.server.server_address
+
+    def serve(self):
+        """
+        Serves workers until every job has a result.
+        :return: Number of (ok, failed, skipped) jobs.
+        """
+        self._results = open(self.results_path, 'a', encoding='utf-8')
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            with self._condition:
+                while self.remaining:
+                    self._condition.wait(timeout=1)
+                    self._expire_leases()
+            time.sleep(self.linger)
+        finally:
+            self.server.shutdown()
+            self.server.server_close()
+            self._results.close()
+        return self.ok, self.failed, self.skipped
+
+    def _expire_leases(self):
+        # Action: give the jobs of silent workers back to the queue (called with the lock held)
+        now = time.monotonic()
+        for lease_id in [lease_id for lease_id, lease in self.leases.items() if lease['deadline'] < now]:
+            self._release(lease_id)
+
+    def _release(self, lease_id):
+        lease = self.leases.pop(lease_id, None)
+        if lease is None:
+            return
+        for job_id, job in lease['jobs'].items():
+            if job_id in self.remaining:
+                self.pending.appendleft(job)
+                self.reassigned += 1
+        self._condition.notify_all()
+
+    def _handle(self, rfile, wfile):
+        held = set()
+        try:
+            while True:
+                message = _receive(rfile)
+                with self._condition:
+                    self._expire_leases()
+                    if message['type'] == 'request':
+                        reply = self._lease(message, held)
+                    elif message['type'] == 'results':
+                        reply = self._record(message, held)
+                    else:
+                        reply = {'type': 'error', 'error': f"Unknown message type {message['type']!r}."}
+                _send(wfile, reply)
+        except (ConnectionError, OSError, ValueError):
+            pass  # Note: a dropped worker, its leases are released below
+        finally:
+            with self._condition:
+                for lease_id in held:
+                    self._release(lease_id)
+
+    def _lease(self, message, held):
+        if not self.remaining:
+            return {'type': 'done'}
+        if not self.pending:
+            # Note: everything is leased, the worker asks again in case a lease is given back
+            return {'type': 'wait', 'seconds': 1}
+
+        jobs = {}
+        while self.pending and len(jobs) < min(message.get('batch') or self.batch_size, self.batch_size):
+            job = self.pending.popleft()
+            if job['id'] in self.remaining:
+                jobs[job['id']] = job
+        if not jobs:
+            return {'type': 'wait', 'seconds': 1}
+        lease_id = uuid.uuid4().hex
+        self.leases[lease_id] = {'jobs': jobs, 'deadline': time.monotonic() + self.lease_timeout,
+                                 'worker': message.get('worker')}
+        held.add(lease_id)
+        return {'type': 'jobs', 'lease': lease_id, 'jobs': list(jobs.values())}
+
+    def _record(self, message, held):
+        lease = self.leases.get(message['lease'])
+        for result in message['results']:
+            # Note: a late result of a reassigned job is still accepted, whichever copy arrives first wins
+            if result['id'] not in self.remaining:
+                continue
+            self.remaining.discard(result['id'])
+            self._results.write(json.dumps(result) + '\n')
+            self._results.flush()
+            if result['status'] == 'ok':
+                self.ok += 1
+            else:
+                self.failed += 1
+            if lease is not None:
+                lease['jobs'].pop(result['id'], None)
+
+        if lease is not None:
+            lease['deadline'] = time.monotonic() + self.lease_timeout
+            if not lease['jobs']:
+                del self.leases[message['lease']]
+                held.discard(message['lease'])
+        self._condition.notify_all()
+        return {'type': 'ok'}
+
+
+class Worker:
+    def __init__(self, host='127.0.0.1', port=5555, batch_size=None, bar_store=None, verbose=False,
+                 connect_timeout=30, name=None):
+        """
+        Pulls job batches from a Coordinator, runs them and pushes the result records back.
+        Start as many workers as needed, on one or several nodes.
+        :param host: Coordinator host.
+        :param port: Coordinator port.
+        :param batch_size: Jobs requested per lease (defaults to the coordinator's batch size).
+        :param bar_store: Optional BarStore (shared directory) the market data is read from and written to.
+        :param verbose: Whether to show the simulator's output for every job.
+        :param connect_timeout: Seconds to keep retrying while the coordinator is not reachable.
+        :param name: Worker name reported to the coordinator (defaults to host name and a random suffix).
+        """
+        self.host = host
+        self.port = port
+        self.batch_size = batch_size
+        self.bar_store = bar_store
+        self.verbose = verbose
+        self.connect_timeout = connect_timeout
+        self.name = name or f"{socket.gethostname()}-{uuid.uuid4().hex[:6]}"
+        self.jobs_run = 0
+
+    def _connect(self):
+        deadline = time.monotonic() + self.connect_timeout
+        while True:
+            try:
+                return socket.create_connection((self.host, self.port))
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(0.5)
+
+    def _prepare(self, job):
+        try:
+            with contextlib.ExitStack() as stack:
+                if not self.verbose:
+                    stack.enter_context(contextlib.redirect_stdout(stack.enter_context(open(os.devnull, 'w'))))
+                engine = build_engine(job)
+                if self.bar_store is not None:
+                    self.bar_store.attach(engine)
+                return engine
+        except Exception as e:
+            return e
+
+    def run(self):
+        """
+        Works until the coordinator reports that every job is done.
+        :return: Number of jobs this worker ran.
+        """
+        with self._connect() as sock, sock.makefile('rwb') as stream:
+            try:
+                return self._work(stream)
+            except (ConnectionError, OSError) as e:
+                # Note: the coordinator went away (finished or failed), unreported jobs are rerun on the next run
+                print(f"Warning: lost the connection to the coordinator ({e}).")
+                return self.jobs_run
+
+    def _work(self, stream):
+        while True:
+            _send(stream, {'type': 'request', 'worker': self.name, 'batch': self.batch_size})
+            reply = _receive(stream)
+            if reply['type'] == 'done':
+                return self.jobs_run
+            if reply['type'] == 'wait':
+                time.sleep(reply['seconds'])
+                continue
+            if reply['type'] != 'jobs':
+                raise ValueError(f"Unexpected coordinator reply: {reply}")
+
+            for job in reply['jobs']:
+                result = run_job(job, self.verbose, self._prepare(job))
+                self.jobs_run += 1
+                # Action: results are sent one by one, which also keeps the lease alive during long batches
+                _send(stream, {'type': 'results', 'lease': reply['lease'], 'results': [result]})
+                _receive(stream)
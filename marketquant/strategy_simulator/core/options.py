@@ -0,0 +1,156 @@
+import numpy as np
+import pandas as pd
+
+# Note: expiring contracts stop trading at the close of their expiration day
+EXPIRY_TIME = pd.Timedelta(hours=16)
+SECONDS_PER_YEAR = 365 * 24 * 60 * 60
+
+
+def _wall_time(date):
+    # Action: naive wall clock time of a (possibly time zone aware) date, comparable with the stored expirations
+    date = pd.Timestamp(date)
+    return date.tz_localize(None) if date.tzinfo is not None else date
+
+
+class OptionBook:
+    FIELDS = ('id', 'spread', 'strike', 'expiry', 'is_call', 'quantity', 'entry_price', 'iv', 'mark')
+
+    def __init__(self, risk_free_rate=0.05, dividend_yield=0.0, multiplier=100):
+        """
+        Open option legs stored column-wise, so the whole book is repriced with one vectorized Black-Scholes call.
+        :param risk_free_rate: Risk free rate as a decimal, used to mark the legs.
+        :param dividend_yield: Dividend yield of the underlying as a decimal.
+        :param multiplier: Shares per contract.
+        """
+        self.risk_free_rate = risk_free_rate
+        self.dividend_yield = dividend_yield
+        self.multiplier = multiplier
+        self._next_id = 0
+        self._next_spread = 0
+        self._pending = []  # Note: legs added since the last vectorized call, appended to the arrays in one go
+        self._legs = {
+            'id': np.empty(0, dtype=np.int64),
+            'spread': np.empty(0, dtype=np.int64),
+            'strike': np.empty(0, dtype=float),
+            'expiry': np.empty(0, dtype='datetime64[ns]'),
+            'is_call': np.empty(0, dtype=bool),
+            'quantity': np.empty(0, dtype=float),  # Note: positive for long legs, negative for short legs
+            'entry_price': np.empty(0, dtype=float),
+            'iv': np.empty(0, dtype=float),
+            'mark': np.empty(0, dtype=float),
+        }
+
+    @property
+    def legs(self):
+        # Action: the open legs as arrays, including the ones added since the last access
+        if self._pending:
+            pending, self._pending = self._pending, []
+            self._legs = {field: np.concatenate([values, np.asarray([row[field] for row in pending],
+                                                                    dtype=values.dtype)])
+                          for field, values in self._legs.items()}
+        return self._legs
+
+    def __len__(self):
+        return len(self._legs['id']) + len(self._pending)
+
+    def new_spread(self):
+        self._next_spread += 1
+        return self._next_spread
+
+    def time_to_expiry(self, date, expiry=None):
+        # Action: years from date to the close of each expiration day (0 once expired)
+        expiry = self.legs['expiry'] if expiry is None else expiry
+        remaining = (expiry + EXPIRY_TIME.to_timedelta64()) - np.datetime64(_wall_time(date).to_datetime64())
+        return np.maximum(remaining / np.timedelta64(1, 's'), 0.0) / SECONDS_PER_YEAR
+
+    def price(self, date, underlying_price, strike, expiry, is_call, iv):
+        """
+        Theoretical price of contracts that are not in the book yet (used to fill orders without a quote).
+        """
+        from marketquant.math.greeks.black_scholes import BlackScholes
+
+        expiry = np.asarray(pd.to_datetime(np.atleast_1d(expiry)).normalize(), dtype='datetime64[ns]')
+        t = self.time_to_expiry(date, expiry)
+        return BlackScholes.price(underlying_price, strike, t, self.risk_free_rate, iv, is_call, self.dividend_yield)
+
+    def add(self, strike, expiry, is_call, quantity, price, iv, spread=0):
+        """
+        Adds one leg (buffered, so adding n legs costs O(n) until the book is next repriced).
+        :param quantity: Number of contracts, negative for a short (written) leg.
+        :param price: Premium per share paid (long) or received (short).
+        :return: Id of the new leg.
+        """
+        self._next_id += 1
+        row = {
+            'id': self._next_id, 'spread': spread, 'strike': strike,
+            'expiry': pd.Timestamp(expiry).normalize().to_datetime64(), 'is_call': bool(is_call),
+            'quantity': quantity, 'entry_price': price, 'iv': iv, 'mark': price,
+        }
+        self._pending.append(row)
+        return self._next_id
+
+    def remove(self, mask):
+        # Action: drops the legs selected by mask and returns them as a dictionary of arrays
+        removed = {field: values[mask] for field, values in self.legs.items()}
+        self._legs = {field: values[~mask] for field, values in self._legs.items()}
+        return removed
+
+    def index_of(self, leg_id):
+        index = np.flatnonzero(self.legs['id'] == leg_id)
+        if len(index) == 0:
+            raise ValueError(f"No open option leg with id {leg_id}.")
+        return index[0]
+
+    def mark_to_market(self, date, underlying_price):
+        """
+        Reprices every open leg at the underlying price in one array computation.
+        :return: Array of marks (per share).
+        """
+        if len(self) == 0:
+            return self.legs['mark']
+        # Note: imported on first use, scipy is only loaded by backtests that trade options
+        from marketquant.math.greeks.black_scholes import BlackScholes
+
+        legs = self.legs
+        legs['mark'] = BlackScholes.price(underlying_price, legs['strike'], self.time_to_expiry(date),
+                                          self.risk_free_rate, legs['iv'], legs['is_call'], self.dividend_yield)
+        return legs['mark']
+
+    def greeks(self, date, underlying_price):
+        """
+        Position greeks of the book (per leg greeks times signed quantity and multiplier).
+        :return: Dictionary of summed 'delta', 'gamma', 'theta', 'vega' and 'rho'.
+        """
+        from marketquant.math.greeks.black_scholes import BlackScholes
+
+        legs = self.legs
+        greeks = BlackScholes.greeks(underlying_price, legs['strike'], self.time_to_expiry(date),
+                                     self.risk_free_rate, legs['iv'], legs['is_call'], self.dividend_yield)
+        size = legs['quantity'] * self.multiplier
+        return {name: float(np.sum(greeks[name] * size)) for name in ('delta', 'gamma', 'theta', 'vega', 'rho')}
+
+    def expiring(self, date, bar_length=None):
+        # Action: legs whose expiration (the close of the expiration day) is reached by the end of the bar at date
+        bar_end = _wall_time(date) + (bar_length if bar_length is not None else pd.Timedelta(0))
+        return self.legs['expiry'] + EXPIRY_TIME.to_timedelta64() <= np.datetime64(bar_end.to_datetime64())
+
+    @staticmethod
+    def intrinsic(underlying_price, strike, is_call):
+        return np.where(is_call, np.maximum(underlying_price - strike, 0.0), np.maximum(strike - underlying_price, 0.0))
+
+    def market_value(self):
+        return float(np.sum(self.legs['mark'] * self.legs['quantity']) * self.multiplier)
+
+    def unrealized_pnl(self):
+        legs = self.legs
+        return float(np.sum((legs['mark'] - legs['entry_price']) * legs['quantity']) * self.multiplier)
+
+    def get_state(self):
+        return {'legs': {field: values.copy() for field, values in self.legs.items()}, 'next_id': self._next_id,
+                'next_spread': self._next_spread}
+
+    def set_state(self, state):
+        self._legs = {field: values.copy() for field, values in state['legs'].items()}
+        self._pending = []
+        self._next_id = state['next_id']
+        self._next_spread = state['next_spread']
@@ -0,0 +1,249 @@
+import time
+import heapq
+import queue
+import random
+import threading
+import pandas as pd
+
+from marketquant.strategy_simulator.core.data_sources.stream_replay import STREAM_FIELDS, parse_stream_messages
+
+
+class IncrementalEMA:
+    def __init__(self, span, value=None):
+        """
+        EMA updated one value at a time, same values as pandas ewm(span, adjust=False).
+        :param value: Last EMA value to continue from (e.g. from MACDIndicator.get_state()), None to start fresh.
+        """
+        self.alpha = 2.0 / (span + 1.0)
+        self.value = value
+
+    def update(self, x):
+        self.value = x if self.value is None else self.value + self.alpha * (x - self.value)
+        return self.value
+
+
+class IncrementalMACD:
+    def __init__(self, short_period=12, long_period=26, signal_period=9, state=None):
+        """
+        MACDIndicator updated in O(1) per price.
+        :param state: Optional MACDIndicator.get_state() of the history before the first update (warm start).
+        """
+        state = state or {}
+        self.short = IncrementalEMA(short_period, state.get('EMA_short'))
+        self.long = IncrementalEMA(long_period, state.get('EMA_long'))
+        self.signal = IncrementalEMA(signal_period, state.get('Signal'))
+        self.macd = None if not state else state['EMA_short'] - state['EMA_long']
+
+    def update(self, price):
+        """
+        :return: (macd, signal) after the price.
+        """
+        self.macd = self.short.update(price) - self.long.update(price)
+        return self.macd, self.signal.update(self.macd)
+
+
+class LatencyModel:
+    def __init__(self, mean_ms=50.0, jitter_ms=20.0, slippage_bps=1.0, seed=None):
+        """
+        Simulated order latency and slippage.
+        :param mean_ms: Mean delay between an order and its fill, in milliseconds.
+        :param jitter_ms: Standard deviation of the delay, in milliseconds (delays are never negative).
+        :param slippage_bps: Adverse price move applied to every fill, in basis points.
+        :param seed: Random seed for reproducible runs.
+        """
+        self.mean_ms = mean_ms
+        self.jitter_ms = jitter_ms
+        self.slippage_bps = slippage_bps
+        self._random = random.Random(seed)
+
+    def delay(self):
+        # Action: seconds until the order reaches the (simulated) exchange
+        return max(self._random.gauss(self.mean_ms, self.jitter_ms), 0.0) / 1000.0
+
+    def fill_price(self, side, price):
+        slippage = price * self.slippage_bps / 10000.0
+        return price + slippage if side == 'buy' else price - slippage
+
+
+class MACDPaperStrategy:
+    def __init__(self, macd_params=None):
+        """
+        Live version of the MACDStrategy demo, trading the same crossovers from an IncrementalMACD.
+        """
+        self.macd_params = macd_params if macd_params else {}
+        self.macd = IncrementalMACD(**self.macd_params)
+        self.previous = None
+
+    def warm_up(self, data):
+        # Action: seed the indicator with historical bars so the first live ticks already have a valid MACD
+        from marketquant.strategy_simulator.demo_examples.indicators.macd import MACDIndicator
+
+        indicator = MACDIndicator(**self.macd_params)
+        data = indicator.calculate(data)
+        state = indicator.get_state(data)
+        self.macd = IncrementalMACD(**self.macd_params, state=state)
+        self.previous = (self.macd.macd, state['Signal'])
+
+    def on_tick(self, trader, tick):
+        macd, signal = self.macd.update(tick['price'])
+        previous, self.previous = self.previous, (macd, signal)
+        if previous is None:
+            return
+        previous_macd, previous_signal = previous
+
+        # Check for cover signal (MACD crosses above signal line) to close the long
+        if previous_macd <= previous_signal and macd > signal:
+            if trader.position() > 0:
+                trader.submit('sell', trader.shares, tick)
+
+        # Check for short signal (MACD crosses below signal line)
+        elif previous_macd >= previous_signal and macd < signal:
+            trader.submit('buy', trader.shares, tick)
+
+
+class PaperTrader:
+    def __init__(self, trading_engine, ticker=None, service='CHART_EQUITY', strategy=None, latency_model=None,
+                 max_queue=100000):
+        """
+        Paper trading runtime: Schwab stream messages go to a queue from the websocket thread, a dedicated consumer
+        thread parses them, updates the strategy tick by tick and fills its orders into the engine's AccountManager
+        (through its TradeSimulator) after a simulated latency.
+        :param trading_engine: TradingEngine holding the account, simulator and share size (its data source is only
+                               used by warm_up()).
+        :param ticker: Symbol to trade (defaults to the engine's ticker).
+        :param service: 'CHART_EQUITY' (minute bars) or 'LEVELONE_EQUITIES' (quotes and trades).
+        :param strategy: Object with on_tick(trader, tick), defaults to MACDPaperStrategy.
+        :param latency_model: LatencyModel used for fills.
+        :param max_queue: Maximum number of queued messages, newer messages are dropped (and counted) past it.
+        """
+        if service not in STREAM_FIELDS:
+            raise ValueError(f"Unsupported stream service '{service}'. Options are {list(STREAM_FIELDS.keys())}")
+        self.trading_engine = trading_engine
+        self.ticker = ticker or trading_engine.ticker
+        self.service = service
+        self.strategy = strategy or MACDPaperStrategy()
+        self.latency_model = latency_model or LatencyModel()
+        self.shares = trading_engine.shares
+
+        self._messages = queue.Queue(maxsize=max_queue)
+        self._pending = []  # heap of (fill time, sequence, order)
+        self._sequence = 0
+        self._last = {}  # Note: level one messages only carry changed fields, the last values are carried forward
+        self._thread = None
+        self._stream = None
+        self.stats = {'messages': 0, 'ticks': 0, 'fills': 0, 'dropped': 0, 'max_queue': 0, 'busy_seconds': 0.0}
+
+    def warm_up(self):
+        # Action: seeds the strategy with the engine's historical data (if the strategy supports it)
+        if hasattr(self.strategy, 'warm_up'):
+            data = self.trading_engine.data_engine.to_pandas()
+            if len(data) > 0:
+                self.strategy.warm_up(data.copy())
+
+    def receiver(self, message):
+        """
+        Stream receiver, only enqueues the raw message so the websocket reader is never blocked.
+        """
+        try:
+            self._messages.put_nowait(message)
+        except queue.Full:
+            self.stats['dropped'] += 1
+
+    def position(self):
+        return self.trading_engine.account_manager.positions.get('long', {}).get('quantity', 0)
+
+    def submit(self, side, quantity, tick):
+        """
+        Submits a market order, filled on the first tick at or after tick time + simulated latency.
+        :param side: 'buy' or 'sell'.
+        """
+        if side not in ('buy', 'sell'):
+            raise ValueError(f"Unsupported order side '{side}'. Options are 'buy' or 'sell'.")
+        self._sequence += 1
+        order = {'side': side, 'quantity': quantity, 'submitted': tick['time']}
+        heapq.heappush(self._pending, (tick['time'] + self.latency_model.delay(), self._sequence, order))
+
+    def _fill_due(self, tick):
+        simulator = self.trading_engine.simulator
+        while self._pending and self._pending[0][0] <= tick['time']:
+            _, _, order = heapq.heappop(self._pending)
+            price = self.latency_model.fill_price(order['side'], tick['price'])
+            try:
+                if order['side'] == 'buy':
+                    simulator.buy(tick['date'], price, order['quantity'])
+                else:
+                    simulator.sell(tick['date'], price, order['quantity'])
+                self.stats['fills'] += 1
+            except ValueError as e:
+                print(f"Warning: order rejected on {tick['date']}: {e}")
+
+    def _ticks(self, message):
+        columns = parse_stream_messages([message], self.service, keys=[self.ticker])
+        for i in range(len(columns['Key'])):
+            row = {name: values[i] for name, values in columns.items()}
+            if self.service == 'CHART_EQUITY':
+                price, event_time = row['Close'], row['ChartTime'] or row['Timestamp']
+            else:
+                for name, value in row.items():
+                    if value is not None:
+                        self._last[name] = value
+                if row['Last'] is None and row['TradeTime'] is None:
+                    continue  # Note: quote only update, ticks are trades (same as StreamReplayDataSource)
+                price, event_time = self._last.get('Last'), row['TradeTime'] or row['Timestamp']
+            if price is None or event_time is None:
+                continue
+            date = pd.Timestamp(event_time, unit='ms', tz='UTC').tz_convert('America/New_York')
+            yield {'time': event_time / 1000.0, 'date': date, 'price': float(price)}
+
+    def process(self, message):
+        """
+        Handles one raw stream message (called by the consumer thread, also usable to drive the trader from a
+        recording).
+        """
+        start = time.perf_counter()
+        self.stats['messages'] += 1
+        for tick in self._ticks(message):
+            self.stats['ticks'] += 1
+            # Note: orders due before this tick fill at its price, then the strategy sees the tick
+            self._fill_due(tick)
+            self.strategy.on_tick(self, tick)
+        self.stats['busy_seconds'] += time.perf_counter() - start
+
+    def _consume(self):
+        while True:
+            message = self._messages.get()
+            if message is None:
+                break
+            self.stats['max_queue'] = max(self.stats['max_queue'], self._messages.qsize() + 1)
+            self.process(message)
+
+    def start(self, stream=None, warm_up=True):
+        """
+        Starts the consumer thread and, when a Stream is given, subscribes the ticker and starts the stream with
+        this trader as receiver.
+        :param stream: marketquant.data_provider.Stream instance (None to feed receiver() yourself).
+        :param warm_up: Whether to seed the strategy with the engine's historical data first.
+        """
+        if warm_up:
+            self.warm_up()
+        self._thread = threading.Thread(target=self._consume, name='paper-trader', daemon=True)
+        self._thread.start()
+        if stream is not None:
+            self._stream = stream
+            fields = ['0'] + list(STREAM_FIELDS[self.service].keys())
+            if self.service == 'CHART_EQUITY':
+                stream.send(stream.chart_equity([self.ticker], fields))
+            else:
+                stream.send(stream.level_one_equities([self.ticker], fields))
+            stream.start(self.receiver)
+
+    def stop(self, timeout=None):
+        """
+        Stops the stream (if started here) and the consumer once the queued messages are processed.
+        """
+        if self._stream is not None and self._stream.active:
+            self._stream.stop()
+        if self._thread is not None:
+            self._messages.put(None)
+            self._thread.join(timeout)
+            self._thread = None
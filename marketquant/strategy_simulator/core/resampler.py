@@ -0,0 +1,112 @@
+import re
+import numpy as np
+import pandas as pd
+
+
+AGGREGATION_UNITS = {'m': 'min', 'h': 'h', 'd': 'D'}
+
+
+def parse_aggregation(aggregation):
+    """
+    Converts a candle aggregation string into a Timedelta.
+    :param aggregation: Yahoo style aggregation (e.g. '1m', '5m', '15m', '1h', '90m', '1d').
+    :return: pandas Timedelta for one bar.
+    """
+    match = re.fullmatch(r'(\d+)\s*([mhd])', str(aggregation).strip().lower())
+    if match is None:
+        raise ValueError(f"Unsupported candle aggregation '{aggregation}'. "
+                         f"Use minutes, hours or days (e.g. '5m', '1h', '1d').")
+    return pd.Timedelta(int(match.group(1)), unit=AGGREGATION_UNITS[match.group(2)])
+
+
+class BarResampler:
+    def __init__(self, bars, session_start='09:30', session_end='16:00', regular_hours_only=True):
+        """
+        Builds higher timeframe bars from stored 1-minute (or any finer) bars without refetching.
+        :param bars: DataFrame with Date, Open, High, Low, Close and Volume columns (in that order).
+        :param session_start: Session open; intraday bars are anchored to this time each day.
+        :param session_end: Session close; bars never extend past the session they belong to.
+        :param regular_hours_only: Whether to drop bars outside of session_start/session_end.
+        """
+        self.session_start = pd.Timedelta(f"{session_start}:00")
+        self.session_end = pd.Timedelta(f"{session_end}:00")
+        self.regular_hours_only = regular_hours_only
+        self.bars = self._prepare(bars)
+        self._cache = {}
+
+    @classmethod
+    def from_source(cls, data_source, **kwargs):
+        """
+        Fetches the base bars from a data source once and wraps them in a resampler.
+        :param data_source: Any data source with a get_data() method (e.g. YahooDataSource with '1m').
+        :return: BarResampler instance.
+        """
+        return cls(data_source.get_data(), **kwargs)
+
+    def _prepare(self, bars):
+        # Note: columns are renamed by position, same as DataEngine, so 'Datetime' indexed data works too
+        df = pd.DataFrame(bars).copy()
+        df.columns = ['Date', 'Open', 'High', 'Low', 'Close', 'Volume']
+        df['Date'] = pd.to_datetime(df['Date'])
+        df = df.dropna(subset=['Open', 'High', 'Low', 'Close'])
+        df = df.sort_values('Date', kind='stable').reset_index(drop=True)
+
+        if self.regular_hours_only:
+            time_of_day = df['Date'] - df['Date'].dt.normalize()
+            in_session = (time_of_day >= self.session_start) & (time_of_day < self.session_end)
+            df = df[in_session].reset_index(drop=True)
+        return df
+
+    def resample(self, aggregation):
+        """
+        Returns bars for the requested aggregation, computing them once and caching the result.
+        :param aggregation: Target aggregation (e.g. '5m', '15m', '1h', '1d', '5d'). Multi-day bars group that many
+                            consecutive trading days of the data (so '5d' is a trading week).
+        :return: DataFrame with Date, Open, High, Low, Close and Volume columns.
+        """
+        step = parse_aggregation(aggregation)
+        day = pd.Timedelta(1, unit='D')
+        if step > day and step % day != pd.Timedelta(0):
+            raise ValueError(f"Unsupported candle aggregation '{aggregation}'. "
+                             f"Bars longer than a day must be a whole number of days (e.g. '2d', '5d').")
+        if step not in self._cache:
+            self._cache[step] = self._aggregate(step)
+        return self._cache[step].copy()
+
+    def clear_cache(self):
+        self._cache = {}
+
+    def _aggregate(self, step):
+        df = self.bars
+        if df.empty:
+            return df.copy()
+
+        # Note: every bar is keyed by the bucket it falls in. Intraday buckets are anchored at the session open
+        # of the bar's own day, so a bucket can never straddle two sessions.
+        dates = df['Date']
+        day = dates.dt.normalize()
+        if step >= pd.Timedelta(1, unit='D'):
+            # Note: multi-day buckets count the trading days present in the data (as SyntheticDataSource does),
+            # each bucket is keyed by its first day
+            days_per_bar = step // pd.Timedelta(1, unit='D')
+            day_values = day.to_numpy()
+            first_bars = np.flatnonzero(np.r_[True, day_values[1:] != day_values[:-1]])
+            session = np.repeat(np.arange(len(first_bars)), np.diff(np.r_[first_bars, len(df)]))
+            keys = pd.Series(day_values[first_bars[session - session % days_per_bar]])
+        else:
+            session_open = day + self.session_start
+            keys = session_open + ((dates - session_open) // step) * step
+
+        key_values = keys.to_numpy()
+        starts = np.flatnonzero(np.r_[True, key_values[1:] != key_values[:-1]])
+        ends = np.r_[starts[1:], len(df)] - 1
+
+        # Action: first open, max high, min low, last close and summed volume per bucket
+        return pd.DataFrame({
+            'Date': keys.iloc[starts].reset_index(drop=True),
+            'Open': df['Open'].to_numpy()[starts],
+            'High': np.maximum.reduceat(df['High'].to_numpy(), starts),
+            'Low': np.minimum.reduceat(df['Low'].to_numpy(), starts),
+            'Close': df['Close'].to_numpy()[ends],
+            'Volume': np.add.reduceat(df['Volume'].to_numpy(), starts),
+        })
@@ -2,31 +2,37 @@ from marketquant.strategy_simulator.core.data import DataEngine
 from marketquant.strategy_simulator.core.trade_simulator import TradeSimulator
 from marketquant.strategy_simulator.core.account_manager import AccountManager
 from marketquant.strategy_simulator.core.data_sources.yahoo import YahooDataSource
+from marketquant.strategy_simulator.core.data_sources.schwab import SchwabDataSource
 from marketquant.strategy_simulator.core.config import DEFAULT_CONFIG
 from marketquant.strategy_simulator.core.cli.cli_output import CLIOutput
-from marketquant.strategy_simulator.core.charting import TradeChart
 
 class TradingEngine:
     def __init__(self, data_provider=None, ticker=None, start_date=None, end_date=None, candle_aggregation=None,
                  starting_balance=None, shares=None, print_tradehistory=True, print_pnl=True, print_balance=True,
-                 print_buypower=True, print_unrealizedpnl=True, print_timecomplexity=True, chart=True):
+                 print_buypower=True, print_unrealizedpnl=True, print_timecomplexity=True, chart=True, data_source=None,
+                 client=None, backend=None, base_aggregation=None):
         # Note: this will use the default config if parameters are not provided in strategy
         self.data_provider = data_provider or DEFAULT_CONFIG['data_provider']
         self.ticker = ticker or DEFAULT_CONFIG['ticker']
         self.start_date = start_date or DEFAULT_CONFIG['start_date']
         self.end_date = end_date or DEFAULT_CONFIG['end_date']
         self.candle_aggregation = candle_aggregation or DEFAULT_CONFIG['candle_aggregation']
+        # Note: finer bars downloaded once and resampled to candle_aggregation (yahoo), e.g. '1m' to try 5m/15m/1h
+        self.base_aggregation = base_aggregation or DEFAULT_CONFIG['base_aggregation']
         self.starting_balance = starting_balance or DEFAULT_CONFIG['starting_balance']
         self.shares = shares or DEFAULT_CONFIG['shares']
         self.chart = chart or DEFAULT_CONFIG['chart']
+        self.backend = backend or DEFAULT_CONFIG['backend']
 
-        # Note: setups data source
-        if self.data_provider == "yahoo":
-            self.data_source = YahooDataSource(self.ticker, self.start_date, self.end_date, self.candle_aggregation)
-        # Future: Add more providers like Schwab here
+        # Note: setups data source, a custom data source (anything with a get_data() method) takes priority
+        if data_source is not None:
+            self.data_source = data_source
+        else:
+            self.data_source = self.build_data_source(self.data_provider, self.ticker, self.start_date, self.end_date,
+                                                      self.candle_aggregation, client, self.base_aggregation)
 
         # Initialize components
-        self.data_engine = DataEngine(self.data_source)
+        self.data_engine = DataEngine(self.data_source, self.backend)
         self.account_manager = AccountManager(self.starting_balance)
         self.simulator = TradeSimulator(self.account_manager)
 
@@ -39,6 +45,51 @@ class TradingEngine:
         self.print_timecomplexity = print_timecomplexity
         self.chart = chart
 
+    @staticmethod
+    def build_data_source(data_provider, ticker, start_date, end_date, candle_aggregation, client=None,
+                          base_aggregation=None):
+        """
+        Builds the data source of a provider.
+        :param data_provider: 'yahoo', 'schwab' or 'synthetic'.
+        :param client: Schwab client, only used by the 'schwab' provider.
+        :param base_aggregation: Aggregation downloaded and resampled to candle_aggregation, only used by the
+                                 'yahoo' provider (see YahooDataSource).
+        """
+        if data_provider == "yahoo":
+            return YahooDataSource(ticker, start_date, end_date, candle_aggregation, base_aggregation)
+        elif data_provider == "schwab":
+            # Note: uses the given Schwab client, or builds one from the .env credentials
+            if client is None:
+                from marketquant.data_provider.schwab import schwab
+                client = schwab()
+            return SchwabDataSource(client, ticker, start_date, end_date, candle_aggregation)
+        elif data_provider == "synthetic":
+            # Note: seeded generated data, for offline runs and benchmarks (imported here, it needs scipy)
+            from marketquant.strategy_simulator.core.data_sources.synthetic import SyntheticDataSource
+            return SyntheticDataSource(ticker, start_date, end_date, candle_aggregation)
+        raise ValueError(f"Unsupported data provider '{data_provider}'. Options are 'yahoo', 'schwab' or 'synthetic'.")
+
+    def get_state(self):
+        # Action: the engine settings needed to rebuild it (see core/checkpoint.py)
+        return {
+            'data_provider': self.data_provider,
+            'ticker': self.ticker,
+            'start_date': self.start_date,
+            'end_date': self.end_date,
+            'candle_aggregation': self.candle_aggregation,
+            'base_aggregation': self.base_aggregation,
+            'starting_balance': self.starting_balance,
+            'shares': self.shares,
+            'print_tradehistory': self.print_tradehistory,
+            'print_pnl': self.print_pnl,
+            'print_balance': self.print_balance,
+            'print_buypower': self.print_buypower,
+            'print_unrealizedpnl': self.print_unrealizedpnl,
+            'print_timecomplexity': self.print_timecomplexity,
+            'chart': self.chart,
+            'backend': self.backend,
+        }
+
     def calculate_time_complexity(self):
         # Dev Note: This only assumes O(n) time complexity where n is the number of data points fetched.
         # You chose may add your own logic here.
@@ -56,6 +107,13 @@ class TradingEngine:
                     CLIOutput.print_buy_action(trade)
                 elif 'Sell' in trade:
                     CLIOutput.print_sell_action(trade)
+            for trade in self.simulator.get_option_trade_history():
+                if trade.startswith('Buy'):
+                    CLIOutput.print_buy_action(trade)
+                elif trade.startswith('Sell'):
+                    CLIOutput.print_sell_action(trade)
+                else:
+                    print(trade)
 
         # Action: Prints Final PNL and Balance
         if self.print_pnl:
@@ -68,7 +126,7 @@ class TradingEngine:
             print(f"Final Buying Power: ${self.account_manager.get_buying_power()}")
 
         # Action: Fetches the latest market price (last closing price in data)
-        current_price = self.data_engine.fetch_data()['Close'].iloc[-1]
+        current_price = self.data_engine.to_numpy('Close')[-1]
 
         # Action: Calculates unrealized PNL
         unrealized_pnl = self.account_manager.get_unrealized_pnl(current_price)
@@ -83,7 +141,9 @@ class TradingEngine:
         # Action: Builds and shows a chart with the trades and data requested. If PNL is '-' then
         # price line and area fill will be red and if '+' then price line and area fill will be green.
         if self.chart:
+            # Note: matplotlib is only imported when a chart is actually built
+            from marketquant.strategy_simulator.core.charting import TradeChart
             pnl = self.account_manager.get_pnl()
             trade_history = self.simulator.get_trade_history()
-            trade_chart = TradeChart(self.data_engine.fetch_data(), trade_history, pnl)
+            trade_chart = TradeChart(self.data_engine.to_pandas(), trade_history, pnl)
             trade_chart.plot_chart()
\ No newline at end of file
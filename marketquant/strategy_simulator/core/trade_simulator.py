@@ -1,7 +1,17 @@
+import numpy as np
+import pandas as pd
+
+OPTION_TYPES = {'call': True, 'put': False}
+
+
 class TradeSimulator:
     def __init__(self, account_manager):
         self.account_manager = account_manager
         self.trades = []
+        # Note: option fills are kept apart, the chart plots self.trades on the underlying's price axis
+        self.option_trades = []
+        self._last_bar = None  # date of the last on_bar() call
+        self._bar_length = None  # smallest spacing seen between two on_bar() calls
 
     def buy(self, date, price, quantity):
         self.trades.append(f"Buy {quantity} at {price} on {date}")
@@ -32,3 +42,121 @@ class TradeSimulator:
 
     def get_trade_history(self):
         return self.trades
+
+    def get_option_trade_history(self):
+        return self.option_trades
+
+    def _describe_leg(self, strike, expiry, is_call):
+        return f"{strike:g} {'Call' if is_call else 'Put'} {np.datetime_as_string(np.datetime64(expiry, 'D'))}"
+
+    def open_option(self, date, strike, expiry, option_type, quantity, price=None, underlying_price=None, iv=0.3,
+                    spread=0):
+        """
+        Opens an option leg.
+        :param option_type: 'call' or 'put'.
+        :param quantity: Number of contracts, positive to buy and negative to write (sell to open).
+        :param price: Premium per share, when None the leg is filled at its Black-Scholes value (needs
+                      underlying_price).
+        :param iv: Implied volatility as a decimal, used for the fill and to mark the leg on every bar.
+        :param spread: Spread id grouping the legs of a multi-leg position (see open_spread).
+        :return: Id of the new leg.
+        """
+        if option_type not in OPTION_TYPES:
+            raise ValueError(f"Unsupported option type '{option_type}'. Options are 'call' or 'put'.")
+        is_call = OPTION_TYPES[option_type]
+        book = self.account_manager.options
+        if price is None:
+            if underlying_price is None:
+                raise ValueError("An option price or the underlying price is required to fill the order.")
+            price = float(book.price(date, underlying_price, strike, expiry, is_call, iv)[0])
+
+        leg_id = self.account_manager.open_option(price, quantity, strike, expiry, is_call, iv, spread)
+        action = 'Buy to open' if quantity > 0 else 'Sell to open'
+        leg = self._describe_leg(strike, pd.Timestamp(expiry).to_datetime64(), is_call)
+        self.option_trades.append(f"{action} {abs(quantity)} {leg} at {price} on {date}")
+        return leg_id
+
+    def open_spread(self, date, legs, underlying_price=None):
+        """
+        Opens a multi-leg position (verticals, straddles, iron condors...) under one spread id.
+        :param legs: List of dictionaries with strike, expiry, option_type, quantity and optionally price and iv.
+        :return: Spread id.
+        """
+        spread = self.account_manager.options.new_spread()
+        for leg in legs:
+            self.open_option(date, leg['strike'], leg['expiry'], leg['option_type'], leg['quantity'], leg.get('price'),
+                             underlying_price, leg.get('iv', 0.3), spread)
+        return spread
+
+    def _close(self, date, mask, prices, action):
+        closed, realized_profit = self.account_manager.close_options(mask, prices)
+        prices = np.broadcast_to(np.asarray(prices, dtype=float), closed['quantity'].shape)
+        for strike, expiry, is_call, quantity, price in zip(closed['strike'], closed['expiry'], closed['is_call'],
+                                                            closed['quantity'], prices):
+            verb = action or ('Sell to close' if quantity > 0 else 'Buy to close')
+            self.option_trades.append(f"{verb} {abs(quantity):g} {self._describe_leg(strike, expiry, is_call)} "
+                                      f"at {price} on {date}")
+        return realized_profit
+
+    def close_option(self, date, leg_id, price=None, underlying_price=None):
+        """
+        Closes an option leg at price, or at its Black-Scholes value when price is None.
+        :return: Realized profit.
+        """
+        book = self.account_manager.options
+        index = book.index_of(leg_id)
+        if price is None:
+            if underlying_price is None:
+                raise ValueError("An option price or the underlying price is required to fill the order.")
+            price = book.mark_to_market(date, underlying_price)[index]
+        mask = np.zeros(len(book), dtype=bool)
+        mask[index] = True
+        return self._close(date, mask, price, None)
+
+    def close_spread(self, date, spread, underlying_price):
+        """
+        Closes every leg of a spread at its Black-Scholes value.
+        :return: Realized profit.
+        """
+        book = self.account_manager.options
+        marks = book.mark_to_market(date, underlying_price)
+        mask = book.legs['spread'] == spread
+        return self._close(date, mask, marks[mask], None)
+
+    def on_bar(self, date, underlying_price, bar_length=None):
+        """
+        Marks every open option leg to the bar's underlying price and settles the legs expiring on this bar at their
+        intrinsic value. Strategies trading options call this once per bar.
+        :param bar_length: Timedelta covered by the bar starting at date, legs expire on the bar that reaches the
+                           close of their expiration day. Defaults to the smallest spacing between the bars seen
+                           while legs were open (so the daily bar of the expiration day, or the intraday bar ending
+                           at 16:00).
+        :return: Realized profit of the expired legs.
+        """
+        book = self.account_manager.options
+        if len(book) == 0:
+            self._last_bar = date  # Note: kept as given, share only backtests skip the bar length bookkeeping
+            return 0.0
+        date = pd.Timestamp(date)
+        if self._last_bar is not None:
+            spacing = date - pd.Timestamp(self._last_bar)
+            if spacing > pd.Timedelta(0):
+                self._bar_length = spacing if self._bar_length is None else min(self._bar_length, spacing)
+        self._last_bar = date
+        book.mark_to_market(date, underlying_price)
+        expiring = book.expiring(date, bar_length if bar_length is not None else self._bar_length)
+        if not expiring.any():
+            return 0.0
+        legs = book.legs
+        settlement = book.intrinsic(underlying_price, legs['strike'][expiring], legs['is_call'][expiring])
+        return self._close(date, expiring, settlement, 'Expire')
+
+    def get_state(self):
+        return {'trades': list(self.trades), 'option_trades': list(self.option_trades), 'last_bar': self._last_bar,
+                'bar_length': self._bar_length}
+
+    def set_state(self, state):
+        self.trades = list(state['trades'])
+        self.option_trades = list(state.get('option_trades', []))
+        self._last_bar = state.get('last_bar')
+        self._bar_length = state.get('bar_length')
@@ -1,4 +1,10 @@
-from .indicators import MACDIndicator
-from .strategies import MACDStrategy
+from ..._lazy import lazy_module
+
+_LAZY_IMPORTS = {
+    'MACDIndicator': ('.indicators.macd', 'MACDIndicator'),
+    'MACDStrategy': ('.strategies.macd_strategy', 'MACDStrategy'),
+}
 
 __all__ = ['MACDIndicator', 'MACDStrategy']
+
+__getattr__, __dir__ = lazy_module(__name__, _LAZY_IMPORTS)
@@ -1,4 +1,4 @@
-import pandas as pd
+from marketquant.strategy_simulator.core.backends import backend_of
 
 class MACDIndicator:
     def __init__(self, short_period=12, long_period=26, signal_period=9):
@@ -6,11 +6,25 @@ class MACDIndicator:
         self.long_period = long_period
         self.signal_period = signal_period
 
-    def calculate(self, data):
-        data['EMA_short'] = data['Close'].ewm(span=self.short_period, adjust=False).mean()
-        data['EMA_long'] = data['Close'].ewm(span=self.long_period, adjust=False).mean()
+    def calculate(self, data, state=None):
+        """
+        Adds the EMA_short, EMA_long, MACD and Signal columns, natively on the frame's backend (pandas, Polars, Arrow).
+        :param data: Frame with a Close column.
+        :param state: Optional state returned by get_state() for the bars right before data, the EMAs then continue
+                      from it instead of starting over (used to resume a backtest on new bars).
+        :return: Frame with the indicator columns (pandas frames are updated in place).
+        """
+        backend = backend_of(data)
+        state = state or {}
+        data = backend.ema(data, 'Close', self.short_period, 'EMA_short', state.get('EMA_short'))
+        data = backend.ema(data, 'Close', self.long_period, 'EMA_long', state.get('EMA_long'))
 
-        data['MACD'] = data['EMA_short'] - data['EMA_long']
-        data['Signal'] = data['MACD'].ewm(span=self.signal_period, adjust=False).mean()
+        data = backend.subtract(data, 'EMA_short', 'EMA_long', 'MACD')
+        data = backend.ema(data, 'MACD', self.signal_period, 'Signal', state.get('Signal'))
 
         return data
+
+    def get_state(self, data):
+        # Action: the last EMA values of a calculated frame, enough to continue on the following bars
+        backend = backend_of(data)
+        return {column: float(backend.to_numpy(data, column)[-1]) for column in ('EMA_short', 'EMA_long', 'Signal')}
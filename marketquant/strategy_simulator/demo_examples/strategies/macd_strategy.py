@@ -1,4 +1,5 @@
 from ..indicators.macd import MACDIndicator
+from marketquant.strategy_simulator.core.backends import backend_of
 
 class MACDStrategy:
     def __init__(self, trading_engine, macd_params=None):
@@ -6,30 +7,75 @@ class MACDStrategy:
         self.macd_params = macd_params if macd_params else {}
         self.macd_indicator = MACDIndicator(**self.macd_params)
 
+        # Note: where the last run stopped, set by apply_strategy() and restored from checkpoints
+        self.last_date = None
+        self.previous = None
+        self.indicator_state = None
+        self._resume = False  # Note: only set by set_state(), a normal run starts over from the first bar
+
     def apply_strategy(self):
         # Fetch data from the engine
         data = self.trading_engine.data_engine.fetch_data()
+        backend = backend_of(data)
+
+        # Note: when resuming from a checkpoint only the bars after the last processed one are simulated
+        if not self._resume:
+            self.last_date, self.previous, self.indicator_state = None, None, None
+        self._resume = False
+        if self.last_date is not None:
+            data = backend.after(data, 'Date', self.last_date)
+        if len(data) == 0:
+            return
 
         # Calculate MACD and signal using the indicator class
-        data = self.macd_indicator.calculate(data)
+        data = self.macd_indicator.calculate(data, self.indicator_state)
+
+        # Note: the loop runs over NumPy views of the columns, whatever backend holds the frame
+        dates = backend.dates(data, 'Date')
+        closes = backend.to_numpy(data, 'Close')
+        macds = backend.to_numpy(data, 'MACD')
+        signals = backend.to_numpy(data, 'Signal')
 
         # Loop through the data and apply the MACD-based strategy
-        for i in range(1, len(data)):
-            date = data['Date'][i]
-            macd = data['MACD'][i]
-            signal = data['Signal'][i]
-            previous_macd = data['MACD'][i - 1]
-            previous_signal = data['Signal'][i - 1]
+        previous = self.previous
+        for i in range(len(macds)):
+            date = dates[i]
+            macd = macds[i]
+            signal = signals[i]
+            # Note: marks open option legs and settles the ones expiring on this bar (no-op without options)
+            self.trading_engine.simulator.on_bar(date, closes[i])
+            if previous is None:
+                previous = (macd, signal)
+                continue
+            previous_macd, previous_signal = previous
+            previous = (macd, signal)
 
             # Check for cover signal (MACD crosses above signal line) to close the short
             if previous_macd <= previous_signal and macd > signal:
-                price = data['Close'][i]
+                price = closes[i]
                 # If in a short position, cover it
                 if self.trading_engine.simulator.account_manager.positions.get('long', {}).get('quantity', 0) > 0:
                     self.trading_engine.simulator.sell(date, price, self.trading_engine.shares)
 
             # Check for short signal (MACD crosses below signal line)
             elif previous_macd >= previous_signal and macd < signal:
-                price = data['Close'][i]
+                price = closes[i]
                 # Short the stock
                 self.trading_engine.simulator.buy(date, price, self.trading_engine.shares)
+
+        # Action: remember where this run stopped so it can be resumed on newer bars
+        self.last_date = dates[-1]
+        self.previous = (float(previous[0]), float(previous[1]))
+        self.indicator_state = self.macd_indicator.get_state(data)
+
+    def get_state(self):
+        return {'macd_params': self.macd_params, 'last_date': self.last_date, 'previous': self.previous,
+                'indicator_state': self.indicator_state}
+
+    def set_state(self, state):
+        self.macd_params = state['macd_params']
+        self.macd_indicator = MACDIndicator(**self.macd_params)
+        self.last_date = state['last_date']
+        self.previous = state['previous']
+        self.indicator_state = state['indicator_state']
+        self._resume = True
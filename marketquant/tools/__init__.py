@@ -1,8 +1,18 @@
-from .derivatives.gamma_exposure import GammaExposure
-from .utils.bar_plotter import BarPlotter
-from .fractality.hldensity import HLdensity
-from .cointegration.mean_analyzer import MeanAnalyzer
-from .cointegration.hurst_half_life_pairs import HurstHalfLifeCointegration
-from .utils.chart_plotter import LinearChart
+from .._lazy import lazy_module
 
-__all__ = ['GammaExposure', 'BarPlotter', 'HLdensity', 'MeanAnalyzer', 'HurstHalfLifeCointegration', 'LinearChart']
+# Note: each tool pulls in its own heavy dependencies (statsmodels, plotly, matplotlib...), so tools are only
+# imported on first access (PEP 562)
+_LAZY_IMPORTS = {
+    'GammaExposure': ('.derivatives.gamma_exposure', 'GammaExposure'),
+    'BarPlotter': ('.utils.bar_plotter', 'BarPlotter'),
+    'HLdensity': ('.fractality.hldensity', 'HLdensity'),
+    'MeanAnalyzer': ('.cointegration.mean_analyzer', 'MeanAnalyzer'),
+    'HurstHalfLifeCointegration': ('.cointegration.hurst_half_life_pairs', 'HurstHalfLifeCointegration'),
+    'LinearChart': ('.utils.chart_plotter', 'LinearChart'),
+    'UniverseScreener': ('.screening.universe_screener', 'UniverseScreener'),
+}
+
+__all__ = ['GammaExposure', 'BarPlotter', 'HLdensity', 'MeanAnalyzer', 'HurstHalfLifeCointegration', 'LinearChart',
+           'UniverseScreener']
+
+__getattr__, __dir__ = lazy_module(__name__, _LAZY_IMPORTS)
@@ -1,10 +1,6 @@
 import numpy as np
 import pandas as pd
-import yfinance as yf
-from statsmodels.tsa.stattools import coint
-from hurst import compute_Hc
 from itertools import combinations
-from joblib import Parallel, delayed
 
 
 class HurstHalfLifeCointegration:
@@ -34,14 +30,17 @@ class HurstHalfLifeCointegration:
 
     # Step 1: Download Historical Data from Yahoo Finance
     def download_data(self):
+        from marketquant.data_provider.yahoo import get_market_data
         try:
-            self.data = yf.download(self.tickers, start=self.start, end=self.end)['Adj Close']
+            data = get_market_data().download(self.tickers, start=self.start, end=self.end, auto_adjust=False)
+            self.data = pd.DataFrame({ticker: frame['Adj Close'] for ticker, frame in data.items() if not frame.empty})
         except Exception as e:
             print(f"Error downloading data: {e}")
             self.data = pd.DataFrame()
 
     # Step 2: Cointegration Test Function (Engle-Granger)
     def calculate_cointegration(self, pair):
+        from statsmodels.tsa.stattools import coint
         series1 = self.data[pair[0]].dropna()
         series2 = self.data[pair[1]].dropna()
 
@@ -63,6 +62,7 @@ class HurstHalfLifeCointegration:
 
     # Step 3: Calculate Hurst Exponent (Mean Reversion Check)
     def calculate_hurst(self, series):
+        from hurst import compute_Hc
         series_cleaned = series.dropna()
 
         if len(series_cleaned) == 0 or series_cleaned.nunique() == 1:
@@ -147,6 +147,7 @@ class HurstHalfLifeCointegration:
 
     # Step 7: Parallel Processing for Pairs Selection
     def find_eligible_pairs(self):
+        from joblib import Parallel, delayed
         ticker_pairs = list(combinations(self.data.columns, 2))
 
         eligible_pairs = Parallel(n_jobs=-1)(delayed(self.process_pair)(pair) for pair in ticker_pairs)
@@ -1,5 +1,3 @@
-import yfinance as yf
-import plotly.graph_objects as go
 import numpy as np
 
 class MeanAnalyzer:
@@ -18,8 +16,10 @@ class MeanAnalyzer:
             self.end = None
 
         # Download stock data with optional time interval aggregation
-        self.data1 = yf.download(stock1, start=self.start, end=self.end, interval=interval)
-        self.data2 = yf.download(stock2, start=self.start, end=self.end, interval=interval)
+        from marketquant.data_provider.yahoo import get_market_data
+        data = get_market_data().download([stock1, stock2], start=self.start, end=self.end, interval=interval)
+        self.data1 = data[stock1]
+        self.data2 = data[stock2]
 
         # Check if we have any data; raise an error if not
         if self.data1.empty or self.data2.empty:
@@ -60,6 +60,8 @@ class MeanAnalyzer:
         return long_signals_stock1, long_signals_stock2
 
     def plot(self):
+        import plotly.graph_objects as go
+
         fig = go.Figure()
 
         # Top pane 1: POOL Linear stock prices with grey thinner lines
@@ -1,17 +1,20 @@
-from datetime import datetime
+import numpy as np
 import pandas as pd
-from marketquant.tools.utils.bar_plotter import BarPlotter
 
 class GammaExposure:
-    def __init__(self, client):
+    def __init__(self, client, expirations_per_request=None):
         """
         Initializes the GammaExposure class with a Schwab API client.
         :param client: Initialized Schwab API client.
+        :param expirations_per_request: Split the chain into requests of this many expirations, fetched concurrently
+                                        (see fetch_option_chain), None fetches the whole chain in one request.
         """
         self.client = client
+        self.expirations_per_request = expirations_per_request
 
     @classmethod
-    def run(cls, client, symbol, plot_strikes=50, barchart=False, netexposure=False, positive_color='blue', negative_color='red'):
+    def run(cls, client, symbol, plot_strikes=50, barchart=False, netexposure=False, positive_color='blue', negative_color='red',
+            expirations_per_request=None):
         """
         Creates an instance and calculates gamma exposure in one step.
         :param client: Initialized Schwab API client.
@@ -21,13 +24,15 @@ class GammaExposure:
         :param netexposure: Whether to calculate net exposure (True) or separate puts and calls (False).
         :param positive_color: Color for positive exposure bars (default: 'blue').
         :param negative_color: Color for negative exposure bars (default: 'red').
+        :param expirations_per_request: Expirations per request when splitting the chain, None for a single request.
         :return: Pandas DataFrame with gamma exposure data.
         """
-        instance = cls(client)
+        instance = cls(client, expirations_per_request)
         df = instance.get_gamma_exposure(symbol, plot_strikes, netexposure)
 
         # Plot the gamma exposure if barchart is True
         if barchart:
+            from marketquant.tools.utils.bar_plotter import BarPlotter
             plotter = BarPlotter(df, x_col="strikePrice", y_col="gammaExposure")
             if plotter.confirm_valid_data():
                 plotter.plot_barchart(
@@ -63,6 +68,27 @@ class GammaExposure:
 
         return options, option_chains_response['underlyingPrice']
 
+    def get_option_chain_columns(self, symbol):
+        """
+        Fetches the option chain for the given symbol decoded column-wise (see decode_option_chain).
+        :param symbol: Stock ticker symbol (e.g., 'AAPL').
+        :return: OptionChain with one array per field.
+        """
+        from marketquant.data_provider.schwab.option_chain import decode_option_chain
+        from marketquant.data_provider.schwab.chain_fetcher import fetch_option_chain
+        from marketquant.data_provider.schwab.metrics import parse_timer
+
+        params = {'contractType': "ALL", 'includeUnderlyingQuote': True, 'strategy': "SINGLE"}
+        if self.expirations_per_request:
+            chain = fetch_option_chain(self.client, symbol, self.expirations_per_request, **params)
+        else:
+            response = self.client.option_chains(symbol=symbol, **params)
+            with parse_timer(self.client, 'option_chains'):
+                chain = decode_option_chain(response)
+        if len(chain) == 0:
+            raise ValueError(f"No valid option chains found for {symbol}")
+        return chain
+
     def flatten_option_chain(self, option_chain, is_call):
         """
         Flattens the option chain dictionary into a list of option contracts.
@@ -126,6 +152,41 @@ class GammaExposure:
         else:
             return [exp for exposures in gamma_exposures.values() for exp in exposures]
 
+    def calculate_gamma_exposure_columns(self, chain, netexposure, spot_price, plot_strikes):
+        """
+        Same as calculate_gamma_exposure on a column-wise chain, every contract computed in one array operation.
+        :param chain: OptionChain from get_option_chain_columns().
+        :param netexposure: Whether to calculate net gamma exposure per strike.
+        :param spot_price: Current spot price of the underlying stock.
+        :param plot_strikes: Number of strikes to include.
+        :return: DataFrame of gamma exposures for each contract or net per strike.
+        """
+        strikes = chain['strikePrice']
+        gamma = np.nan_to_num(chain['gamma']) * np.where(chain['isCall'], 1.0, -1.0)  # Adjust gamma sign for puts
+        open_interest = np.nan_to_num(chain['openInterest'])
+        contract_size = 100
+        exposure = spot_price * gamma * open_interest * contract_size * spot_price * 0.01
+
+        # Note: keeps the first plot_strikes unique strikes in chain order, same as the contract by contract loop
+        unique_strikes, first_index = np.unique(strikes, return_index=True)
+        order = np.argsort(first_index, kind='stable')
+        rank = np.empty(len(unique_strikes), dtype=np.int64)
+        rank[order] = np.arange(len(unique_strikes))
+        strike_rank = rank[np.searchsorted(unique_strikes, strikes)]
+        selected = np.flatnonzero(strike_rank < plot_strikes)
+
+        if netexposure:
+            net = pd.Series(exposure[selected]).groupby(strikes[selected], sort=False).sum()
+            return pd.DataFrame({'strikePrice': net.index.to_numpy(), 'gammaExposure': net.to_numpy()})
+        # Action: contracts grouped by strike (in order of first appearance), chain order within a strike
+        selected = selected[np.argsort(strike_rank[selected], kind='stable')]
+        return pd.DataFrame({
+            'symbol': chain['symbol'][selected],
+            'strikePrice': strikes[selected],
+            'gammaExposure': exposure[selected],
+            'expirationDate': chain['expirationKey'][selected],
+        })
+
     def get_gamma_exposure(self, symbol, plot_strikes=50, netexposure=False):
         """
         Gets the gamma exposure for the specified symbol.
@@ -134,9 +195,7 @@ class GammaExposure:
         :param netexposure: Whether to calculate net gamma exposure per strike.
         :return: Pandas DataFrame with gamma exposure data.
         """
-        option_chain, spot_price = self.get_option_chains(symbol)
-
-        gamma_exposure = self.calculate_gamma_exposure(option_chain, netexposure, spot_price, plot_strikes)
+        chain = self.get_option_chain_columns(symbol)
 
-        df = pd.DataFrame(gamma_exposure)
+        df = self.calculate_gamma_exposure_columns(chain, netexposure, chain.underlying_price, plot_strikes)
         return df.sort_values(by='gammaExposure', ascending=False)
@@ -1,8 +1,5 @@
 import numpy as np
-import matplotlib.pyplot as plt
 import pandas as pd
-import yfinance as yf
-from scipy.interpolate import CubicSpline
 from datetime import datetime, timedelta
 
 
@@ -45,6 +42,7 @@ class HLdensity:
             instance.print_high_low_order(data)
 
         if instance.chart:
+            import matplotlib.pyplot as plt
             fig, ax = plt.subplots(figsize=(12, 8))
             instance.plot_ohlc_moves(normalized_data, ax)
             plt.show()
@@ -56,10 +54,11 @@ class HLdensity:
         Fetch historical OHLC data for the given ticker using Yahoo Finance.
         :return: DataFrame with OHLC data.
         """
+        from marketquant.data_provider.yahoo import get_market_data
         end_date = datetime.utcnow()
         start_date = end_date - timedelta(days=self.days)
 
-        df = yf.download(self.ticker_symbol, start=start_date, end=end_date, interval='1d')
+        df = get_market_data().history(self.ticker_symbol, start=start_date, end=end_date, interval='1d')
 
         if df.empty:
             raise ValueError(f"No data found for ticker {self.ticker_symbol}")
@@ -106,6 +105,9 @@ class HLdensity:
         :param df: Normalized OHLC DataFrame.
         :param ax: Matplotlib axis to plot on.
         """
+        import matplotlib.pyplot as plt
+        from scipy.interpolate import CubicSpline
+
         ax.clear()
         ax.set_title(f"Density Map for {self.ticker_symbol}")
         ax.set_xlabel('Normalized Time')
@@ -168,10 +170,10 @@ class HLdensity:
 # Helper functions used in the HLdensity class
 
 def fetch_intraday_data(ticker_symbol, date, interval='1h'):
-    ticker = yf.Ticker(ticker_symbol)
+    from marketquant.data_provider.yahoo import get_market_data
     start_date = date.strftime('%Y-%m-%d')
     end_date = (date + pd.Timedelta(days=1)).strftime('%Y-%m-%d')
-    df = ticker.history(start=start_date, end=end_date, interval=interval)
+    df = get_market_data().history(ticker_symbol, start=start_date, end=end_date, interval=interval)
 
     if df.empty:
         raise ValueError(f"No intraday data found for {ticker_symbol} on {date}")
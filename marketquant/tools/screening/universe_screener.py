@@ -0,0 +1,168 @@
+import numpy as np
+import pandas as pd
+
+
+class UniverseScreener:
+    def __init__(self, prices, dates=None, tickers=None):
+        """
+        Cross-sectional screener over a (time x ticker) price panel. Every indicator is computed for all tickers
+        at once with 2D NumPy operations instead of one DataFrame per ticker.
+
+        :param prices: DataFrame indexed by date with one column per ticker, or a 2D array (time x ticker).
+        :param dates: Dates of the rows when prices is an array.
+        :param tickers: Tickers of the columns when prices is an array.
+        """
+        if isinstance(prices, pd.DataFrame):
+            dates = prices.index if dates is None else dates
+            tickers = prices.columns if tickers is None else tickers
+            prices = prices.to_numpy(dtype=float)
+        self.prices = np.asarray(prices, dtype=float)
+        if self.prices.ndim != 2:
+            raise ValueError("prices must be a 2D (time x ticker) panel.")
+        self.dates = pd.Index(dates if dates is not None else np.arange(self.prices.shape[0]))
+        self.tickers = np.asarray(tickers if tickers is not None else np.arange(self.prices.shape[1]))
+        self._listed = ~np.isnan(self.prices)
+
+    @classmethod
+    def from_frames(cls, frames, column='Close'):
+        """
+        Builds the panel from per-ticker DataFrames (e.g. data sources or YahooMarketData.download()).
+        :param frames: Dictionary of ticker -> DataFrame with a date index (or a Date column) and the price column.
+        :param column: Price column to use.
+        """
+        series = {}
+        for ticker, frame in frames.items():
+            if frame is None or len(frame) == 0:
+                continue
+            if 'Date' in frame.columns:
+                frame = frame.set_index('Date')
+            series[ticker] = frame[column]
+        return cls(pd.DataFrame(series).sort_index())
+
+    @classmethod
+    def from_market_data(cls, tickers, start=None, end=None, interval='1d', column='Adj Close', chunk_size=200):
+        """
+        Downloads a universe through the shared Yahoo layer, chunk_size tickers per request.
+        :param tickers: List of tickers.
+        :param column: Price column to use ('Adj Close' or 'Close').
+        """
+        from marketquant.data_provider.yahoo import get_market_data
+
+        market_data = get_market_data()
+        frames = {}
+        for i in range(0, len(tickers), chunk_size):
+            frames.update(market_data.download(tickers[i:i + chunk_size], start=start, end=end, interval=interval,
+                                              auto_adjust=False))
+        return cls.from_frames(frames, column)
+
+    def _filled(self, values):
+        # Action: forward fill gaps and start every column at its first listed value (so recursions are not NaN)
+        values = np.array(values, dtype=float)
+        valid = ~np.isnan(values)
+        last_valid = np.maximum.accumulate(np.where(valid, np.arange(len(values))[:, None], 0), axis=0)
+        values = np.take_along_axis(values, last_valid, axis=0)
+        first_values = values[np.argmax(valid, axis=0), np.arange(values.shape[1])]
+        return np.where(np.isnan(values), first_values[None, :], values)
+
+    def ema(self, span, values=None):
+        """
+        Exponential moving average over time for every ticker, same as pandas ewm(span, adjust=False) used by
+        MACDIndicator. Rows before a ticker is listed stay NaN.
+        :param span: EMA span.
+        :param values: Panel to average (defaults to the prices).
+        """
+        from scipy.signal import lfilter
+
+        values = self.prices if values is None else values
+        filled = self._filled(values)
+        alpha = 2.0 / (span + 1.0)
+        # Note: one C level recursion per column, y[t] = a * x[t] + (1 - a) * y[t - 1], seeded with the first value
+        initial = (1.0 - alpha) * filled[0]
+        ema, _ = lfilter([alpha], [1.0, alpha - 1.0], filled, axis=0, zi=initial[None, :])
+        ema[~np.maximum.accumulate(self._listed, axis=0)] = np.nan
+        return ema
+
+    def macd(self, short_period=12, long_period=26, signal_period=9):
+        """
+        MACD for every ticker.
+        :return: (macd, signal, histogram) panels.
+        """
+        macd = self.ema(short_period) - self.ema(long_period)
+        signal = self.ema(signal_period, macd)
+        return macd, signal, macd - signal
+
+    def returns(self, periods=1):
+        """
+        Simple returns over `periods` rows for every ticker (NaN for the first rows).
+        """
+        if periods < 1:
+            raise ValueError("periods must be at least 1.")
+        returns = np.full_like(self.prices, np.nan)
+        returns[periods:] = self.prices[periods:] / self.prices[:-periods] - 1.0
+        return returns
+
+    @staticmethod
+    def zscore(values):
+        """
+        Cross-sectional z-score per date (row), ignoring NaN.
+        """
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = np.nanmean(values, axis=1, keepdims=True)
+            std = np.nanstd(values, axis=1, keepdims=True)
+            return (values - mean) / np.where(std > 0, std, np.nan)
+
+    @staticmethod
+    def rank(values, ascending=False):
+        """
+        Cross-sectional rank per date (1 = best), NaN values rank last and keep a NaN rank.
+        """
+        keyed = np.where(np.isnan(values), np.inf, values if ascending else -values)
+        ranks = np.empty(values.shape, dtype=float)
+        positions = np.broadcast_to(np.arange(1, values.shape[1] + 1, dtype=float), values.shape)
+        np.put_along_axis(ranks, np.argsort(keyed, axis=1, kind='stable'), positions, axis=1)
+        ranks[np.isnan(values)] = np.nan
+        return ranks
+
+    def top_n(self, scores, n=10, ascending=False):
+        """
+        The n best scoring tickers of every date.
+        :param scores: Score panel (time x ticker), higher is better unless ascending.
+        :return: DataFrame with Date, Rank, Ticker and Score columns, n rows per date (fewer when scores are NaN).
+        """
+        n = min(n, scores.shape[1])
+        keyed = np.where(np.isnan(scores), np.inf, scores if ascending else -scores)
+        # Note: argpartition finds the n best per row in linear time, only those n are then sorted
+        if n < scores.shape[1]:
+            best = np.argpartition(keyed, n - 1, axis=1)[:, :n]
+        else:
+            best = np.broadcast_to(np.arange(n), scores.shape).copy()
+        order = np.argsort(np.take_along_axis(keyed, best, axis=1), axis=1, kind='stable')
+        best = np.take_along_axis(best, order, axis=1)
+        best_scores = np.take_along_axis(scores, best, axis=1)
+
+        result = pd.DataFrame({
+            'Date': np.repeat(self.dates.to_numpy(), n),
+            'Rank': np.tile(np.arange(1, n + 1), len(self.dates)),
+            'Ticker': self.tickers[best].ravel(),
+            'Score': best_scores.ravel(),
+        })
+        return result[result['Score'].notna()].reset_index(drop=True)
+
+    def screen(self, n=10, by='macd', lookback=20, short_period=12, long_period=26, signal_period=9):
+        """
+        Scores the universe and returns the top n candidates per date.
+        :param by: 'macd' (MACD histogram relative to price), 'momentum' (lookback return) or a score panel.
+        :param lookback: Rows used by the 'momentum' score.
+        :return: DataFrame with Date, Rank, Ticker and Score (cross-sectional z-score) columns.
+        """
+        if isinstance(by, str):
+            if by == 'macd':
+                _, _, histogram = self.macd(short_period, long_period, signal_period)
+                raw = histogram / self.prices
+            elif by == 'momentum':
+                raw = self.returns(lookback)
+            else:
+                raise ValueError(f"Unsupported screen '{by}'. Options are 'macd', 'momentum' or a score panel.")
+        else:
+            raw = np.asarray(by, dtype=float)
+        return self.top_n(self.zscore(raw), n)
@@ -16,6 +16,11 @@ setup(
         "Personal Website": "https://maxheltzel.net"
     },
     packages=find_packages(),
+    entry_points={
+        "console_scripts": [
+            "marketquant-backtest=marketquant.strategy_simulator.core.cli.batch:main",
+        ],
+    },
     install_requires=[
         "pandas",
         "matplotlib",
@@ -34,6 +39,12 @@ setup(
         "statsmodels"
 
     ],
+    extras_require={
+        "polars": ["polars"],
+        "arrow": ["pyarrow"],
+        "async": ["httpx[http2]"],
+        "orjson": ["orjson"],
+    },
     classifiers=[
         "Programming Language :: Python :: 3",
         "License :: OSI Approved :: Mozilla Public License 2.0 (MPL 2.0)",
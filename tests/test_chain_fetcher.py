@@ -0,0 +1,44 @@
+from marketquant.data_provider.schwab.chain_fetcher import fetch_option_chain
+from marketquant.data_provider.schwab.option_chain import decode_option_chain
+from marketquant.strategy_simulator.core.data_sources.synthetic import (SyntheticChainClient, SyntheticOptionChain,
+                                                                        SyntheticResponse)
+
+
+class ChainsOnlyClient:
+    # Note: a client implementing option_chains only (no option_expiration_chain or _time_convert)
+
+    def __init__(self):
+        self.calls = 0
+
+    def option_chains(self, symbol, **kwargs):
+        self.calls += 1
+        return SyntheticResponse(SyntheticOptionChain(symbol, expirations=4, strikes=10, seed=1).generate())
+
+
+class TextExpirationClient(SyntheticChainClient):
+    # Note: expirations answered with a body that is not JSON
+
+    def option_expiration_chain(self, symbol):
+        response = SyntheticResponse(None)
+        response.json = lambda: (_ for _ in ()).throw(ValueError("not JSON"))
+        return response
+
+
+def test_falls_back_to_single_call_without_expiration_listing():
+    client = ChainsOnlyClient()
+    chain = fetch_option_chain(client, 'SPY', expirations_per_request=2)
+    assert client.calls == 1
+    assert len(chain) == 4 * 10 * 2
+
+
+def test_falls_back_to_single_call_on_unreadable_expirations():
+    chain = fetch_option_chain(TextExpirationClient(expirations=4, strikes=10), 'SPY', expirations_per_request=2)
+    assert len(chain) == 4 * 10 * 2
+
+
+def test_windows_match_single_call():
+    client = SyntheticChainClient(expirations=5, strikes=10)
+    windowed = fetch_option_chain(client, 'SPY', expirations_per_request=2)
+    single = decode_option_chain(client.option_chains('SPY'))
+    assert len(windowed) == len(single) == 5 * 10 * 2
+    assert list(windowed['symbol']) == list(single['symbol'])
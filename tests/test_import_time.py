@@ -0,0 +1,36 @@
+import os
+import sys
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACKAGES = ('marketquant', 'marketquant.data_provider', 'marketquant.data_provider.schwab',
+            'marketquant.data_provider.yahoo', 'marketquant.math', 'marketquant.strategy_simulator',
+            'marketquant.strategy_simulator.demo_examples', 'marketquant.tools')
+# Note: the heavy dependencies the packages must not pull in until one of their attributes is used
+HEAVY_MODULES = ('pandas', 'numpy', 'yfinance', 'scipy', 'statsmodels', 'matplotlib', 'plotly', 'requests', 'httpx')
+
+
+def imported_modules(code):
+    # Action: runs code in a fresh interpreter, returns every module it imported and the import time (-X importtime)
+    code = f"{code}; import sys; print('\\n'.join(sys.modules))"
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=ROOT, capture_output=True,
+                            text=True, check=True)
+    microseconds = sum(int(line.split('|')[0].split(':')[1]) for line in result.stderr.splitlines()
+                       if line.startswith('import time:') and line.split('|')[0].split(':')[1].strip().isdigit())
+    return set(result.stdout.split()), microseconds / 1e6
+
+
+def test_package_imports_skip_heavy_dependencies():
+    modules, seconds = imported_modules('; '.join(f'import {package}' for package in PACKAGES))
+    assert set(PACKAGES) <= modules
+    heavy = sorted(name for name in modules if name.split('.')[0] in HEAVY_MODULES)
+    assert heavy == [], f"importing the packages imported {heavy} ({seconds:.3f}s of imports)"
+
+
+def test_lazy_attributes_resolve():
+    code = ('import marketquant.tools as tools, marketquant.data_provider as data_provider; '
+            'import marketquant.data_provider.schwab.metrics; '
+            'assert tools.GammaExposure.__name__ == "GammaExposure"; '
+            'assert callable(data_provider.schwab) and data_provider.schwab.__module__ == data_provider.__name__; '
+            'assert "Client" in dir(data_provider)')
+    subprocess.run([sys.executable, '-c', code], cwd=ROOT, check=True)
@@ -0,0 +1,25 @@
+import os
+import contextlib
+from datetime import datetime
+
+import pandas as pd
+
+from marketquant.data_provider.schwab.mock_server import MockSchwabServer
+from marketquant.data_provider.schwab.schwab_api import Client
+from marketquant.strategy_simulator.core.data_sources.schwab import SchwabDataSource
+
+
+@contextlib.contextmanager
+def mock_client(tmp_path):
+    tokens_file = os.path.join(str(tmp_path), 'tokens.json')
+    MockSchwabServer.write_tokens(tokens_file)
+    with MockSchwabServer(as_of=datetime(2024, 3, 1)) as server:
+        yield Client('a' * 32, 'b' * 16, tokens_file=tokens_file, base_url=server.url, update_tokens_auto=False)
+
+
+def test_daily_history_lands_in_requested_range(tmp_path):
+    with mock_client(tmp_path) as client:
+        data = SchwabDataSource(client, 'AAPL', '2023-01-02', '2024-03-01', '1d').get_data()
+    assert len(data) > 250
+    assert data['Date'].min() >= pd.Timestamp('2023-01-02', tz='America/New_York')
+    assert data['Date'].max() < pd.Timestamp('2024-03-01', tz='America/New_York')